@@ -0,0 +1,208 @@
+"""
+measures the hot paths of the clients against the local mock HubSpot server
+
+usage: python benchmarks/client_paths.py [--records 5000] [--latency 0.02] [--error-rate 0.01]
+                                         [--rate-limit-rate 0.01] [--repeat 3] [name ...]
+
+For every scenario, the throughput in records per second, the latency percentiles of the
+single requests and the peak memory usage of the scenario are printed. The timings are the
+best of `--repeat` runs, the peak memory is measured in a separate run under tracemalloc.
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple
+
+from hubspot3 import Hubspot3
+from hubspot3.crm_associations import Definitions
+from hubspot3.test.mock_hubspot import MockHubspot
+
+
+class Scenario(NamedTuple):
+    # runs the scenario with the given Hubspot3 client and returns the number of records
+    run: Callable[[Hubspot3, int], int]
+    description: str
+
+
+class TimingMixin:
+    """records the duration of every request attempt of a client"""
+
+    latencies = []  # type: List[float]
+
+    def _perform_request(self, opts, method, url, headers, data):
+        started_at = time.perf_counter()
+        try:
+            return super()._perform_request(opts, method, url, headers, data)
+        finally:
+            TimingMixin.latencies.append(time.perf_counter() - started_at)
+
+
+def get_batches(hubspot: Hubspot3, records: int) -> int:
+    count = 0
+    for offset in range(0, records, 100):
+        vids = [3000000 + index for index in range(offset, min(offset + 100, records))]
+        count += len(hubspot.contacts.get_batch(vids))
+    return count
+
+
+def create_or_update_contacts(hubspot: Hubspot3, records: int) -> int:
+    contacts = (
+        {"email": f"contact{index}@example.com", "properties": []}
+        for index in range(records)
+    )
+    report = hubspot.contacts.create_or_update_batch(contacts, max_workers=4)
+    return len(report.results)
+
+
+def create_associations(hubspot: Hubspot3, records: int) -> int:
+    associations = (
+        (3000000 + index, 1000000 + index, Definitions.CONTACT_TO_COMPANY)
+        for index in range(records)
+    )
+    report = hubspot.crm_associations.create_many(associations, max_workers=4)
+    return len(report.results)
+
+
+def send_sync_messages(hubspot: Hubspot3, records: int) -> int:
+    messages = (
+        {"action": "UPSERT", "externalObjectId": str(index)} for index in range(records)
+    )
+    report = hubspot.ecommerce_bridge.send_sync_messages(
+        "CONTACT", messages, store_id="default", max_workers=4
+    )
+    return sum(result.size for result in report)
+
+
+SCENARIOS = {
+    "contacts.get_all": Scenario(
+        lambda hubspot, records: len(hubspot.contacts.get_all()),
+        "ids page by page, then batches of properties",
+    ),
+    "contacts.get_all (pipelined)": Scenario(
+        lambda hubspot, records: len(hubspot.contacts.get_all(enrichment_workers=4)),
+        "batches of properties fetched by 4 threads",
+    ),
+    "contacts.get_batch": Scenario(get_batches, "batches of 100 vids"),
+    "companies.get_all": Scenario(
+        lambda hubspot, records: len(hubspot.companies.get_all()),
+        "pages of 250 with property history",
+    ),
+    "companies.iter_all (stream)": Scenario(
+        lambda hubspot, records: sum(
+            1 for _ in hubspot.companies.iter_all(stream=True)
+        ),
+        "pages parsed while they are received",
+    ),
+    "deals.get_all": Scenario(
+        lambda hubspot, records: len(hubspot.deals.get_all()), "pages of 250"
+    ),
+    "deals.get_all (prefetch)": Scenario(
+        lambda hubspot, records: len(hubspot.deals.get_all(prefetch_pages=2)),
+        "2 pages fetched ahead",
+    ),
+    "tickets.get_all": Scenario(
+        lambda hubspot, records: len(hubspot.tickets.get_all()), "pages of 100"
+    ),
+    "crm_associations.get_all": Scenario(
+        lambda hubspot, records: len(hubspot.crm_associations.get_all(1, 2)),
+        "pages of 100 ids",
+    ),
+    "crm_associations.iter_many": Scenario(
+        lambda hubspot, records: sum(
+            1
+            for _ in hubspot.crm_associations.iter_many(
+                range(records),
+                [Definitions.COMPANY_TO_CONTACT, Definitions.COMPANY_TO_DEAL],
+                max_workers=4,
+            )
+        ),
+        "batches of 1000 ids read by 4 threads",
+    ),
+    "contacts.create_or_update_batch": Scenario(
+        create_or_update_contacts, "batches of 100 sent by 4 threads"
+    ),
+    "crm_associations.create_many": Scenario(
+        create_associations, "batches of 100 sent by 4 threads"
+    ),
+    "ecommerce_bridge.send_sync_messages": Scenario(
+        send_sync_messages, "chunks of 200 sent by 4 threads"
+    ),
+}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def run_scenario(scenario: Scenario, mock: MockHubspot, records: int) -> int:
+    hubspot = Hubspot3(
+        api_key="benchmark",
+        api_base=mock.url,
+        mixins=[TimingMixin],
+        number_retries=6,
+        retry_on_post=True,
+    )
+    return scenario.run(hubspot, records)
+
+
+def main(arguments) -> None:
+    names = arguments.names or list(SCENARIOS)
+    with MockHubspot(
+        records=arguments.records,
+        latency=arguments.latency,
+        error_rate=arguments.error_rate,
+        rate_limit_rate=arguments.rate_limit_rate,
+    ) as mock:
+        print(
+            f"{arguments.records} records per endpoint, {arguments.latency * 1000:.0f} ms "
+            f"latency, {arguments.error_rate:.1%} errors, "
+            f"{arguments.rate_limit_rate:.1%} rate limited\n"
+        )
+        print(
+            f"{'scenario':<38} {'records/s':>10} {'requests':>9} {'p50 ms':>8} "
+            f"{'p90 ms':>8} {'p99 ms':>8} {'peak MiB':>9}"
+        )
+        for name in names:
+            scenario = SCENARIOS[name]
+            best = None  # type: Dict
+            for _ in range(arguments.repeat):
+                TimingMixin.latencies = []
+                started_at = time.perf_counter()
+                count = run_scenario(scenario, mock, arguments.records)
+                duration = time.perf_counter() - started_at
+                if best is None or duration < best["duration"]:
+                    best = {
+                        "duration": duration,
+                        "count": count,
+                        "latencies": TimingMixin.latencies,
+                    }
+
+            TimingMixin.latencies = []
+            tracemalloc.start()
+            run_scenario(scenario, mock, arguments.records)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            latencies = best["latencies"] or [0.0]
+            print(
+                f"{name:<38} {best['count'] / best['duration']:>10.0f} "
+                f"{len(best['latencies']):>9} "
+                f"{statistics.median(latencies) * 1000:>8.1f} "
+                f"{percentile(latencies, 0.9) * 1000:>8.1f} "
+                f"{percentile(latencies, 0.99) * 1000:>8.1f} "
+                f"{peak / 1024 / 1024:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("names", nargs="*", choices=[[], *SCENARIOS], metavar="name")
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
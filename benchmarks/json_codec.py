@@ -0,0 +1,138 @@
+"""
+compares the JSON codecs of hubspot3.codec on large response payloads
+
+usage: python benchmarks/json_codec.py [recorded_response.json ...]
+
+Without arguments, payloads shaped like `companies/paged` and `contact/vids/batch` responses
+are generated. Pass the paths of recorded response bodies to benchmark those instead.
+"""
+
+import json
+import sys
+import timeit
+from functools import partial
+from typing import Dict, List
+
+from hubspot3.codec import get_available_codecs
+from hubspot3.utils import force_utf8
+
+
+def generate_companies_page(count: int = 2500) -> Dict:
+    """a page of companies with a realistic amount of properties each"""
+    return {
+        "companies": [
+            {
+                "companyId": 1000000 + index,
+                "isDeleted": False,
+                "portalId": 62515,
+                "properties": {
+                    name: {
+                        "value": f"{name} value {index} – ünïcödé",
+                        "timestamp": 1600000000000 + index,
+                        "source": "CRM_UI",
+                        "sourceId": "user@example.com",
+                        "versions": [
+                            {
+                                "name": name,
+                                "value": f"{name} value {index}",
+                                "timestamp": 1600000000000 + index,
+                                "source": "CRM_UI",
+                            }
+                        ],
+                    }
+                    for name in (
+                        "name",
+                        "domain",
+                        "city",
+                        "country",
+                        "industry",
+                        "hubspot_owner_id",
+                        "hs_lastmodifieddate",
+                        "createdate",
+                    )
+                },
+            }
+            for index in range(count)
+        ],
+        "has-more": True,
+        "offset": 1002500,
+    }
+
+
+def generate_contacts_batch(count: int = 100) -> Dict:
+    """a contact/vids/batch response with the default batch properties"""
+    return {
+        str(vid): {
+            "vid": vid,
+            "canonical-vid": vid,
+            "merged-vids": [],
+            "portal-id": 62515,
+            "is-contact": True,
+            "properties": {
+                name: {"value": f"{name} {vid}"}
+                for name in (
+                    "email",
+                    "firstname",
+                    "lastname",
+                    "company",
+                    "website",
+                    "phone",
+                    "address",
+                    "city",
+                    "state",
+                    "zip",
+                    "associatedcompanyid",
+                )
+            },
+            "identity-profiles": [
+                {
+                    "vid": vid,
+                    "identities": [
+                        {"type": "EMAIL", "value": f"contact{vid}@example.com"}
+                    ],
+                }
+            ],
+        }
+        for vid in range(count)
+    }
+
+
+def load_payloads(paths: List[str]) -> Dict[str, bytes]:
+    if paths:
+        payloads = {}
+        for path in paths:
+            with open(path, "rb") as file:
+                payloads[path] = file.read()
+        return payloads
+    return {
+        "companies/paged": json.dumps(generate_companies_page()).encode(),
+        "contact/vids/batch": json.dumps(generate_contacts_batch()).encode(),
+    }
+
+
+def main(paths: List[str]) -> None:
+    codecs = {name: codec for name, codec in get_available_codecs().items() if codec}
+    missing = [name for name, codec in get_available_codecs().items() if not codec]
+    if missing:
+        print(f"not installed: {', '.join(missing)}")
+
+    for name, payload in load_payloads(paths).items():
+        print(f"\n{name} ({len(payload) / 1024 / 1024:.2f} MiB)")
+        document = json.loads(payload)
+        runs = {
+            # how response bodies were decoded before the codecs were introduced
+            "decode (stdlib, via str)": lambda: json.loads(force_utf8(payload)),
+        }
+        for codec_name, codec in codecs.items():
+            runs[f"decode ({codec_name})"] = partial(codec.loads, payload)
+        for codec_name, codec in codecs.items():
+            runs[f"encode ({codec_name})"] = partial(codec.dumps, document)
+
+        for label, run in runs.items():
+            number = 5
+            best = min(timeit.repeat(run, number=number, repeat=3)) / number
+            print(f"  {label:<26} {best * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -2,8 +2,10 @@
 hubspot3 module
 """
 
+import threading
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Dict, Optional
+from hubspot3.connection_pool import ConnectionPool
 from hubspot3.error import HubspotBadConfig, HubspotNoConfig
 
 
@@ -123,254 +125,332 @@ class Hubspot3:
             "timeout": timeout,
         }
         self.options.update(extra_options)
+        # all clients created by this instance share one pool of keep-alive connections,
+        # pass `connection_pool=False` to open a new connection for every request instead
+        if self.options.get("connection_pool") is None:
+            self.options["connection_pool"] = ConnectionPool()
+
+        # clients are created once per instance and then reused, see `_get_client`
+        self._clients = {}  # type: Dict[type, Any]
+        self._clients_lock = threading.Lock()
+        # unless custom oauth2 token storage is configured, all clients share the tokens kept
+        # here, so a token refreshed by one client is used by all of them
+        self._tokens = {}  # type: Dict[str, str]
+        # a getter or setter without its partner is rejected by the clients
+        self._shares_tokens = (
+            self.options.get("oauth2_token_getter") is None
+            and self.options.get("oauth2_token_setter") is None
+        )
+        if self._shares_tokens:
+            self.options["oauth2_token_getter"] = self._get_token
+            self.options["oauth2_token_setter"] = self._set_token
 
         # rate limiting related stuff
         self._usage_limits = Hubspot3UsageLimits()
 
+    def _get_token(self, token_type: str, client_id: Optional[str]) -> Optional[str]:
+        """returns the shared oauth2 token of the given type, if one was set"""
+        return self._tokens.get(token_type)
+
+    def _set_token(self, token_type: str, client_id: Optional[str], token: str) -> None:
+        """updates the shared oauth2 token of the given type"""
+        self._tokens[token_type] = token
+
+    def _get_client(self, client_class, share_tokens: bool = True, reuse: bool = True):
+        """
+        returns the client of the given class for this instance, creating it on first use.
+        All clients share this instance's options, and thereby the connection pool, the rate
+        limiter and the oauth2 tokens, unless `share_tokens` is False. Clients that keep state
+        of the current call on the instance aren't safe to share between threads and are
+        created anew on every access with `reuse=False`.
+        """
+        if not reuse:
+            return self._create_client(client_class, share_tokens)
+        client = self._clients.get(client_class)
+        if client is None:
+            with self._clients_lock:
+                client = self._clients.get(client_class)
+                if client is None:
+                    client = self._create_client(client_class, share_tokens)
+                    self._clients[client_class] = client
+        return client
+
+    def _create_client(self, client_class, share_tokens: bool):
+        options = self.options
+        if self._shares_tokens and not share_tokens:
+            options = {
+                key: value
+                for key, value in options.items()
+                if key not in ("oauth2_token_getter", "oauth2_token_setter")
+            }
+        return client_class(**self.auth, **options)
+
+    def invalidate_clients(self) -> None:
+        """drops all clients created so far, so they are created again on their next use"""
+        with self._clients_lock:
+            self._clients = {}
+
+    def update_credentials(self, **credentials: Optional[str]) -> None:
+        """
+        changes the given credentials (`api_key`, `access_token`, `refresh_token`,
+        `client_id` or `client_secret`) and drops all clients created with the old ones
+        """
+        unknown = set(credentials) - set(self.auth)
+        if unknown:
+            raise HubspotBadConfig(f"Unknown credentials: {', '.join(sorted(unknown))}")
+        for name, value in credentials.items():
+            setattr(self, name, value)
+        self.auth.update(credentials)
+        self._tokens.clear()
+        self.invalidate_clients()
+
     @property
     def _base(self):
         """returns a hubspot3 base client"""
         from hubspot3.base import BaseClient
 
-        return BaseClient(**self.auth, **self.options)
+        return self._get_client(BaseClient)
 
     @property
     def blog(self):
         """returns a hubspot3 blog client"""
         from hubspot3.blog import BlogClient
 
-        return BlogClient(**self.auth, **self.options)
+        return self._get_client(BlogClient)
 
     @property
     def blog_comments(self):
         """returns a hubspot3 blog comments client"""
         from hubspot3.blog import BlogCommentsClient
 
-        return BlogCommentsClient(**self.auth, **self.options)
+        return self._get_client(BlogCommentsClient)
 
     @property
     def blog_topics(self):
         """returns a hubspot3 blog topics client"""
         from hubspot3.blog import BlogTopicsClient
 
-        return BlogTopicsClient(**self.auth, **self.options)
+        return self._get_client(BlogTopicsClient)
 
     @property
     def broadcast(self):
         """returns a hubspot3 broadcast client"""
         from hubspot3.broadcast import BroadcastClient
 
-        return BroadcastClient(**self.auth, **self.options)
+        return self._get_client(BroadcastClient)
 
     @property
     def cms_layouts(self):
         """returns a hubspot3 layouts client"""
         from hubspot3.cms_layouts import CMSLayoutsClient
 
-        return CMSLayoutsClient(**self.auth, **self.options)
+        return self._get_client(CMSLayoutsClient)
 
     @property
     def cms_files(self):
         """returns a hubspot3 files client"""
         from hubspot3.cms_files import CMSFilesClient
 
-        return CMSFilesClient(**self.auth, **self.options)
+        return self._get_client(CMSFilesClient)
 
     @property
     def cms_templates(self):
         """returns a hubspot3 templates client"""
         from hubspot3.cms_templates import CMSTemplatesClient
 
-        return CMSTemplatesClient(**self.auth, **self.options)
+        return self._get_client(CMSTemplatesClient)
 
     @property
     def companies(self):
         """returns a hubspot3 companies client"""
         from hubspot3.companies import CompaniesClient
 
-        return CompaniesClient(**self.auth, **self.options)
+        return self._get_client(CompaniesClient)
 
     @property
     def companies_properties(self):
         """returns a hubspot3 companies properties client"""
         from hubspot3.companies_properties import CompaniesPropertiesClient
 
-        return CompaniesPropertiesClient(**self.auth, **self.options)
+        return self._get_client(CompaniesPropertiesClient)
 
     @property
     def contact_lists(self):
         """returns a hubspot3 contact_lists client"""
         from hubspot3.contact_lists import ContactListsClient
 
-        return ContactListsClient(**self.auth, **self.options)
+        return self._get_client(ContactListsClient)
 
     @property
     def contacts(self):
         """returns a hubspot3 contacts client"""
         from hubspot3.contacts import ContactsClient
 
-        return ContactsClient(**self.auth, **self.options)
+        return self._get_client(ContactsClient)
 
     @property
     def crm_associations(self):
         """returns a hubspot3 crm_associations client"""
         from hubspot3.crm_associations import CRMAssociationsClient
 
-        return CRMAssociationsClient(**self.auth, **self.options)
+        return self._get_client(CRMAssociationsClient)
 
     @property
     def crm_association_labels(self):
         """returns a hubspot3 crm_association_labels client"""
         from hubspot3.crm_association_labels import CRMAssociationLabelsClient
 
-        return CRMAssociationLabelsClient(**self.auth, **self.options)
+        return self._get_client(CRMAssociationLabelsClient)
 
     @property
     def crm_pipelines(self):
         """returns a hubspot3 crm_pipelines client"""
         from hubspot3.crm_pipelines import PipelinesClient
 
-        return PipelinesClient(**self.auth, **self.options)
+        return self._get_client(PipelinesClient)
 
     @property
     def deals(self):
         """returns a hubspot3 deals client"""
         from hubspot3.deals import DealsClient
 
-        return DealsClient(**self.auth, **self.options)
+        return self._get_client(DealsClient)
 
     @property
     def ecommerce_bridge(self):
         """returns a hubspot3 ecommerce bridge client"""
         from hubspot3.ecommerce_bridge import EcommerceBridgeClient
 
-        return EcommerceBridgeClient(**self.auth, **self.options)
+        return self._get_client(EcommerceBridgeClient)
 
     @property
     def email_events(self):
         """returns a hubspot3 email events client"""
         from hubspot3.email_events import EmailEventsClient
 
-        return EmailEventsClient(**self.auth, **self.options)
+        return self._get_client(EmailEventsClient)
 
     @property
     def email_subscription(self):
         """returns a hubspot3 email subscription client"""
         from hubspot3.email_subscription import EmailSubscriptionClient
 
-        return EmailSubscriptionClient(**self.auth, **self.options)
+        return self._get_client(EmailSubscriptionClient)
 
     @property
     def engagements(self):
         """returns a hubspot3 engagements client"""
         from hubspot3.engagements import EngagementsClient
 
-        return EngagementsClient(**self.auth, **self.options)
+        return self._get_client(EngagementsClient)
 
     @property
     def form_submissions(self):
         """returns a hubspot3 form submissions client"""
         from hubspot3.forms import FormSubmissionClient
 
-        return FormSubmissionClient(**self.auth, **self.options)
+        return self._get_client(FormSubmissionClient)
 
     @property
     def forms(self):
         """returns a hubspot3 forms client"""
         from hubspot3.forms import FormsClient
 
-        return FormsClient(**self.auth, **self.options)
+        return self._get_client(FormsClient)
 
     @property
     def keywords(self):
         """returns a hubspot3 keywords client"""
         from hubspot3.keywords import KeywordsClient
 
-        return KeywordsClient(**self.auth, **self.options)
+        return self._get_client(KeywordsClient)
 
     @property
     def leads(self):
         """returns a hubspot3 leads client"""
         from hubspot3.leads import LeadsClient
 
-        return LeadsClient(**self.auth, **self.options)
+        return self._get_client(LeadsClient)
 
     @property
     def lines(self):
         """returns a hubspot3 lines client"""
         from hubspot3.lines import LinesClient
 
-        return LinesClient(**self.auth, **self.options)
+        return self._get_client(LinesClient)
 
     @property
     def oauth2(self):
         """returns a hubspot3 OAuth2 client"""
         from hubspot3.oauth2 import OAuth2Client
 
-        return OAuth2Client(**self.auth, **self.options)
+        # it clears its own access token, which must not clear the shared one
+        return self._get_client(OAuth2Client, share_tokens=False)
 
     @property
     def owners(self):
         """returns a hubspot3 owners client"""
         from hubspot3.owners import OwnersClient
 
-        return OwnersClient(**self.auth, **self.options)
+        return self._get_client(OwnersClient)
 
     @property
     def products(self):
         """returns a hubspot3 products client"""
         from hubspot3.products import ProductsClient
 
-        return ProductsClient(**self.auth, **self.options)
+        return self._get_client(ProductsClient)
 
     @property
     def properties(self):
         """returns a hubspot3 deal properties client"""
         from hubspot3.properties import PropertiesClient
 
-        return PropertiesClient(**self.auth, **self.options)
+        # it keeps the object type of the current call on the instance
+        return self._get_client(PropertiesClient, reuse=False)
 
     @property
     def property_groups(self):
         """returns a hubspot3 property_groups client"""
         from hubspot3.property_groups import PropertyGroupsClient
 
-        return PropertyGroupsClient(**self.auth, **self.options)
+        # it keeps the object type of the current call on the instance
+        return self._get_client(PropertyGroupsClient, reuse=False)
 
     @property
     def prospects(self):
         """returns a hubspot3 prospects client"""
         from hubspot3.prospects import ProspectsClient
 
-        return ProspectsClient(**self.auth, **self.options)
+        return self._get_client(ProspectsClient)
 
     @property
     def settings(self):
         """returns a hubspot3 settings client"""
         from hubspot3.settings import SettingsClient
 
-        return SettingsClient(**self.auth, **self.options)
+        return self._get_client(SettingsClient)
 
     @property
     def tickets(self):
         """returns a hubspot3 tickets client"""
         from hubspot3.tickets import TicketsClient
 
-        return TicketsClient(**self.auth, **self.options)
+        return self._get_client(TicketsClient)
 
     @property
     def users(self):
         """returns a hubspot3 users client"""
         from hubspot3.users import UsersClient
 
-        return UsersClient(**self.auth, **self.options)
+        return self._get_client(UsersClient)
 
     @property
     def workflows(self):
         """returns a hubspot3 workflows client"""
         from hubspot3.workflows import WorkflowsClient
 
-        return WorkflowsClient(**self.auth, **self.options)
+        return self._get_client(WorkflowsClient)
 
     @property
     def usage_limits(self):
@@ -384,6 +464,12 @@ class Hubspot3:
                 resets_at=datetime.fromtimestamp(int(limits["resetsAt"]) / 1000),
                 usage_limit=limits["usageLimit"],
             )
+            rate_limiter = self.options.get("rate_limiter")
+            if rate_limiter:
+                rate_limiter.update_daily_budget(
+                    self._usage_limits.calls_remaining,
+                    self._usage_limits.resets_at.timestamp(),
+                )
         return self._usage_limits
 
     @property
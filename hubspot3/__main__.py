@@ -137,6 +137,9 @@ class ClientCLIWrapper:
             # original API method.
             args, kwargs = self._replace_stdin_token(*args, **kwargs)
             result = method(*args, **kwargs)
+            # Streaming methods return generators, which need to be consumed for output.
+            if isinstance(result, types.GeneratorType):
+                result = list(result)
 
             # Try to ensure to always write JSON to stdout, but don't hide any
             # result either if it can't be JSON-encoded.
@@ -0,0 +1,1039 @@
+"""
+asyncio versions of the hubspot3 clients
+"""
+
+import asyncio
+import http.client
+import io
+import json
+import socket
+import ssl
+import time
+import traceback
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
+from hubspot3.base import BaseClient
+from hubspot3.companies import CompaniesClient
+from hubspot3.contacts import ContactsClient
+from hubspot3.crm_associations import CRMAssociationsClient, Definitions
+from hubspot3.deals import DealsClient
+from hubspot3.engagements import EngagementsClient
+from hubspot3.error import (
+    HubspotError,
+    HubspotNotSupported,
+    HubspotTimeout,
+    HubspotUnauthorized,
+)
+from hubspot3.instrumentation import EndpointPath
+from hubspot3.lines import LinesClient
+from hubspot3.owners import OWNERS_PAGE_LIMIT, OwnersClient
+from hubspot3.products import ProductsClient
+from hubspot3.tickets import TicketsClient
+from hubspot3.utils import force_utf8, ordered_dict, prettify, uglify_hapikey
+
+
+class AsyncResponse:
+    """
+    A fully read HTTP response, exposing the same attributes as `http.client.HTTPResponse`
+    that the rest of hubspot3 (and the HubspotError classes) rely on.
+    """
+
+    def __init__(self, status: int, reason: str, msg, raw_body: bytes) -> None:
+        self.status = status
+        self.reason = reason
+        self.msg = msg
+        self.headers = msg
+        self.raw_body = raw_body
+        self.body = None
+
+    def getheaders(self) -> List[Tuple[str, str]]:
+        return list(self.msg.items())
+
+    def getheader(self, name: str, default=None):
+        return self.msg.get(name, default)
+
+    def read(self) -> bytes:
+        return self.raw_body
+
+
+class AsyncConnection:
+    """A minimal HTTP/1.1 keep-alive connection on top of asyncio streams."""
+
+    def __init__(self, host: str, protocol: str = "https", timeout: int = 10) -> None:
+        self.host = host
+        self.timeout = timeout
+        hostname, _, port = host.partition(":")
+        self._hostname = hostname
+        self._port = int(port) if port else (443 if protocol == "https" else 80)
+        self._ssl = ssl.create_default_context() if protocol == "https" else None
+        self._reader = None  # type: Optional[asyncio.StreamReader]
+        self._writer = None  # type: Optional[asyncio.StreamWriter]
+        self.loop = None  # type: Optional[asyncio.AbstractEventLoop]
+        self.will_close = False
+
+    async def request(self, method: str, url: str, body=None, headers=None):
+        """sends a request and returns the fully read AsyncResponse"""
+        if self._writer is None:
+            self.loop = asyncio.get_running_loop()
+            self._reader, self._writer = await asyncio.open_connection(
+                self._hostname, self._port, ssl=self._ssl
+            )
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        lines = [f"{method} {url} HTTP/1.1", f"Host: {self.host}"]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        if body is not None or method in ("POST", "PUT", "PATCH"):
+            lines.append(f"Content-Length: {len(body or b'')}")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        self._writer.write(head + (body or b""))
+        await self._writer.drain()
+        return await self._read_response(method)
+
+    async def _read_response(self, method: str) -> AsyncResponse:
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise http.client.RemoteDisconnected(
+                "Remote end closed connection without response"
+            )
+        version, status, reason = (
+            status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""]
+        )[:3]
+        header_lines = []
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            header_lines.append(line)
+        msg = http.client.parse_headers(io.BytesIO(b"".join(header_lines) + b"\r\n"))
+
+        code = int(status)
+        if method == "HEAD" or code in (204, 304) or 100 <= code < 200:
+            raw_body = b""
+        elif "chunked" in msg.get("Transfer-Encoding", "").lower():
+            raw_body = await self._read_chunked()
+        elif msg.get("Content-Length") is not None:
+            raw_body = await self._reader.readexactly(int(msg["Content-Length"]))
+        else:
+            raw_body = await self._reader.read()
+            self.will_close = True
+        if version == "HTTP/1.0" or msg.get("Connection", "").lower() == "close":
+            self.will_close = True
+        return AsyncResponse(code, reason, msg, raw_body)
+
+    async def _read_chunked(self) -> bytes:
+        chunks = []
+        while True:
+            size_line = await self._reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                # skip the (usually empty) trailer section
+                while await self._reader.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self._reader.readexactly(size))
+            await self._reader.readexactly(2)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            try:
+                running_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                running_loop = None
+            if self.loop is running_loop or self.loop is None:
+                self._writer.close()
+            elif self.loop.is_running():
+                # the transport belongs to a loop of another thread
+                self.loop.call_soon_threadsafe(self._writer.close)
+            else:
+                # the transport can only be closed by its loop, which won't run anymore, but
+                # shutting down its socket still ends the connection
+                sock = self._writer.get_extra_info("socket")
+                if sock is not None:
+                    try:
+                        sock.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+        self._reader = self._writer = None
+
+
+class AsyncBaseClient(BaseClient):
+    """
+    Base object for interacting with the HubSpot APIs from asyncio code.
+
+    Requests are built, retried and mapped to errors exactly like in the BaseClient, but are sent
+    over non-blocking keep-alive connections, so `_call` has to be awaited.
+    """
+
+    # Maximum number of idle keep-alive connections kept per client
+    max_idle_connections = 10
+
+    def __init__(self, *args, **kwargs) -> None:
+        super(AsyncBaseClient, self).__init__(*args, **kwargs)
+        self._idle_connections = deque()  # type: Deque[AsyncConnection]
+
+    def _prepare_connection_type(self):
+        super(AsyncBaseClient, self)._prepare_connection_type()
+        self.options["async_connection_type"] = AsyncConnection
+
+    def _acquire_connection(self, opts) -> Tuple[AsyncConnection, bool]:
+        loop = asyncio.get_running_loop()
+        while self._idle_connections:
+            connection = self._idle_connections.pop()
+            # connections are bound to the event loop they were opened in
+            if connection.loop is loop:
+                return connection, True
+            connection.close()
+        connection = opts["async_connection_type"](
+            opts["api_base"], protocol=opts["protocol"], timeout=opts["timeout"]
+        )
+        return connection, False
+
+    def _release_connection(self, connection: AsyncConnection) -> None:
+        if (
+            connection.will_close
+            or len(self._idle_connections) >= self.max_idle_connections
+        ):
+            connection.close()
+        else:
+            self._idle_connections.append(connection)
+
+    async def close(self) -> None:
+        """closes all idle connections of this client"""
+        while self._idle_connections:
+            self._idle_connections.pop().close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _perform_request(self, opts, method, url, headers, data):
+        while True:
+            connection, reused = self._acquire_connection(opts)
+            request_info = {
+                "method": method,
+                "url": url,
+                "data": data,
+                "headers": headers,
+                "host": connection.host,
+                "timeout": connection.timeout,
+            }
+            try:
+                result = await asyncio.wait_for(
+                    connection.request(method, url, data, headers), opts["timeout"]
+                )
+            except (OSError, EOFError, ValueError, asyncio.TimeoutError) as exception:
+                connection.close()
+                if reused and isinstance(exception, (ConnectionError, EOFError)):
+                    self.log.debug("Pooled connection was stale, reconnecting")
+                    continue
+                raise HubspotTimeout(
+                    None, request_info, traceback.format_exc()
+                ) from exception
+            result.headers_received_at = time.perf_counter()
+            self._release_connection(connection)
+            raw_body = result.read()
+            result.raw_size = len(raw_body)
+            result.body = self._decode_body(result, raw_body)
+            self._update_rate_limit_state(result)
+            self._raise_for_status(result, request_info)
+            return result
+
+    async def _perform_attempt(
+        self, opts, method, url, headers, data, subpath, attempt
+    ):
+        event = self._start_request_event(opts, method, url, data, subpath, attempt)
+        if event is None:
+            return await self._perform_request(opts, method, url, headers, data)
+        try:
+            result = await self._perform_request(opts, method, url, headers, data)
+        except Exception as exception:
+            self._finish_request_event(event, exception=exception)
+            raise
+        self._finish_request_event(event, result)
+        return result
+
+    async def _call_raw(
+        self,
+        subpath,
+        params=None,
+        method="GET",
+        data=None,
+        doseq=False,
+        query="",
+        retried=False,
+        properties=None,
+        **options,
+    ):
+        opts = self.options.copy()
+        opts.update(options)
+
+        loop = asyncio.get_running_loop()
+        if self._access_token_expires_soon(self.access_token, opts):
+            # token refreshes are rare and go through the synchronous OAuth2Client, so they
+            # must not be run again on the event loop when preparing the request
+            await loop.run_in_executor(None, self._refresh_expiring_access_token, opts)
+
+        url, headers, data = self._prepare_request(
+            subpath,
+            params,
+            data,
+            opts,
+            doseq=doseq,
+            query=query,
+            retried=retried,
+            properties=properties,
+            refresh_access_token=False,
+        )
+
+        if opts.get("debug"):
+            print(
+                json.dumps(
+                    {"url": url, "headers": headers, "data": force_utf8(data)},
+                    sort_keys=True,
+                    indent=2,
+                )
+            )
+
+        num_retries = self._get_num_retries(method, opts)
+        try_count = 0
+        while True:
+            delay = self._get_rate_limit_delay(opts)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                try_count += 1
+                return await self._perform_attempt(
+                    opts, method, url, headers, data, subpath, try_count
+                )
+            except HubspotUnauthorized:
+                if not await loop.run_in_executor(
+                    None,
+                    self._refresh_access_token,
+                    retried,
+                    self._get_bearer_token(headers),
+                ):
+                    raise
+                return await self._call_raw(
+                    subpath,
+                    params=params,
+                    method=method,
+                    data=data,
+                    doseq=doseq,
+                    query=query,
+                    retried=True,
+                    **options,
+                )
+            except HubspotError as exception:
+                if not self._should_retry(exception, try_count, num_retries, url):
+                    raise
+                self._prepare_request_retry(method, url, headers, data)
+                self.log.warning(
+                    f"HubspotError {exception} calling {uglify_hapikey(url)}, retrying",
+                    extra={
+                        "endpoint": self._get_endpoint(subpath),
+                        "attempt": try_count,
+                    },
+                )
+                await asyncio.sleep(self._get_retry_delay(try_count, exception))
+
+    async def _call(
+        self,
+        subpath: str,
+        params: Optional[Dict] = None,
+        method: str = "GET",
+        data: Union[str, Dict, List, None] = None,
+        doseq: bool = False,
+        query: str = "",
+        raw: bool = False,
+        properties: Optional[List] = None,
+        **options,
+    ):
+        result = await self._call_raw(
+            subpath,
+            params=params,
+            method=method,
+            data=data,
+            doseq=doseq,
+            query=query,
+            retried=False,
+            properties=properties,
+            **options,
+        )
+        return result if raw else self._digest_result(result.body)
+
+
+# The clients below inherit every method from their synchronous counterparts. Methods that
+# simply return `self._call(...)` automatically return awaitables; only methods that process
+# responses (mostly paginators) are reimplemented as coroutines. The lazy iterators, batch
+# writers and thread pools of the synchronous clients have no asyncio version yet and raise
+# HubspotNotSupported instead.
+
+
+def _sync_only(name: str):
+    """returns a method that rejects a method of the synchronous client"""
+
+    def method(self, *args, **kwargs):
+        raise HubspotNotSupported(
+            f"{type(self).__name__}.{name} is only available on the synchronous client."
+        )
+
+    method.__name__ = name
+    method.__doc__ = "not supported by the asyncio client, use the synchronous one"
+    return method
+
+
+def _reject_sync_options(client, options: Dict, *names: str) -> None:
+    """
+    rejects the options of the synchronous client that the asyncio one doesn't support, and
+    removes them from the request options if they are unset
+    """
+    for name in names:
+        if options.pop(name, None):
+            raise HubspotNotSupported(
+                f"{type(client).__name__} doesn't support the `{name}` option."
+            )
+
+
+class AsyncCRMAssociationsClient(AsyncBaseClient, CRMAssociationsClient):
+    """asyncio version of the CRMAssociationsClient"""
+
+    iter_all = _sync_only("iter_all")
+    iter_many = _sync_only("iter_many")
+    create_many = _sync_only("create_many")
+    delete_many = _sync_only("delete_many")
+
+    async def get(self, object_id: str, definition: Union[Definitions, int]):
+        """
+        get all associations for the defined object
+        :param object_id: Object ID for the object you're looking up
+        :param definition: Definition ID for the objects you're looking for associations of
+        """
+        return await self.get_all(object_id, definition)
+
+    async def get_all(
+        self, object_id: str, definition: Union[Definitions, int], **options
+    ):
+        """
+        get all crm associations
+        :param object_id: Object ID for the object you're looking up
+        :param definition: Definition ID for the objects you're looking for associations of
+        """
+        finished = False
+        output = []
+        offset = 0
+        query_limit = 100  # Max value according to docs
+        definition_id = definition if isinstance(definition, int) else definition.value
+
+        while not finished:
+            batch = await self._call(
+                EndpointPath(
+                    "associations/{object_id}/HUBSPOT_DEFINED/{definition_id}",
+                    object_id=object_id,
+                    definition_id=definition_id,
+                ),
+                method="GET",
+                params={"limit": query_limit, "offset": offset},
+            )
+            output.extend(batch["results"])
+            finished = not batch["hasMore"]
+            offset = batch["offset"]
+
+        return output
+
+
+class AsyncContactsClient(AsyncBaseClient, ContactsClient):
+    """asyncio version of the ContactsClient"""
+
+    iter_all = _sync_only("iter_all")
+    iter_recently_modified = _sync_only("iter_recently_modified")
+    create_or_update_batch = _sync_only("create_or_update_batch")
+
+    async def get_batch(self, ids, extra_properties: Union[List, str, None] = None):
+        """given a batch of vids, get more of their info"""
+        batch = await self._call(
+            "contact/vids/batch",
+            method="GET",
+            doseq=True,
+            params={
+                "vid": ids,
+                "property": self._get_batch_properties(extra_properties),
+            },
+        )
+        # It returns a dict with IDs as keys
+        return [prettify(batch[contact], id_key="vid") for contact in batch]
+
+    async def link_contact_to_company(self, contact_id, company_id):
+        associations_client = self._get_sibling_client(AsyncCRMAssociationsClient)
+        async with associations_client:
+            return await associations_client.link_contact_to_company(
+                contact_id, company_id
+            )
+
+    async def get_all(
+        self,
+        extra_properties: Union[List, str, None] = None,
+        limit: int = -1,
+        list_id: str = "all",
+        **options,
+    ) -> List[Dict]:
+        """
+        get all contacts in hubspot, fetching additional properties if passed in
+        :see: https://developers.hubspot.com/docs/methods/contacts/get_contacts
+        """
+        _reject_sync_options(self, options, "enrichment_workers")
+        # only used together with `enrichment_workers`
+        options.pop("max_pending_batches", None)
+        finished = False
+        output = []  # type: list
+        offset = 0
+        query_limit = 100  # Max value according to docs
+        limited = limit > 0
+        if limited and limit < query_limit:
+            query_limit = limit
+        while not finished:
+            batch = await self._call(
+                EndpointPath("lists/{list_id}/contacts/all", list_id=list_id),
+                method="GET",
+                params={"count": query_limit, "vidOffset": offset},
+                **options,
+            )
+            output.extend(
+                await self.get_batch(
+                    [contact["vid"] for contact in batch["contacts"]],
+                    extra_properties=extra_properties,
+                )
+            )
+            finished = not batch["has-more"] or (limited and len(output) >= limit)
+            offset = batch["vid-offset"]
+
+        return output if not limited else output[:limit]
+
+    async def _get_recent(
+        self,
+        recency_type: str,
+        limit: int = 100,
+        vid_offset: int = 0,
+        time_offset: int = 0,
+        **options,
+    ) -> List[Dict]:
+        """
+        return a list of either recently created or recently modified/created contacts
+        """
+        recency_string = (
+            "all"
+            if recency_type == ContactsClient.Recency.CREATED
+            else "recently_updated"
+        )
+        return await self._get_contacts_pages(
+            f"lists/{recency_string}/contacts/recent",
+            limit,
+            vid_offset,
+            time_offset,
+            **options,
+        )
+
+    async def get_in_list(
+        self,
+        list_id: int,
+        limit: int = 100,
+        vid_offset: int = 0,
+        time_offset: int = 0,
+        **options,
+    ) -> List[Dict]:
+        """
+        return contacts in a list
+        """
+        return await self._get_contacts_pages(
+            f"lists/{list_id}/contacts/all", limit, vid_offset, time_offset, **options
+        )
+
+    async def _get_contacts_pages(
+        self, subpath: str, limit: int, vid_offset: int, time_offset: int, **options
+    ) -> List[Dict]:
+        finished = False
+        output = []  # type: list
+        query_limit = 100  # max according to the docs
+        limited = limit > 0
+        if limited and limit < query_limit:
+            query_limit = limit
+
+        while not finished:
+            params = {"count": query_limit}
+            if vid_offset and time_offset:
+                params["vidOffset"] = vid_offset
+                params["timeOffset"] = time_offset
+            batch = await self._call(
+                subpath, method="GET", params=params, doseq=True, **options
+            )
+            output.extend(batch["contacts"])
+            finished = not batch["has-more"] or len(output) >= limit
+            vid_offset = batch.get("vid-offset", 0)
+            time_offset = batch.get("time-offset", 0)
+
+        return output[:limit]
+
+    async def search(self, search_query: str, **options):
+        """
+        Search among contacts for matches with the given `search_query`.
+        :see: https://developers.hubspot.com/docs/methods/contacts/search_contacts
+        """
+        finished = False
+        offset = 0
+        query_limit = 100  # Max value according to docs
+        output = []  # type: list
+
+        while not finished:
+            batch = await self._call(
+                "search/query",
+                method="GET",
+                params={"count": query_limit, "offset": offset, "q": search_query},
+                **options,
+            )
+            output += batch["contacts"]
+            finished = not batch["has-more"]
+            offset = batch["offset"]
+
+        return output
+
+    async def delete_all(self):
+        """
+        Delete all the contacts. Please use it carefully.
+        """
+        for contact in await self.get_all():
+            await self.delete_by_id(contact["id"])
+
+
+class AsyncCompaniesClient(AsyncBaseClient, CompaniesClient):
+    """asyncio version of the CompaniesClient"""
+
+    iter_all = _sync_only("iter_all")
+    iter_recently_modified = _sync_only("iter_recently_modified")
+
+    async def delete_all(self, **options):
+        """
+        Delete all the companies. Please use it carefully.
+        """
+        for company in await self.get_all(**options):
+            await self.delete(company["id"])
+
+    async def get_all(
+        self,
+        prettify_output: bool = True,
+        extra_properties: Union[str, List, None] = None,
+        **options,
+    ) -> Optional[List]:
+        """
+        get all companies, including extra properties if they are passed in
+        """
+        finished = False
+        output = []
+        offset = 0
+        query_limit = 250  # Max value according to docs
+        properties = self._get_all_properties(extra_properties)
+
+        while not finished:
+            batch = await self._call(
+                "companies/paged",
+                method="GET",
+                doseq=True,
+                params={
+                    "limit": query_limit,
+                    "offset": offset,
+                    "propertiesWithHistory": properties,
+                    "includeMergeAudits": "true",
+                },
+                **options,
+            )
+            output.extend(
+                [
+                    (
+                        prettify(company, id_key="companyId")
+                        if prettify_output
+                        else company
+                    )
+                    for company in batch["companies"]
+                    if not company["isDeleted"]
+                ]
+            )
+            finished = not batch["has-more"]
+            offset = batch["offset"]
+
+        return output
+
+    async def _get_recent(
+        self,
+        recency_type: str,
+        limit: int = 250,
+        offset: int = 0,
+        since: Optional[int] = None,
+        **options,
+    ) -> Optional[List]:
+        """
+        Returns either list of recently modified companies or recently created companies,
+        depending on recency_type passed in.
+        """
+        finished = False
+        output = []
+
+        while not finished:
+            params = {"count": limit, "offset": offset}
+            if since:
+                params["since"] = since
+            batch = await self._call(
+                f"companies/recent/{recency_type}",
+                method="GET",
+                doseq=True,
+                params=params,
+                **options,
+            )
+            output.extend(
+                [
+                    prettify(company, id_key="companyId")
+                    for company in batch["results"]
+                    if not company["isDeleted"]
+                ]
+            )
+            finished = not batch["hasMore"]
+            offset = batch["offset"]
+
+        return output
+
+
+class AsyncDealsClient(AsyncBaseClient, DealsClient):
+    """asyncio version of the DealsClient"""
+
+    iter_all = _sync_only("iter_all")
+    iter_recently_modified = _sync_only("iter_recently_modified")
+
+    async def get_all(
+        self,
+        offset: int = 0,
+        extra_properties: Union[list, str, None] = None,
+        limit: int = -1,
+        **options,
+    ):
+        """
+        get all deals in the hubspot account.
+        extra_properties: a list used to extend the properties fetched
+        """
+        finished = False
+        output = []
+        query_limit = 250  # Max value according to docs
+        limited = limit > 0
+        if limited and limit < query_limit:
+            query_limit = limit
+        properties = self._get_all_properties(extra_properties)
+
+        while not finished:
+            batch = await self._call(
+                "deal/paged",
+                method="GET",
+                params={
+                    "limit": query_limit,
+                    "offset": offset,
+                    "properties": properties,
+                    "includeAssociations": True,
+                },
+                doseq=True,
+                **options,
+            )
+            output.extend(
+                [
+                    prettify(deal, id_key="dealId")
+                    for deal in batch["deals"]
+                    if not deal["isDeleted"]
+                ]
+            )
+            finished = not batch["hasMore"] or (limited and len(output) >= limit)
+            offset = batch["offset"]
+
+        return output if not limited else output[:limit]
+
+    async def _get_recent(
+        self,
+        recency_type: str,
+        limit: int = 100,
+        offset: int = 0,
+        since: Optional[int] = None,
+        include_versions: bool = False,
+        **options,
+    ):
+        """
+        returns a list of either recently created or recently modified deals
+
+        :param since: unix formatted timestamp in milliseconds
+        """
+        finished = False
+        output = []
+        query_limit = 100  # max according to the docs
+        limited = limit > 0
+        if limited and limit < query_limit:
+            query_limit = limit
+
+        while not finished:
+            params = {
+                "count": query_limit,
+                "offset": offset,
+                "includePropertyVersions": include_versions,
+            }
+            if since:
+                params["since"] = since
+            batch = await self._call(
+                f"deal/recent/{recency_type}",
+                method="GET",
+                params=params,
+                doseq=True,
+                **options,
+            )
+            output.extend(
+                [
+                    prettify(deal, id_key="dealId")
+                    for deal in batch["results"]
+                    if not deal["isDeleted"]
+                ]
+            )
+            finished = not batch["hasMore"] or len(output) >= limit
+            offset = batch["offset"]
+
+        return output[:limit]
+
+
+class AsyncEngagementsClient(AsyncBaseClient, EngagementsClient):
+    """asyncio version of the EngagementsClient"""
+
+    iter_all = _sync_only("iter_all")
+    iter_recently_modified = _sync_only("iter_recently_modified")
+
+    async def _get_paged(self, subpath: str, params: Dict, **options) -> List[Dict]:
+        finished = False
+        output = []  # type: List[Dict]
+        offset = 0
+        while not finished:
+            batch = await self._call(
+                subpath, method="GET", params=dict(params, offset=offset), **options
+            )
+            output.extend(batch["results"])
+            finished = not batch["hasMore"]
+            offset = batch["offset"]
+
+        return output
+
+    async def get_associated(self, object_type, object_id, **options) -> List[Dict]:
+        """
+        get all engagements associated with the given object
+        :param object_type: type of object to get associations on [CONTACT, COMPANY, DEAL]
+        :param object_id: ID of the object to get associations on
+        """
+        return await self._get_paged(
+            f"engagements/associated/{object_type}/{object_id}/paged",
+            {"limit": 100},
+            **options,
+        )
+
+    async def get_all(self, **options) -> List[Dict]:
+        """get all engagements"""
+        return await self._get_paged("engagements/paged", {"limit": 250}, **options)
+
+    async def get_recently_modified(self, since, **options) -> List[Dict]:
+        """get recently modified engagements"""
+        return await self._get_paged(
+            "engagements/recent/modified", {"limit": 100, "since": since}, **options
+        )
+
+
+class AsyncLinesClient(AsyncBaseClient, LinesClient):
+    """asyncio version of the LinesClient"""
+
+    iter_all = _sync_only("iter_all")
+
+    async def get_all(
+        self,
+        offset: int = 0,
+        extra_properties: Union[list, str, None] = None,
+        limit: int = -1,
+        **options,
+    ):
+        """
+        Retrieve all the line items in the Hubspot account.
+        """
+        finished = False
+        output = []
+        limited = limit > 0
+        properties = self._get_all_properties(extra_properties)
+
+        while not finished:
+            batch = await self._call(
+                "paged",
+                method="GET",
+                params=ordered_dict({"offset": offset, "properties": properties}),
+                doseq=True,
+                **options,
+            )
+            output.extend(
+                [
+                    prettify(line_item, id_key="objectId")
+                    for line_item in batch["objects"]
+                    if not line_item["isDeleted"]
+                ]
+            )
+            finished = not batch["hasMore"] or (limited and len(output) >= limit)
+            offset = batch["offset"]
+
+        return output if not limited else output[:limit]
+
+    async def link_line_item_to_deal(self, line_item_id, deal_id) -> Dict:
+        """Link a line item to a deal."""
+        associations_client = self._get_sibling_client(AsyncCRMAssociationsClient)
+        async with associations_client:
+            return await associations_client.link_line_item_to_deal(
+                line_item_id, deal_id
+            )
+
+
+class AsyncProductsClient(AsyncBaseClient, ProductsClient):
+    """asyncio version of the ProductsClient"""
+
+    iter_all_products = _sync_only("iter_all_products")
+
+    async def get_all_products(
+        self, properties: Optional[List[str]] = None, offset: int = 0, **options
+    ):
+        """get all products in the hubspot account"""
+        properties = properties or []
+        finished = False
+        output = []
+        querylimit = 100  # Max value according to docs
+        while not finished:
+            batch = await self._call(
+                "objects/products/paged",
+                method="GET",
+                params=ordered_dict(
+                    {
+                        "limit": querylimit,
+                        "offset": offset,
+                        "properties": ["name", "description", *properties],
+                    }
+                ),
+                doseq=True,
+                **options,
+            )
+            output.extend(
+                [
+                    prettify(obj, id_key="objectId")
+                    for obj in batch["objects"]
+                    if not obj["isDeleted"]
+                ]
+            )
+            finished = not batch["hasMore"]
+            offset = batch["offset"]
+
+        return output
+
+
+class AsyncTicketsClient(AsyncBaseClient, TicketsClient):
+    """asyncio version of the TicketsClient"""
+
+    iter_all = _sync_only("iter_all")
+
+    async def get_all(
+        self, properties: Optional[List[str]] = None, limit: int = -1, **options
+    ) -> list:
+        """
+        Get all tickets in hubspot
+        """
+        properties = properties or [
+            "subject",
+            "content",
+            "hs_pipeline",
+            "hs_pipeline_stage",
+        ]
+
+        finished = False
+        output = []  # type: list
+        offset = 0
+        limited = limit > 0
+        while not finished:
+            batch = await self._call(
+                "objects/tickets/paged",
+                method="GET",
+                params={"offset": offset},
+                properties=properties,
+                **options,
+            )
+            output.extend(batch["objects"])
+            finished = not batch["hasMore"]
+            offset = batch["offset"]
+
+        return output if not limited else output[:limit]
+
+
+class AsyncOwnersClient(AsyncBaseClient, OwnersClient):
+    """asyncio version of the OwnersClient"""
+
+    async def get_owners(self, **options):
+        """Only returns the list of owners, does not include additional metadata"""
+        _reject_sync_options(self, options, "prefetch_pages")
+        limit = options.pop("limit", None)
+        params = dict(options.pop("params", None) or {})
+        if limit is not None:
+            params["limit"] = min(limit, OWNERS_PAGE_LIMIT)
+        owners = []
+        while True:
+            data = await self._call("owners", params=params, **options)
+            owners.extend(data["results"])
+            if limit is not None and len(owners) >= limit:
+                return owners[:limit]
+            after = data.get("paging", {}).get("next", {}).get("after")
+            if not after:
+                return owners
+            params["after"] = after
+
+    async def get_owner_name_by_id(self, owner_id: str, **options) -> str:
+        """Given an id of an owner, return their name"""
+        owner_name = "value_missing"
+        owner = await self._call(
+            EndpointPath("owners/{owner_id}", owner_id=owner_id), **options
+        )
+        if owner:
+            owner_name = f"{owner['firstName']} {owner['lastName']}"
+        return owner_name
+
+    async def get_owner_email_by_id(self, owner_id: str, **options) -> str:
+        """given an id of an owner, return their email"""
+        owner_email = "value_missing"
+        owner = await self._call(
+            EndpointPath("owners/{owner_id}", owner_id=owner_id), **options
+        )
+        if owner:
+            owner_email = owner["email"]
+        return owner_email
+
+    async def get_owner_by_id(self, owner_id, **options):
+        """Retrieve an owner by its id."""
+        owner = await self._call(
+            EndpointPath("owners/{owner_id}", owner_id=owner_id), **options
+        )
+        if owner:
+            return owner
+        return None
+
+    async def get_owner_by_email(self, owner_email: str, **options):
+        """
+        Retrieve an owner by its email.
+        """
+        owners = await self.get_owners(
+            method="GET", params={"email": owner_email}, **options
+        )
+        if owners:
+            return owners[0]
+        return None
+
+    async def link_owner_to_company(self, owner_id, company_id):
+        """
+        Link an owner to a company by using their ids.
+        """
+        associations_client = self._get_sibling_client(AsyncCRMAssociationsClient)
+        async with associations_client:
+            return await associations_client.link_owner_to_company(owner_id, company_id)
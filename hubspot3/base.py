@@ -5,14 +5,25 @@ base hubspot client class
 import http.client
 import json
 import logging
+import random
+import threading
 import time
 import traceback
 import urllib.request
 import urllib.parse
 import urllib.error
 import zlib
-from typing import Callable, Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from hubspot3 import utils
+from hubspot3.codec import get_codec
+from hubspot3.instrumentation import (
+    RequestEvent,
+    get_endpoint_template,
+    get_instrumentation,
+)
+from hubspot3.rate_limiter import RateLimitState
+from hubspot3.streaming import JSONArrayStream
+from hubspot3.token_refresh import get_expiry, get_refresh_lock
 from hubspot3.utils import force_utf8, uglify_hapikey
 from hubspot3.error import (
     HubspotBadConfig,
@@ -33,6 +44,42 @@ except ImportError:
     from typing_extensions import Literal  # type: ignore
 
 
+_composed_classes = {}  # type: Dict[Tuple[type, Tuple[type, ...]], type]
+_composed_classes_lock = threading.Lock()
+
+
+def _compose_class(client_class: type, mixins: Tuple[type, ...]) -> type:
+    """
+    returns a subclass of the given client class and mixins, with the mixins coming first in
+    the method resolution order. The subclass is created once per combination and reused.
+    Repeated mixins and those the client class already derives from are left out, and the
+    client class itself is returned if no mixin remains.
+    """
+    key = (client_class, mixins)
+    composed = _composed_classes.get(key)
+    if composed is None:
+        with _composed_classes_lock:
+            composed = _composed_classes.get(key)
+            if composed is None:
+                bases = tuple(
+                    mixin
+                    for index, mixin in enumerate(mixins)
+                    if mixin not in mixins[:index] and mixin not in client_class.__mro__
+                )
+                if not bases:
+                    return client_class
+                composed = type(
+                    client_class.__name__,
+                    bases + (client_class,),
+                    {
+                        "__module__": client_class.__module__,
+                        "__qualname__": client_class.__qualname__,
+                    },
+                )
+                _composed_classes[key] = composed
+    return composed
+
+
 class BaseClient:
     """Base abstract object for interacting with the HubSpot APIs"""
 
@@ -43,6 +90,18 @@ class BaseClient:
     # so tests run faster
     sleep_multiplier = 1
 
+    def __new__(cls, *args, mixins: Optional[List] = None, **kwargs):
+        """
+        creates the client as an instance of a subclass of the client class and the given
+        mixins, instead of changing the bases of the client class itself
+        """
+        if mixins:
+            cls = _compose_class(cls, tuple(mixins))
+        client = super(BaseClient, cls).__new__(cls)
+        # kept for the clients this one creates, see `_get_sibling_client`
+        client._mixins = mixins
+        return client
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -64,13 +123,7 @@ class BaseClient:
         **extra_options,
     ) -> None:
         super(BaseClient, self).__init__()
-        # reverse so that the first one in the list because the first parent
-        if not mixins:
-            mixins = []
-        mixins.reverse()
-        for mixin_class in mixins:
-            if mixin_class not in self.__class__.__bases__:
-                self.__class__.__bases__ = (mixin_class,) + self.__class__.__bases__
+        # the mixins were already applied by `__new__`
 
         self.api_key = api_key
         # These are used as fallbacks if there aren't setters/getters, or if no remote tokens can be
@@ -85,12 +138,9 @@ class BaseClient:
             )
         self.oauth2_token_getter = oauth2_token_getter
         self.oauth2_token_setter = oauth2_token_setter
+        # the tokens returned by the getter and until when to use them, see `_get_stored_token`
+        self._token_cache = {}  # type: Dict[str, Tuple[str, float]]
         self.log = utils.get_log("hubspot3")
-        if not disable_auth:
-            if self.api_key and self.access_token:
-                raise HubspotBadConfig("Cannot use both api_key and access_token.")
-            if not (self.api_key or self.access_token or self.refresh_token):
-                raise HubspotNoConfig("Missing required credentials.")
         self.options = {
             "api_base": api_base,
             "debug": debug,
@@ -98,7 +148,16 @@ class BaseClient:
             "timeout": timeout,
         }
         self.options.update(extra_options)
+        if not disable_auth:
+            if self.api_key and self.access_token:
+                raise HubspotBadConfig("Cannot use both api_key and access_token.")
+            if not (self.api_key or self.access_token or self.refresh_token):
+                raise HubspotNoConfig("Missing required credentials.")
         self._prepare_connection_type()
+        # how request and response bodies are encoded and decoded, see `hubspot3.codec`
+        self.json_codec = get_codec(self.options.get("json_codec"))
+        # the rate limit information HubSpot sent with the latest response, if any
+        self.rate_limit_state = None  # type: Optional[RateLimitState]
 
     @property
     def credentials(self):
@@ -115,37 +174,84 @@ class BaseClient:
             "oauth2_token_setter": self.oauth2_token_setter,
         }
 
+    def _get_sibling_client(self, client_class):
+        """
+        returns a client of the given class with the credentials, the mixins and the options of
+        this one, and thereby its api base, connection pool, rate limiter and instrumentation
+        """
+        options = {
+            name: value
+            for name, value in self.options.items()
+            # the api version is specific to each client
+            if name not in ("connection_type", "protocol", "version")
+        }
+        options["api_base"] = f"{self.options['protocol']}://{self.options['api_base']}"
+        client = client_class(
+            **self.credentials,
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+            mixins=self._mixins,
+            **options,
+        )
+        client.options["connection_type"] = self.options["connection_type"]
+        return client
+
     @property
     def access_token(self):
         if self.oauth2_token_getter:
-            return (
-                self.oauth2_token_getter("access_token", self.client_id)
-                or self.__access_token
-            )
+            return self._get_stored_token("access_token") or self.__access_token
         return self.__access_token
 
     @access_token.setter
     def access_token(self, access_token):
         if self.oauth2_token_setter:
             self.oauth2_token_setter("access_token", self.client_id, access_token)
+            self._cache_token("access_token", access_token)
         self.__access_token = access_token
 
     @property
     def refresh_token(self):
         if self.oauth2_token_getter:
-            return (
-                self.oauth2_token_getter("refresh_token", self.client_id)
-                or self.__refresh_token
-            )
+            return self._get_stored_token("refresh_token") or self.__refresh_token
         return self.__refresh_token
 
     @refresh_token.setter
     def refresh_token(self, refresh_token):
         if self.oauth2_token_setter:
             self.oauth2_token_setter("refresh_token", self.client_id, refresh_token)
+            self._cache_token("refresh_token", refresh_token)
         else:
             self.__refresh_token = refresh_token
 
+    def _get_stored_token(self, token_type):
+        """
+        returns the token of the given type from the `oauth2_token_getter`, which is only
+        called again once the cached token is due: after `token_cache_ttl` seconds (60 by
+        default, 0 disables the cache), or for access tokens with a known expiry, once they
+        are about to be refreshed
+        """
+        cached = self._token_cache.get(token_type)
+        if cached and cached[1] > time.time():
+            return cached[0]
+        token = self.oauth2_token_getter(token_type, self.client_id)
+        self._cache_token(token_type, token)
+        return token
+
+    def _cache_token(self, token_type, token):
+        ttl = self.options.get("token_cache_ttl", 60)
+        expires_at = get_expiry(token) if token_type == "access_token" else None
+        if ttl and expires_at is not None:
+            margin = self.options.get("token_refresh_margin", 300)
+            ttl = expires_at - time.time() - margin
+        if token and ttl > 0:
+            self._token_cache[token_type] = (token, time.time() + ttl)
+        else:
+            self._token_cache.pop(token_type, None)
+
+    def _invalidate_token_cache(self):
+        """makes the next token lookups call the `oauth2_token_getter` again"""
+        self._token_cache.clear()
+
     def _prepare_connection_type(self):
         connection_types = {
             "http": http.client.HTTPConnection,
@@ -161,6 +267,16 @@ class BaseClient:
         """get the full api url for the given subpath on this client"""
         return subpath
 
+    def _get_endpoint(self, subpath):
+        """
+        get the endpoint template of the given subpath on this client, i.e. the full api path
+        with placeholders instead of ids, for aggregating requests by endpoint
+        """
+        template = getattr(subpath, "template", None)
+        if template is not None:
+            return self._get_path(template)
+        return get_endpoint_template(self._get_path(subpath))
+
     def _prepare_request_auth(self, subpath, params, data, opts):
         if self.api_key:
             params["hapikey"] = params.get("hapikey") or self.api_key
@@ -175,6 +291,7 @@ class BaseClient:
         query="",
         retried=False,
         properties=None,
+        refresh_access_token=True,
     ):
         params = params or {}
         properties = properties or []
@@ -199,11 +316,13 @@ class BaseClient:
                 "Content-Type": opts.get("content_type") or "application/json",
             }
         )
+        if refresh_access_token:
+            self._refresh_expiring_access_token(opts)
         if self.access_token:
             headers.update({"Authorization": f"Bearer {self.access_token}"})
 
         if data and headers["Content-Type"] == "application/json" and not retried:
-            data = json.dumps(data)
+            data = self.json_codec.dumps(data)
 
         for hs_property in properties:
             url += f"&properties={hs_property}"
@@ -222,31 +341,71 @@ class BaseClient:
         }
         return params
 
-    def _gunzip_body(self, body):
-        return zlib.decompress(body)
+    def _is_gzipped(self, result, body):
+        """returns whether a response body, or its first chunk, is gzip compressed"""
+        encoding = self._get_response_headers(result).get("content-encoding", "")
+        return encoding.lower() == "gzip" or body[:2] == b"\x1f\x8b"
 
-    def _process_body(self, data, gzipped):
-        if gzipped:
-            return force_utf8(self._gunzip_body(data))
-        return data
-
-    def _execute_request_raw(self, conn, request):
-        try:
-            result = conn.getresponse()
-        except Exception as exception:
-            raise HubspotTimeout(None, request, traceback.format_exc()) from exception
+    def _decode_body(self, result, possibly_encoded):
+        """decompresses a raw response body according to its headers"""
+        if possibly_encoded and self._is_gzipped(result, possibly_encoded):
+            try:
+                return zlib.decompress(possibly_encoded, 16 + zlib.MAX_WBITS)
+            except zlib.error:
+                pass
+        return possibly_encoded
 
-        encoding = [i[1] for i in result.getheaders() if i[0] == "content-encoding"]
-        possibly_encoded = result.read()
+    def _iter_body(self, result, request, finish, chunk_size=64 * 1024):
+        """
+        yields the decompressed chunks of a response body while they are received.
+        once done, `finish` is called with whether the body was read completely.
+        """
+        complete = False
+        decompressor = None
         try:
-            possibly_encoded = zlib.decompress(possibly_encoded, 16 + zlib.MAX_WBITS)
-        except Exception:
-            pass
-        result.body = self._process_body(
-            possibly_encoded, len(encoding) and encoding[0] == "gzip"
-        )
-
-        conn.close()
+            while True:
+                try:
+                    chunk = result.read(chunk_size)
+                except Exception as exception:
+                    raise HubspotTimeout(
+                        None, request, traceback.format_exc()
+                    ) from exception
+                if not chunk:
+                    break
+                result.raw_size += len(chunk)
+                if decompressor is None:
+                    decompressor = (
+                        zlib.decompressobj(16 + zlib.MAX_WBITS)
+                        if self._is_gzipped(result, chunk)
+                        else False
+                    )
+                if decompressor:
+                    chunk = decompressor.decompress(chunk)
+                if chunk:
+                    yield chunk
+            if decompressor:
+                tail = decompressor.flush()
+                if tail:
+                    yield tail
+            complete = True
+        finally:
+            finish(complete)
+
+    @staticmethod
+    def _get_response_headers(result) -> Dict[str, str]:
+        """returns the headers of a response with lowercased names"""
+        getheaders = getattr(result, "getheaders", None)
+        if not getheaders:
+            return {}
+        return {name.lower(): value for name, value in getheaders()}
+
+    def _update_rate_limit_state(self, result):
+        state = RateLimitState.from_headers(self._get_response_headers(result))
+        if state:
+            self.rate_limit_state = state
+
+    def _raise_for_status(self, result, request):
+        """raises the matching HubspotError for unsuccessful response statuses"""
         if result.status in (404, 410):
             raise HubspotNotFound(result, request)
         if result.status == 401:
@@ -260,6 +419,151 @@ class BaseClient:
         if result.status >= 500:
             raise HubspotServerError(result, request)
 
+    def _execute_request_raw(self, conn, request, stream=False):
+        try:
+            result = conn.getresponse()
+        except Exception as exception:
+            raise HubspotTimeout(None, request, traceback.format_exc()) from exception
+        result.headers_received_at = time.perf_counter()
+
+        # error bodies are always read completely, they are needed for the HubspotError
+        if stream and result.status < 400:
+            result.body = None
+            result.raw_size = 0
+        else:
+            raw_body = result.read()
+            result.raw_size = len(raw_body)
+            result.body = self._decode_body(result, raw_body)
+        self._update_rate_limit_state(result)
+        self._raise_for_status(result, request)
+        return result
+
+    def _perform_request(self, opts, method, url, headers, data):
+        """
+        performs a single request attempt and returns the raw result.
+        if a `connection_pool` is configured, keep-alive connections are reused across calls;
+        pooled connections that turn out to be stale are transparently replaced.
+        with the `stream` option, the body isn't read yet: `result.chunks` yields it instead,
+        and the connection is only closed or given back to the pool once that is done.
+        """
+        stream = opts.get("stream", False)
+        pool = opts.get("connection_pool")
+        if not pool:
+            connection = opts["connection_type"](
+                opts["api_base"], timeout=opts["timeout"]
+            )
+            try:
+                request_info = self._create_request(
+                    connection, method, url, headers, data
+                )
+                result = self._execute_request_raw(connection, request_info, stream)
+            except BaseException:
+                connection.close()
+                raise
+            if not stream:
+                connection.close()
+                return result
+            result.chunks = self._iter_body(
+                result, request_info, lambda complete: connection.close()
+            )
+            return result
+
+        key = pool.key(opts["connection_type"], opts["api_base"], opts["timeout"])
+        while True:
+            connection, reused = pool.acquire(key)
+            try:
+                request_info = self._create_request(
+                    connection, method, url, headers, data
+                )
+                result = self._execute_request_raw(connection, request_info, stream)
+            except (ConnectionError, HubspotTimeout) as exception:
+                pool.discard(connection)
+                cause = exception.__cause__ or exception
+                if reused and isinstance(cause, ConnectionError):
+                    self.log.debug("Pooled connection was stale, reconnecting")
+                    continue
+                raise
+            except HubspotError:
+                # the body has been read completely, so the connection can be reused
+                pool.release(key, connection)
+                raise
+            except Exception:
+                pool.discard(connection)
+                raise
+            if not stream:
+                pool.release(key, connection)
+                return result
+
+            def finish(complete, connection=connection):
+                if complete:
+                    pool.release(key, connection)
+                else:
+                    pool.discard(connection)
+
+            result.chunks = self._iter_body(result, request_info, finish)
+            return result
+
+    def _start_request_event(self, opts, method, url, data, subpath, attempt):
+        """
+        creates the RequestEvent of an attempt and calls the `before_request` hook of the
+        configured `instrumentation`, returns None if there is none
+        """
+        instrumentation = get_instrumentation(opts.get("instrumentation"))
+        if not instrumentation:
+            return None
+        event = RequestEvent(
+            method,
+            self._get_endpoint(subpath),
+            uglify_hapikey(url),
+            attempt,
+            len(data) if isinstance(data, (str, bytes)) else 0,
+        )
+        event.context["instrumentation"] = instrumentation
+        instrumentation.before_request(event)
+        return event
+
+    def _finish_request_event(self, event, result=None, exception=None):
+        """
+        calls the `after_request` or `request_failed` hook for an attempt. For streamed
+        responses, that happens once the body was read.
+        """
+        instrumentation = event.context["instrumentation"]
+        if exception is not None:
+            event.record_response(getattr(exception, "result", None))
+            instrumentation.request_failed(event, exception)
+        elif result.body is None and hasattr(result, "chunks"):
+            result.chunks = self._instrument_stream(
+                result, result.chunks, event, instrumentation
+            )
+        else:
+            event.record_response(result)
+            instrumentation.after_request(event)
+
+    def _instrument_stream(self, result, chunks, event, instrumentation):
+        decoded_size = 0
+        try:
+            for chunk in chunks:
+                decoded_size += len(chunk)
+                yield chunk
+        except Exception as exception:
+            event.record_response(result)
+            instrumentation.request_failed(event, exception)
+            raise
+        event.record_response(result)
+        event.decoded_size = decoded_size
+        instrumentation.after_request(event)
+
+    def _perform_attempt(self, opts, method, url, headers, data, subpath, attempt):
+        """performs a request attempt, reporting it to the configured `instrumentation`"""
+        event = self._start_request_event(opts, method, url, data, subpath, attempt)
+        if event is None:
+            return self._perform_request(opts, method, url, headers, data)
+        try:
+            result = self._perform_request(opts, method, url, headers, data)
+        except Exception as exception:
+            self._finish_request_event(event, exception=exception)
+            raise
+        self._finish_request_event(event, result)
         return result
 
     def _execute_request(self, conn, request):
@@ -267,20 +571,170 @@ class BaseClient:
         return result.body
 
     def _digest_result(self, data):
-        if data:
-            if isinstance(data, bytes):
+        if data and isinstance(data, (str, bytes)):
+            try:
+                # the codecs decode bytes directly, without decoding them to a string first
+                data = self.json_codec.loads(data)
+            except ValueError:
                 data = utils.force_utf8(data)
-            if isinstance(data, str):
-                try:
-                    data = json.loads(data)
-                except ValueError:
-                    pass
 
         return data
 
     def _prepare_request_retry(self, method, url, headers, data):
         pass
 
+    def _get_rate_limit_delay(self, opts):
+        """
+        reserves a request slot with the configured `rate_limiter` and returns the number of
+        seconds to wait before sending the request
+        """
+        limiter = opts.get("rate_limiter")
+        if not limiter:
+            return 0
+        return limiter.reserve()
+
+    def _wait_for_rate_limit(self, opts):
+        delay = self._get_rate_limit_delay(opts)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _get_num_retries(self, method, opts):
+        """returns how often a request with the given method may be retried"""
+        num_retries = opts.get("number_retries", 2)
+
+        # Never retry a POST, PUT, or DELETE unless explicitly told to
+        if method != "GET" and not opts.get("retry_on_post"):
+            num_retries = 0
+        return min(num_retries, 6)
+
+    def _should_retry(self, exception, try_count, num_retries, url):
+        """returns whether a request that failed with the given HubspotError should be retried"""
+        if try_count > num_retries:
+            # Only output a warning in case the auto-retry mechanism is not disabled
+            if num_retries != 0:
+                logging.warning(f"Too many retries for {uglify_hapikey(url)}")
+            return False
+        # Don't retry errors from 300 to 499, except for being rate limited
+        if (
+            exception.result
+            and 300 <= exception.result.status < 500
+            and exception.result.status != 429
+        ):
+            return False
+        return True
+
+    def _get_retry_delay(self, try_count, exception=None):
+        """
+        returns the number of seconds to wait before the next attempt.
+        if the failed response tells how long to wait (`Retry-After`, or a used up
+        `X-HubSpot-RateLimit-Remaining` for the current interval), exactly that is waited plus
+        up to one second of jitter. otherwise, this is an exponential back off with full jitter:
+        wait up to 0 seconds, 1 second, 3 seconds, 7 seconds, 15 seconds, etc
+        """
+        state = None
+        if exception is not None:
+            state = RateLimitState.from_headers(
+                self._get_response_headers(exception.result)
+            )
+        if state and state.wait_time > 0:
+            wait_time = state.wait_time
+            jitter = random.uniform(0, min(wait_time, 1))
+            return (wait_time + jitter) * self.sleep_multiplier
+        return random.uniform(0, pow(2, try_count - 1) - 1) * self.sleep_multiplier
+
+    @staticmethod
+    def _get_bearer_token(headers) -> Optional[str]:
+        """returns the access token a request was sent with, if any"""
+        authorization = headers.get("Authorization") or ""
+        if not authorization.startswith("Bearer "):
+            return None
+        return authorization[len("Bearer ") :]
+
+    def _access_token_expires_soon(self, access_token, opts) -> bool:
+        """
+        returns whether the access token is known to expire within the `token_refresh_margin`
+        option (in seconds, 5 minutes by default)
+        """
+        expires_at = get_expiry(access_token)
+        if expires_at is None:
+            return False
+        return expires_at - time.time() <= opts.get("token_refresh_margin", 300)
+
+    def _refresh_expiring_access_token(self, opts):
+        """refreshes the access token ahead of time if it is about to expire"""
+        access_token = self.access_token
+        if not self._access_token_expires_soon(access_token, opts):
+            return
+        if not (self.refresh_token and self.client_id and self.client_secret):
+            return
+        try:
+            self._refresh_tokens(access_token)
+        except Exception as exception:
+            # the current token is still valid, a 401 will trigger another attempt
+            self.log.warning(f"Unable to refresh expiring access_token: {exception}")
+
+    def _refresh_tokens(self, stale_access_token):
+        """
+        replaces the given access token with a new one, unless that happened already.
+        only one refresh per client id is in flight at a time: concurrent callers wait for it
+        and then use its result. as the current tokens are read through the
+        `oauth2_token_getter`, tokens that another process refreshed and stored via the
+        `oauth2_token_setter` are picked up the same way.
+        """
+        with get_refresh_lock(self.client_id):
+            self._invalidate_token_cache()
+            if self.access_token != stale_access_token:
+                self.log.debug("Access token was refreshed already")
+                return
+
+            from hubspot3.oauth2 import OAuth2Client
+
+            self.log.debug("Refreshing access token")
+            client = OAuth2Client(**self.options)
+            refresh_result = client.refresh_tokens(
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                refresh_token=self.refresh_token,
+            )
+            # the refresh token comes first, so whoever sees the new access token can use it
+            self.refresh_token = refresh_result["refresh_token"]
+            self.access_token = refresh_result["access_token"]
+
+    def _refresh_access_token(self, retried, failed_access_token=None):
+        """
+        handles a 401 response to a request sent with the given access token by refreshing it.
+        returns True if the token was refreshed and the request should be sent again.
+        """
+        self.log.debug("401 Unauthorized response to API request.")
+        self._invalidate_token_cache()
+        if (
+            self.access_token
+            and self.refresh_token
+            and self.client_id
+            and self.client_secret
+        ):
+            if retried:
+                self.log.error(
+                    "Refreshed token, but request still was not authorized. "
+                    "You may need to grant additional permissions."
+                )
+                return False
+
+            try:
+                self._refresh_tokens(failed_access_token or self.access_token)
+                self.log.debug("Retrying with new token")
+            except Exception as exception:
+                self.log.error(f"Unable to refresh access_token: {exception}")
+                raise
+            return True
+        if self.access_token:
+            self.log.warning(
+                "In order to enable automated refreshing of your access token, please "
+                "provide a client ID, client secret and refresh token in addition to the "
+                "access token."
+            )
+        return False
+
     def _call_raw(
         self,
         subpath,
@@ -312,20 +766,13 @@ class BaseClient:
         if debug:
             print(
                 json.dumps(
-                    {"url": url, "headers": headers, "data": data},
+                    {"url": url, "headers": headers, "data": force_utf8(data)},
                     sort_keys=True,
                     indent=2,
                 )
             )
 
-        kwargs = {"timeout": opts["timeout"]}
-
-        num_retries = opts.get("number_retries", 2)
-
-        # Never retry a POST, PUT, or DELETE unless explicitly told to
-        if method != "GET" and not opts.get("retry_on_post"):
-            num_retries = 0
-        num_retries = min(num_retries, 6)
+        num_retries = self._get_num_retries(method, opts)
 
         emergency_brake = 10
         try_count = 0
@@ -334,78 +781,40 @@ class BaseClient:
             # avoid getting burned by any mistakes in While loop logic
             if emergency_brake < 1:
                 break
+            self._wait_for_rate_limit(opts)
             try:
                 try_count += 1
-                connection = opts["connection_type"](opts["api_base"], **kwargs)
-                request_info = self._create_request(
-                    connection, method, url, headers, data
+                result = self._perform_attempt(
+                    opts, method, url, headers, data, subpath, try_count
                 )
-                result = self._execute_request_raw(connection, request_info)
                 break
             except HubspotUnauthorized:
-                self.log.debug("401 Unauthorized response to API request.")
-                if (
-                    self.access_token
-                    and self.refresh_token
-                    and self.client_id
-                    and self.client_secret
+                if not self._refresh_access_token(
+                    retried, self._get_bearer_token(headers)
                 ):
-                    if retried:
-                        self.log.error(
-                            "Refreshed token, but request still was not authorized. "
-                            "You may need to grant additional permissions."
-                        )
-                        raise
-
-                    from hubspot3.oauth2 import OAuth2Client
-
-                    self.log.debug("Refreshing access token")
-                    try:
-                        client = OAuth2Client(**self.options)
-                        refresh_result = client.refresh_tokens(
-                            client_id=self.client_id,
-                            client_secret=self.client_secret,
-                            refresh_token=self.refresh_token,
-                        )
-                        self.access_token = refresh_result["access_token"]
-                        self.refresh_token = refresh_result["refresh_token"]
-                        self.log.debug("Retrying with new token")
-                    except Exception as exception:
-                        self.log.error(f"Unable to refresh access_token: {exception}")
-                        raise
-                    return self._call_raw(
-                        subpath,
-                        params=params,
-                        method=method,
-                        data=data,
-                        doseq=doseq,
-                        query=query,
-                        retried=True,
-                        **options,
-                    )
-                if self.access_token:
-                    self.log.warning(
-                        "In order to enable automated refreshing of your access token, please "
-                        "provide a client ID, client secret and refresh token in addition to the "
-                        "access token."
-                    )
-                raise
-            except HubspotError as exception:
-                if try_count > num_retries:
-                    # Only output a warning in case the auto-retry mechanism is not disabled
-                    if num_retries != 0:
-                        logging.warning(f"Too many retries for {uglify_hapikey(url)}")
                     raise
-                # Don't retry errors from 300 to 499
-                if exception.result and 300 <= exception.result.status < 500:
+                return self._call_raw(
+                    subpath,
+                    params=params,
+                    method=method,
+                    data=data,
+                    doseq=doseq,
+                    query=query,
+                    retried=True,
+                    **options,
+                )
+            except HubspotError as exception:
+                if not self._should_retry(exception, try_count, num_retries, url):
                     raise
                 self._prepare_request_retry(method, url, headers, data)
                 self.log.warning(
-                    f"HubspotError {exception} calling {uglify_hapikey(url)}, retrying"
+                    f"HubspotError {exception} calling {uglify_hapikey(url)}, retrying",
+                    extra={
+                        "endpoint": self._get_endpoint(subpath),
+                        "attempt": try_count,
+                    },
                 )
-            # exponential back off
-            # wait 0 seconds, 1 second, 3 seconds, 7 seconds, 15 seconds, etc
-            time.sleep((pow(2, try_count - 1) - 1) * self.sleep_multiplier)
+                time.sleep(self._get_retry_delay(try_count, exception))
         return result
 
     def _call(
@@ -432,3 +841,33 @@ class BaseClient:
             **options,
         )
         return result if raw else self._digest_result(result.body)
+
+    def _call_stream(
+        self,
+        subpath: str,
+        items_key: str,
+        params: Optional[Dict] = None,
+        method: str = "GET",
+        data: Union[str, Dict, List, None] = None,
+        doseq: bool = False,
+        query: str = "",
+        properties: Optional[List] = None,
+        **options,
+    ) -> JSONArrayStream:
+        """
+        like `_call`, but returns a `JSONArrayStream` that yields the items of the `items_key`
+        array of the response while its body is still being received and decompressed.
+        """
+        result = self._call_raw(
+            subpath,
+            params=params,
+            method=method,
+            data=data,
+            doseq=doseq,
+            query=query,
+            retried=False,
+            properties=properties,
+            stream=True,
+            **options,
+        )
+        return JSONArrayStream(result.chunks, items_key)
@@ -0,0 +1,213 @@
+"""
+helpers to send large numbers of records to hubspot in batches
+"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from hubspot3.error import HubspotError
+
+
+T = TypeVar("T")
+
+
+class RecordResult(NamedTuple):
+    """the outcome of one input record of a batched operation"""
+
+    index: int
+    record: Any
+    error: Optional[Exception] = None
+    message: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchReport:
+    """the outcome of a batched operation for each input record, in the order of the input"""
+
+    def __init__(self, results: Optional[Iterable[RecordResult]] = None) -> None:
+        self.results = list(results or [])
+
+    def __repr__(self) -> str:
+        return (
+            f"<BatchReport: {len(self.succeeded)} succeeded, {len(self.failed)} failed>"
+        )
+
+    def __iter__(self) -> Iterator[RecordResult]:
+        return iter(self.results)
+
+    @property
+    def succeeded(self) -> List[RecordResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[RecordResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def ok(self) -> bool:
+        """whether all records succeeded"""
+        return all(result.ok for result in self.results)
+
+
+class ChunkResult(NamedTuple):
+    """the outcome of sending one chunk of a chunked operation"""
+
+    index: int
+    size: int
+    attempts: int = 1
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def retried(self) -> bool:
+        return self.attempts > 1
+
+
+class ChunkReport:
+    """the outcome of a chunked operation for each chunk, in the order of the chunks"""
+
+    def __init__(self, results: Optional[Iterable[ChunkResult]] = None) -> None:
+        self.results = list(results or [])
+
+    def __repr__(self) -> str:
+        return (
+            f"<ChunkReport: {len(self.succeeded)} succeeded ({len(self.retried)} retried), "
+            f"{len(self.failed)} failed>"
+        )
+
+    def __iter__(self) -> Iterator[ChunkResult]:
+        return iter(self.results)
+
+    @property
+    def succeeded(self) -> List[ChunkResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def retried(self) -> List[ChunkResult]:
+        """the chunks that needed more than one attempt, whether they succeeded or not"""
+        return [result for result in self.results if result.retried]
+
+    @property
+    def failed(self) -> List[ChunkResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def ok(self) -> bool:
+        """whether all chunks succeeded"""
+        return all(result.ok for result in self.results)
+
+
+class BatchResponse:
+    """
+    the responses of a batch endpoint to all chunks of a chunked operation, combined into one.
+    `results` and `errors` are those of all responses, in the order of the chunks, and
+    `failed` holds an (inputs, error) pair for each chunk that failed as a whole.
+    """
+
+    def __init__(self) -> None:
+        self.results = []  # type: List[Any]
+        self.errors = []  # type: List[Any]
+        self.failed = []  # type: List[Tuple[List[Any], HubspotError]]
+
+    def __repr__(self) -> str:
+        return (
+            f"<BatchResponse: {len(self.results)} results, {len(self.errors)} errors, "
+            f"{len(self.failed)} failed chunks>"
+        )
+
+    def add(
+        self,
+        inputs: List[Any],
+        response: Optional[Dict],
+        error: Optional[HubspotError] = None,
+    ) -> None:
+        """adds the response to a chunk of inputs, or the error it failed with"""
+        if error is not None:
+            self.failed.append((inputs, error))
+        elif response:
+            self.results.extend(response.get("results", []))
+            self.errors.extend(response.get("errors", []))
+
+    @property
+    def status(self) -> str:
+        return "COMPLETE" if self.ok else "COMPLETE_WITH_ERRORS"
+
+    @property
+    def ok(self) -> bool:
+        """whether all chunks succeeded without errors"""
+        return not self.errors and not self.failed
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """lazily splits the iterable into lists of at most `size` items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def dispatch(
+    send: Callable[[T], Any],
+    chunks: Iterable[T],
+    max_workers: int = 1,
+    max_pending: Optional[int] = None,
+) -> Iterator[Tuple[T, Any, Optional[HubspotError]]]:
+    """
+    calls `send` for each chunk on up to `max_workers` threads and yields a
+    (chunk, response, error) tuple per chunk, in the order of the chunks. HubspotErrors raised
+    by `send` are yielded instead of raised, so one failing chunk doesn't abort the others.
+
+    Chunks are only read from the iterable when there is room for them: at most `max_pending`
+    chunks (twice the number of workers by default) are sent or waiting to be consumed at any
+    time, so memory usage stays constant for lazily produced chunks. The requests still go
+    through the client's rate limiter, if one is configured.
+    """
+
+    def call(chunk: T) -> Tuple[Any, Optional[HubspotError]]:
+        try:
+            return send(chunk), None
+        except HubspotError as error:
+            return None, error
+
+    if max_workers <= 1:
+        for chunk in chunks:
+            yield (chunk, *call(chunk))
+        return
+
+    max_pending = max(max_pending or 2 * max_workers, 1)
+    pending = deque()  # type: Deque[Tuple[T, Future]]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for chunk in chunks:
+                pending.append((chunk, executor.submit(call, chunk)))
+                if len(pending) >= max_pending:
+                    chunk, future = pending.popleft()
+                    yield (chunk, *future.result())
+            while pending:
+                chunk, future = pending.popleft()
+                yield (chunk, *future.result())
+        finally:
+            # don't send chunks nobody is going to consume anymore
+            for _, future in pending:
+                future.cancel()
@@ -5,6 +5,7 @@ hubspot blog api client
 import json
 from typing import Any, Dict
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 
 
 BLOG_API_VERSION = "2"
@@ -24,7 +25,9 @@ class BlogClient(BaseClient):
         return self._call("blogs", **options)
 
     def get_blog_info(self, blog_guid: str, **options: Any) -> Dict:
-        return self._call(f"blogs/{blog_guid}", **options)
+        return self._call(
+            EndpointPath("blogs/{blog_guid}", blog_guid=blog_guid), **options
+        )
 
     def get_posts(self, blog_guid: str, **options) -> Dict:
         if "params" not in options:
@@ -49,7 +52,9 @@ class BlogClient(BaseClient):
         return self.get_published_posts(blog_guid, **options)
 
     def get_post(self, post_guid: str, **options) -> Dict:
-        return self._call(f"blog-posts/{post_guid}", **options)
+        return self._call(
+            EndpointPath("blog-posts/{post_guid}", post_guid=post_guid), **options
+        )
 
     def create_post(
         self, blog_guid, author_id, title, summary, content, meta_desc, **options
@@ -97,7 +102,7 @@ class BlogClient(BaseClient):
 
         post = json.dumps(posts)
         raw_response = self._call(
-            f"blog-posts/{post_guid}",
+            EndpointPath("blog-posts/{post_guid}", post_guid=post_guid),
             data=post,
             method="PUT",
             content_type="application/json",
@@ -109,7 +114,7 @@ class BlogClient(BaseClient):
     def publish_post(self, post_guid: str, **options) -> Dict:
         post = json.dumps(dict(action="schedule-publish"))
         raw_response = self._call(
-            f"blog-posts/{post_guid}/publish-action",
+            EndpointPath("blog-posts/{post_guid}/publish-action", post_guid=post_guid),
             data=post,
             method="PUT",
             content_type="application/json",
@@ -137,7 +142,10 @@ class BlogCommentsClient(BaseClient):
         return self._call("comments", **options)
 
     def get_comment(self, comment_guid: str, **options) -> Dict:
-        return self._call(f"comments/{comment_guid}", **options)
+        return self._call(
+            EndpointPath("comments/{comment_guid}", comment_guid=comment_guid),
+            **options,
+        )
 
     def create_comment(
         self,
@@ -4,6 +4,7 @@ hubspot broadcast api
 
 from typing import Any, Dict, List, Optional
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 
 
 HUBSPOT_BROADCAST_API_VERSION = "1"
@@ -136,7 +137,7 @@ class BroadcastClient(BaseClient):
         """
         params = kwargs
         broadcast = self._call(
-            f"broadcasts/{broadcast_guid}",
+            EndpointPath("broadcasts/{broadcast_guid}", broadcast_guid=broadcast_guid),
             params=params,
             content_type="application/json",
         )
@@ -197,7 +198,8 @@ class BroadcastClient(BaseClient):
 
     def get_channel(self, channel_guid: str) -> Channel:
         channel = self._call(
-            f"channels/{channel_guid}", content_type="application/json"
+            EndpointPath("channels/{channel_guid}", channel_guid=channel_guid),
+            content_type="application/json",
         )
         return Channel(channel)
 
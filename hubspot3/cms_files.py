@@ -4,6 +4,7 @@ hubspot cms_files api
 
 from typing import Dict
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 
 
 CMS_FILES_API_VERSION = "2"
@@ -18,4 +19,4 @@ class CMSFilesClient(BaseClient):
         return f"filemanager/api/v{CMS_FILES_API_VERSION}/files/{subpath}"
 
     def get_file_meta_data(self, file_id: int, **options) -> Dict:
-        return self._call(f"{file_id}", **options)
+        return self._call(EndpointPath("{file_id}", file_id=file_id), **options)
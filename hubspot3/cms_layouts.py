@@ -3,6 +3,7 @@ hubspot cms_layout api client
 """
 
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 
 
 LAYOUTS_API_VERSION = "2"
@@ -20,16 +21,30 @@ class CMSLayoutsClient(BaseClient):
         return self._call("", **options)
 
     def get_layout_info(self, layout_id: str, **options):
-        return self._call(f"{layout_id}", **options)
+        return self._call(EndpointPath("{layout_id}", layout_id=layout_id), **options)
 
     def get_layout_buffer(self, layout_id: str, **options):
-        return self._call(f"{layout_id}/buffer", **options)
+        return self._call(
+            EndpointPath("{layout_id}/buffer", layout_id=layout_id), **options
+        )
 
     def get_layout_has_buffered_changes(self, layout_id: str, **options):
-        return self._call(f"{layout_id}/has_buffered_changes", **options)
+        return self._call(
+            EndpointPath("{layout_id}/has_buffered_changes", layout_id=layout_id),
+            **options,
+        )
 
     def get_layout_versions(self, layout_id: str, **options):
-        return self._call(f"{layout_id}/versions", **options)
+        return self._call(
+            EndpointPath("{layout_id}/versions", layout_id=layout_id), **options
+        )
 
     def get_layout_version_info(self, layout_id: str, version_id: str, **options):
-        return self._call(f"{layout_id}/versions/{version_id}", **options)
+        return self._call(
+            EndpointPath(
+                "{layout_id}/versions/{version_id}",
+                layout_id=layout_id,
+                version_id=version_id,
+            ),
+            **options,
+        )
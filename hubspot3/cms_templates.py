@@ -3,6 +3,7 @@ hubspot cms_templates api client
 """
 
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 
 
 TEMPLATES_API_VERSION = "2"
@@ -20,16 +21,32 @@ class CMSTemplatesClient(BaseClient):
         return self._call("", **options)
 
     def get_template_info(self, template_id: str, **options):
-        return self._call(f"{template_id}", **options)
+        return self._call(
+            EndpointPath("{template_id}", template_id=template_id), **options
+        )
 
     def get_template_buffer(self, template_id: str, **options):
-        return self._call(f"{template_id}/buffer", **options)
+        return self._call(
+            EndpointPath("{template_id}/buffer", template_id=template_id), **options
+        )
 
     def get_template_has_buffered_changes(self, template_id: str, **options):
-        return self._call(f"{template_id}/has_buffered_changes", **options)
+        return self._call(
+            EndpointPath("{template_id}/has_buffered_changes", template_id=template_id),
+            **options,
+        )
 
     def get_template_versions(self, template_id: str, **options):
-        return self._call(f"{template_id}/versions", **options)
+        return self._call(
+            EndpointPath("{template_id}/versions", template_id=template_id), **options
+        )
 
     def get_template_version_info(self, template_id: str, version_id: str, **options):
-        return self._call(f"{template_id}/versions/{version_id}", **options)
+        return self._call(
+            EndpointPath(
+                "{template_id}/versions/{version_id}",
+                template_id=template_id,
+                version_id=version_id,
+            ),
+            **options,
+        )
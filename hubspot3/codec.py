@@ -0,0 +1,95 @@
+"""
+JSON codecs used to encode request bodies and decode response bodies
+"""
+
+import json
+from typing import Any, Dict, Optional, Union
+from hubspot3.error import HubspotBadConfig
+
+
+class JSONCodec:
+    """
+    encodes and decodes JSON with the standard library. Decoding accepts `bytes` as well,
+    so response bodies don't need to be decoded to a string first.
+    """
+
+    name = "json"
+
+    def dumps(self, data: Any) -> Union[str, bytes]:
+        """
+        encodes the data as JSON. Returns either an ASCII-only string or UTF-8 encoded bytes,
+        both of which can be sent as a request body as they are.
+        """
+        return json.dumps(data)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """decodes a JSON document, raising a ValueError if it is not valid JSON"""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """encodes and decodes JSON with orjson, the fastest option, if it is installed"""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, data: Any) -> bytes:
+        return self._orjson.dumps(data)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """encodes and decodes JSON with ujson, if it is installed"""
+
+    name = "ujson"
+
+    def __init__(self) -> None:
+        import ujson
+
+        self._ujson = ujson
+
+    def dumps(self, data: Any) -> str:
+        return self._ujson.dumps(data)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._ujson.loads(data)
+
+
+CODECS = {codec.name: codec for codec in (OrjsonCodec, UjsonCodec, JSONCodec)}
+_instances = {}  # type: Dict[str, JSONCodec]
+
+
+def get_codec(codec: Union[JSONCodec, str, None] = None) -> JSONCodec:
+    """
+    returns the JSON codec to use for the given `json_codec` client option: either a codec
+    instance, the name of one of the CODECS, or None for the standard library. Other codecs
+    are only used when configured, as they don't accept and return exactly the same data.
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is not None:
+        if codec not in CODECS:
+            raise HubspotBadConfig(
+                f"Unknown JSON codec '{codec}', expected one of {', '.join(CODECS)}."
+            )
+        if codec not in _instances:
+            _instances[codec] = CODECS[codec]()
+        return _instances[codec]
+    return get_codec(JSONCodec.name)
+
+
+def get_available_codecs() -> Dict[str, Optional[JSONCodec]]:
+    """returns all codecs by name, None for the ones that are not installed"""
+    codecs = {}  # type: Dict[str, Optional[JSONCodec]]
+    for name in CODECS:
+        try:
+            codecs[name] = get_codec(name)
+        except ImportError:
+            codecs[name] = None
+    return codecs
@@ -2,8 +2,9 @@
 hubspot companies api
 """
 
-from typing import List, Dict, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 from hubspot3.utils import prettify, get_log
 
 
@@ -32,11 +33,20 @@ class CompaniesClient(BaseClient):
     def update(self, company_id: str, data: Optional[Dict] = None, **options) -> Dict:
         """update the given company with data"""
         data = data or {}
-        return self._call(f"companies/{company_id}", data=data, method="PUT", **options)
+        return self._call(
+            EndpointPath("companies/{company_id}", company_id=company_id),
+            data=data,
+            method="PUT",
+            **options,
+        )
 
     def delete(self, company_id: str, **options) -> Dict:
         """delete a company"""
-        return self._call(f"companies/{company_id}", method="DELETE", **options)
+        return self._call(
+            EndpointPath("companies/{company_id}", company_id=company_id),
+            method="DELETE",
+            **options,
+        )
 
     def delete_all(self, **options):
         """
@@ -47,7 +57,11 @@ class CompaniesClient(BaseClient):
 
     def get(self, company_id: str, **options) -> Dict:
         """get a single company by it's ID"""
-        return self._call(f"companies/{company_id}", method="GET", **options)
+        return self._call(
+            EndpointPath("companies/{company_id}", company_id=company_id),
+            method="GET",
+            **options,
+        )
 
     def search_domain(
         self,
@@ -76,27 +90,15 @@ class CompaniesClient(BaseClient):
                 raise TypeError("extra_properties must be a list or str if provided")
 
         return self._call(
-            f"domains/{domain}/companies",
+            EndpointPath("domains/{domain}/companies", domain=domain),
             method="POST",
             data={"limit": limit, "requestOptions": {"properties": properties}},
             **options,
         )
 
-    def get_all(
-        self,
-        prettify_output: bool = True,
-        extra_properties: Union[str, List, None] = None,
-        **options,
-    ) -> Optional[List]:
-        """
-        get all companies, including extra properties if they are passed in
-        :see: https://developers.hubspot.com/docs/methods/deals/get-all-deals
-        """
-        finished = False
-        output = []
-        offset = 0
-        query_limit = 250  # Max value according to docs
-
+    @staticmethod
+    def _get_all_properties(extra_properties: Union[str, List, None] = None) -> List:
+        """returns the properties to fetch when paging through all companies"""
         # default properties to fetch
         properties = [
             "name",
@@ -115,36 +117,74 @@ class CompaniesClient(BaseClient):
                 properties += extra_properties
             if isinstance(extra_properties, str):
                 properties.append(extra_properties)
+        return properties
 
-        while not finished:
-            batch = self._call(
-                "companies/paged",
-                method="GET",
-                doseq=True,
-                params={
-                    "limit": query_limit,
-                    "offset": offset,
-                    "propertiesWithHistory": properties,
-                    "includeMergeAudits": "true",
-                },
+    def get_all(
+        self,
+        prettify_output: bool = True,
+        extra_properties: Union[str, List, None] = None,
+        **options,
+    ) -> Optional[List]:
+        """
+        get all companies, including extra properties if they are passed in
+        :see: https://developers.hubspot.com/docs/methods/deals/get-all-deals
+        """
+        return list(
+            self.iter_all(
+                prettify_output=prettify_output,
+                extra_properties=extra_properties,
                 **options,
             )
-            output.extend(
-                [
-                    (
+        )
+
+    def iter_all(
+        self,
+        prettify_output: bool = True,
+        extra_properties: Union[str, List, None] = None,
+        stream: bool = False,
+        **options,
+    ) -> Iterator[Dict]:
+        """
+        lazily yield all companies, one page at a time.
+        Takes the same arguments as `get_all`.
+
+        :param stream: if set, the companies of a page are yielded while the page is still
+        being received, instead of once it was received and decoded completely.
+        """
+        finished = False
+        offset = 0
+        query_limit = 250  # Max value according to docs
+        properties = self._get_all_properties(extra_properties)
+
+        while not finished:
+            params = {
+                "limit": query_limit,
+                "offset": offset,
+                "propertiesWithHistory": properties,
+                "includeMergeAudits": "true",
+            }
+            if stream:
+                batch = self._call_stream(
+                    "companies/paged", "companies", params=params, doseq=True, **options
+                )
+            else:
+                batch = self._call(
+                    "companies/paged",
+                    method="GET",
+                    doseq=True,
+                    params=params,
+                    **options,
+                )
+            for company in batch["companies"]:
+                if not company["isDeleted"]:
+                    yield (
                         prettify(company, id_key="companyId")
                         if prettify_output
                         else company
                     )
-                    for company in batch["companies"]
-                    if not company["isDeleted"]
-                ]
-            )
             finished = not batch["has-more"]
             offset = batch["offset"]
 
-        return output
-
     def _get_recent(
         self,
         recency_type: str,
@@ -161,8 +201,25 @@ class CompaniesClient(BaseClient):
         :see: https://developers.hubspot.com/docs/methods/companies/get_companies_modified
         :see: https://developers.hubspot.com/docs/methods/companies/get_companies_created
         """
+        return list(
+            self._iter_recent(
+                recency_type, limit=limit, offset=offset, since=since, **options
+            )
+        )
+
+    def _iter_recent(
+        self,
+        recency_type: str,
+        limit: int = 250,
+        offset: int = 0,
+        since: Optional[int] = None,
+        **options,
+    ) -> Iterator[Dict]:
+        """
+        lazily yield either recently modified or recently created companies, one page at a
+        time. Takes the same arguments as `_get_recent`.
+        """
         finished = False
-        output = []
 
         while not finished:
             params = {"count": limit, "offset": offset}
@@ -175,18 +232,12 @@ class CompaniesClient(BaseClient):
                 params=params,
                 **options,
             )
-            output.extend(
-                [
-                    prettify(company, id_key="companyId")
-                    for company in batch["results"]
-                    if not company["isDeleted"]
-                ]
-            )
+            for company in batch["results"]:
+                if not company["isDeleted"]:
+                    yield prettify(company, id_key="companyId")
             finished = not batch["hasMore"]
             offset = batch["offset"]
 
-        return output
-
     def get_recently_modified(
         self,
         limit: int = 250,
@@ -202,6 +253,21 @@ class CompaniesClient(BaseClient):
             "modified", limit=limit, offset=offset, since=since, **options
         )
 
+    def iter_recently_modified(
+        self,
+        limit: int = 250,
+        offset: int = 0,
+        since: Optional[int] = None,
+        **options,
+    ) -> Iterator[Dict]:
+        """
+        lazily yield the recently modified companies, one page at a time.
+        Takes the same arguments as `get_recently_modified`.
+        """
+        return self._iter_recent(
+            "modified", limit=limit, offset=offset, since=since, **options
+        )
+
     def get_recently_created(
         self,
         limit: int = 250,
@@ -224,4 +290,8 @@ class CompaniesClient(BaseClient):
 
         :see: https://developers.hubspot.com/docs/methods/companies/get_company_contacts
         """
-        return self._call(f"companies/{company_id}/contacts", method="GET", **options)
+        return self._call(
+            EndpointPath("companies/{company_id}/contacts", company_id=company_id),
+            method="GET",
+            **options,
+        )
@@ -0,0 +1,84 @@
+"""
+keep-alive connection pooling for hubspot3 clients
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Hashable, Tuple
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of keep-alive HTTP(S) connections, keyed per host.
+
+    Connections are handed out with `acquire` and must be given back with either `release`
+    (the response was fully read and the connection can be reused) or `discard` (the
+    connection is in an unknown state and gets closed). At most `max_size` idle connections
+    are kept per host; connections that were idle for longer than `idle_timeout` seconds are
+    closed instead of being reused, since the server has most likely dropped them already.
+    """
+
+    def __init__(self, max_size: int = 10, idle_timeout: float = 30.0) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle = {}  # type: Dict[Hashable, Deque[Tuple[object, float]]]
+
+    @staticmethod
+    def key(connection_type, host: str, timeout) -> Tuple:
+        """returns the key under which connections with the given parameters are pooled"""
+        return (connection_type, host, timeout)
+
+    def acquire(self, key: Tuple) -> Tuple[object, bool]:
+        """
+        returns a tuple of (connection, reused) for the given pool key.
+        `reused` is True if the connection was taken from the pool instead of freshly created,
+        which means that it may have been closed by the server in the meantime.
+        """
+        expired = []
+        connection = None
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                candidate, released_at = idle.pop()
+                if now - released_at > self.idle_timeout:
+                    expired.append(candidate)
+                    continue
+                connection = candidate
+                break
+        for stale in expired:
+            stale.close()
+        if connection is not None:
+            return connection, True
+        connection_type, host, timeout = key
+        return connection_type(host, timeout=timeout), False
+
+    def release(self, key: Tuple, connection) -> None:
+        """puts a connection whose response was fully consumed back into the pool"""
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self.max_size:
+                idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def discard(self, connection) -> None:
+        """closes a connection that must not be reused"""
+        connection.close()
+
+    def clear(self) -> None:
+        """closes all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
+
+    def idle_count(self) -> int:
+        """returns the number of idle connections in the pool"""
+        with self._lock:
+            return sum(len(connections) for connections in self._idle.values())
@@ -3,6 +3,7 @@ hubspot contact lists api
 """
 
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 from hubspot3.utils import get_log
 
 
@@ -30,7 +31,12 @@ class ContactListsClient(BaseClient):
         """Adds a list of contact vids to the specified list."""
         data = data or {}
         data["vids"] = vids
-        return self._call(f"lists/{list_id}/add", data=data, method="POST", **options)
+        return self._call(
+            EndpointPath("lists/{list_id}/add", list_id=list_id),
+            data=data,
+            method="POST",
+            **options,
+        )
 
     def create_a_contact_list(
         self, list_name, portal_id, dynamic=True, data=None, **options
@@ -44,4 +50,6 @@ class ContactListsClient(BaseClient):
 
     def delete_a_contact_list(self, list_id, **options):
         """Deletes the contact list by list_id."""
-        return self._call(f"lists/{list_id}", method="DELETE", **options)
+        return self._call(
+            EndpointPath("lists/{list_id}", list_id=list_id), method="DELETE", **options
+        )
@@ -2,10 +2,18 @@
 hubspot contacts api
 """
 
+import json
 import warnings
-from typing import Dict, List, Optional, Union
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from hubspot3.crm_associations import CRMAssociationsClient
 from hubspot3.base import BaseClient
+from hubspot3.batching import BatchReport, RecordResult, chunked, dispatch
+from hubspot3.error import HubspotBadRequest
+from hubspot3.instrumentation import EndpointPath
+from hubspot3.pagination import Checkpoint, prefetch
 from hubspot3.utils import prettify, get_log
 
 
@@ -35,11 +43,19 @@ class ContactsClient(BaseClient):
 
     def get_by_id(self, contact_id: str, **options):
         """Get contact specified by ID"""
-        return self._call(f"contact/vid/{contact_id}/profile", method="GET", **options)
+        return self._call(
+            EndpointPath("contact/vid/{contact_id}/profile", contact_id=contact_id),
+            method="GET",
+            **options,
+        )
 
     def get_by_email(self, email: str, **options):
         """Get contact specified by email address."""
-        return self._call(f"contact/email/{email}/profile", method="GET", **options)
+        return self._call(
+            EndpointPath("contact/email/{email}/profile", email=email),
+            method="GET",
+            **options,
+        )
 
     def create(self, data: Optional[Dict] = None, **options):
         """create a contact"""
@@ -52,14 +68,20 @@ class ContactsClient(BaseClient):
         """Create or Updates a client with the supplied data."""
         data = data or {}
         return self._call(
-            f"contact/createOrUpdate/email/{email}", data=data, method="POST", **options
+            EndpointPath("contact/createOrUpdate/email/{email}", email=email),
+            data=data,
+            method="POST",
+            **options,
         )
 
     def update_by_id(self, contact_id: str, data: Optional[Dict] = None, **options):
         """Update the contact by contact_id with the given data."""
         data = data or {}
         return self._call(
-            f"contact/vid/{contact_id}/profile", data=data, method="POST", **options
+            EndpointPath("contact/vid/{contact_id}/profile", contact_id=contact_id),
+            data=data,
+            method="POST",
+            **options,
         )
 
     def update_by_email(self, email: str, data=None, **options):
@@ -67,19 +89,100 @@ class ContactsClient(BaseClient):
         data = data or {}
 
         return self._call(
-            f"contact/email/{email}/profile", data=data, method="POST", **options
+            EndpointPath("contact/email/{email}/profile", email=email),
+            data=data,
+            method="POST",
+            **options,
         )
 
+    def create_or_update_batch(
+        self,
+        contacts: Iterable[Dict],
+        batch_size: int = 100,
+        max_workers: int = 1,
+        **options,
+    ) -> BatchReport:
+        """
+        create or update any number of contacts through the batch endpoint. Each contact is a
+        dict with either an `email` or a `vid` and the `properties` to set. The contacts are
+        read lazily and sent in chunks of `batch_size` (at most 100) on up to `max_workers`
+        threads, which share the client's rate limiter.
+
+        Returns a BatchReport with the outcome of every contact, indexed by its position in
+        the input. As HubSpot rejects a whole chunk if it contains invalid contacts, these are
+        reported as failed and the rest of the chunk is sent again.
+        :see: https://developers.hubspot.com/docs/methods/contacts/batch_create_or_update
+        """
+        batch_size = min(batch_size, 100)  # Max value according to docs
+        results = []
+        chunks = chunked(enumerate(contacts), batch_size)
+        send = partial(self._send_contact_batch, **options)
+        for chunk, chunk_results, error in dispatch(send, chunks, max_workers):
+            if error is not None:
+                chunk_results = [
+                    RecordResult(index, contact, error, str(error))
+                    for index, contact in chunk
+                ]
+            results.extend(chunk_results)
+        return BatchReport(results)
+
+    def _send_contact_batch(
+        self, chunk: List[Tuple[int, Dict]], **options
+    ) -> List[RecordResult]:
+        """sends one chunk of (index, contact) pairs to the batch endpoint"""
+        try:
+            self._call(
+                "contact/batch",
+                data=[contact for _, contact in chunk],
+                method="POST",
+                **options,
+            )
+        except HubspotBadRequest as error:
+            failures = self._get_batch_failures(error)
+            if not failures:
+                raise
+            results = [
+                RecordResult(index, contact, error, failures[position])
+                for position, (index, contact) in enumerate(chunk)
+                if position in failures
+            ]
+            valid = [
+                pair for position, pair in enumerate(chunk) if position not in failures
+            ]
+            if valid:
+                results.extend(self._send_contact_batch(valid, **options))
+            return sorted(results, key=lambda result: result.index)
+        return [RecordResult(index, contact) for index, contact in chunk]
+
+    @staticmethod
+    def _get_batch_failures(error: HubspotBadRequest) -> Dict[int, str]:
+        """returns the error message of each invalid contact by its position in the chunk"""
+        try:
+            body = json.loads(error.result.body)
+            return {
+                failure["index"]: failure.get("error", {}).get("message", "")
+                for failure in body.get("failureMessages", [])
+            }
+        except (TypeError, ValueError, KeyError, AttributeError):
+            return {}
+
     def delete_by_id(self, contact_id: str, **options):
         """Delete a contact by contact_id."""
-        return self._call(f"contact/vid/{contact_id}", method="DELETE", **options)
+        return self._call(
+            EndpointPath("contact/vid/{contact_id}", contact_id=contact_id),
+            method="DELETE",
+            **options,
+        )
 
     def merge(self, primary_id: int, secondary_id: int, **options):
         """merge the data from the secondary_id into the data of the primary_id"""
         data = dict(vidToMerge=secondary_id)
 
         return self._call(
-            f"contact/merge-vids/{primary_id}/", data=data, method="POST", **options
+            EndpointPath("contact/merge-vids/{primary_id}/", primary_id=primary_id),
+            data=data,
+            method="POST",
+            **options,
         )
 
     default_batch_properties = [
@@ -96,8 +199,10 @@ class ContactsClient(BaseClient):
         "associatedcompanyid",
     ]
 
-    def get_batch(self, ids, extra_properties: Union[List, str, None] = None):
-        """given a batch of vids, get more of their info"""
+    def _get_batch_properties(
+        self, extra_properties: Union[List, str, None] = None
+    ) -> List[str]:
+        """returns the properties to fetch for a batch of contacts"""
         # default properties to fetch
         properties = set(self.default_batch_properties)
 
@@ -107,12 +212,19 @@ class ContactsClient(BaseClient):
                 properties.update(extra_properties)
             if isinstance(extra_properties, str):
                 properties.add(extra_properties)
+        # sorted, so that the order (and with it checkpoint keys) is the same in every process
+        return sorted(properties)
 
+    def get_batch(self, ids, extra_properties: Union[List, str, None] = None):
+        """given a batch of vids, get more of their info"""
         batch = self._call(
             "contact/vids/batch",
             method="GET",
             doseq=True,
-            params={"vid": ids, "property": list(properties)},
+            params={
+                "vid": ids,
+                "property": self._get_batch_properties(extra_properties),
+            },
         )
         # It returns a dict with IDs as keys
         return [prettify(batch[contact], id_key="vid") for contact in batch]
@@ -126,6 +238,8 @@ class ContactsClient(BaseClient):
         extra_properties: Union[List, str, None] = None,
         limit: int = -1,
         list_id: str = "all",
+        enrichment_workers: int = 0,
+        max_pending_batches: int = 4,
         **options,
     ) -> List[Dict]:
         """
@@ -134,30 +248,143 @@ class ContactsClient(BaseClient):
         then have to make ANOTHER call in batches
         :see: https://developers.hubspot.com/docs/methods/contacts/get_contacts
         """
-        finished = False
-        output = []  # type: list
-        offset = 0
+        return list(
+            self.iter_all(
+                extra_properties=extra_properties,
+                limit=limit,
+                list_id=list_id,
+                enrichment_workers=enrichment_workers,
+                max_pending_batches=max_pending_batches,
+                **options,
+            )
+        )
+
+    def iter_all(
+        self,
+        extra_properties: Union[List, str, None] = None,
+        limit: int = -1,
+        list_id: str = "all",
+        enrichment_workers: int = 0,
+        max_pending_batches: int = 4,
+        prefetch_pages: int = 0,
+        checkpoint_store=None,
+        checkpoint_key: Optional[str] = None,
+        **options,
+    ) -> Iterator[Dict]:
+        """
+        lazily yield all contacts in hubspot, one page at a time, so memory usage stays
+        constant regardless of the number of contacts. Takes the same arguments as `get_all`.
+
+        :param enrichment_workers: if set, the properties of each page of contacts are fetched
+        by this many worker threads while the next pages of contact IDs are already being
+        requested, instead of strictly one request after another.
+        :param max_pending_batches: the maximum number of pages that may be fetched ahead of
+        the consumer in that pipelined mode, which bounds the memory used.
+        :param prefetch_pages: if set, up to this many pages of contact IDs are fetched in the
+        background while the current page is being processed.
+        :param checkpoint_store: a store from `hubspot3.pagination` in which the vid-offset of
+        the next page is saved whenever a page was consumed, so an interrupted export resumes
+        from there. `checkpoint_key` names the checkpoint and defaults to one derived from the
+        query.
+        """
         query_limit = 100  # Max value according to docs
         limited = limit > 0
         if limited and limit < query_limit:
             query_limit = limit
+        checkpoint = Checkpoint(
+            checkpoint_store,
+            checkpoint_key,
+            {
+                "endpoint": f"contacts/lists/{list_id}/contacts/all",
+                "count": query_limit,
+                "properties": self._get_batch_properties(extra_properties),
+            },
+        )
+        offset = checkpoint.resume(0)
+        pages = prefetch(
+            self._iter_vid_pages(list_id, query_limit, offset, **options),
+            prefetch_pages,
+        )
+        if enrichment_workers > 0:
+            batches = self._iter_batches_pipelined(
+                pages, extra_properties, enrichment_workers, max_pending_batches
+            )
+        else:
+            batches = (
+                (self._get_page_batch(vids, extra_properties), next_offset)
+                for vids, next_offset in pages
+            )
+
+        count = 0
+        for contacts, next_offset in batches:
+            for contact in contacts:
+                yield contact
+                count += 1
+                if limited and count >= limit:
+                    batches.close()
+                    return
+            if next_offset is not None:
+                checkpoint.save(next_offset)
+        checkpoint.clear()
+
+    def _iter_vid_pages(
+        self, list_id: str, query_limit: int, offset: int = 0, **options
+    ) -> Iterator[Tuple[List[int], Optional[int]]]:
+        """
+        yields the vids of all contacts in the given list one page at a time, together with
+        the vid-offset of the next page (None for the last page)
+        """
+        finished = False
         while not finished:
             batch = self._call(
-                f"lists/{list_id}/contacts/all",
+                EndpointPath("lists/{list_id}/contacts/all", list_id=list_id),
                 method="GET",
                 params={"count": query_limit, "vidOffset": offset},
                 **options,
             )
-            output.extend(
-                self.get_batch(
-                    [contact["vid"] for contact in batch["contacts"]],
-                    extra_properties=extra_properties,
-                )
-            )
-            finished = not batch["has-more"] or (limited and len(output) >= limit)
+            vids = [contact["vid"] for contact in batch["contacts"]]
+            finished = not batch["has-more"]
             offset = batch["vid-offset"]
+            yield vids, None if finished else offset
 
-        return output if not limited else output[:limit]
+    def _get_page_batch(
+        self, vids: List[int], extra_properties: Union[List, str, None]
+    ) -> List[Dict]:
+        """gets the batch properties for a page of vids, skipping empty pages"""
+        if not vids:
+            return []
+        return self.get_batch(vids, extra_properties=extra_properties)
+
+    def _iter_batches_pipelined(
+        self,
+        pages: Iterator[Tuple[List[int], Optional[int]]],
+        extra_properties: Union[List, str, None],
+        workers: int,
+        max_pending: int,
+    ) -> Iterator[Tuple[List[Dict], Optional[int]]]:
+        """
+        yields the batch properties for the given pages of vids in order, while up to
+        `max_pending` batches are fetched concurrently by `workers` threads and the next page
+        of vids is fetched in the meantime
+        """
+        pending = deque()  # type: Deque[Tuple[Future, Optional[int]]]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for vids, next_offset in pages:
+                    future = executor.submit(
+                        self._get_page_batch, vids, extra_properties
+                    )
+                    pending.append((future, next_offset))
+                    if len(pending) >= max(max_pending, 1):
+                        future, next_offset = pending.popleft()
+                        yield future.result(), next_offset
+                while pending:
+                    future, next_offset = pending.popleft()
+                    yield future.result(), next_offset
+            finally:
+                # don't wait for batches nobody is going to consume anymore
+                for future, _ in pending:
+                    future.cancel()
 
     def _get_recent(
         self,
@@ -170,23 +397,50 @@ class ContactsClient(BaseClient):
         """
         return a list of either recently created or recently modified/created contacts
         """
-        finished = False
         output = []
         query_limit = 100  # max according to the docs
+        limited = limit > 0
+        if limited and limit < query_limit:
+            query_limit = limit
+
+        contacts = self._iter_recent(
+            recency_type, query_limit, vid_offset, time_offset, **options
+        )
+        for contact in contacts:
+            output.append(contact)
+            if len(output) >= limit:
+                break
+
+        return output[:limit]
+
+    def _iter_recent(
+        self,
+        recency_type: str,
+        query_limit: int = 100,
+        vid_offset: int = 0,
+        time_offset: int = 0,
+        properties: Optional[List[str]] = None,
+        **options,
+    ) -> Iterator[Dict]:
+        """
+        lazily yield either recently created or recently modified/created contacts, one page at
+        a time, most recent first. If `properties` is given, the contacts only have these
+        instead of the default properties of the endpoint.
+        """
+        finished = False
         recency_string = (
             "all"
             if recency_type == ContactsClient.Recency.CREATED
             else "recently_updated"
         )
-        limited = limit > 0
-        if limited and limit < query_limit:
-            query_limit = limit
 
         while not finished:
             params = {"count": query_limit}
             if vid_offset and time_offset:
                 params["vidOffset"] = vid_offset
                 params["timeOffset"] = time_offset
+            if properties:
+                params["property"] = properties
             batch = self._call(
                 f"lists/{recency_string}/contacts/recent",
                 method="GET",
@@ -194,12 +448,26 @@ class ContactsClient(BaseClient):
                 doseq=True,
                 **options,
             )
-            output.extend([contact for contact in batch["contacts"]])
-            finished = not batch["has-more"] or len(output) >= limit
+            yield from batch["contacts"]
+            finished = not batch["has-more"]
             vid_offset = batch["vid-offset"]
             time_offset = batch["time-offset"]
 
-        return output[:limit]
+    def iter_recently_modified(
+        self, extra_properties: Union[List, str, None] = None, **options
+    ) -> Iterator[Dict]:
+        """
+        lazily yield recently modified and created contacts, most recently modified first.
+        If `extra_properties` is given, the contacts have the same properties as the ones of
+        `get_batch` instead of the few default ones of the endpoint.
+        :see: https://developers.hubspot.com/docs/methods/contacts/get_recently_updated_contacts
+        """
+        properties = (
+            self._get_batch_properties(extra_properties) if extra_properties else None
+        )
+        return self._iter_recent(
+            ContactsClient.Recency.MODIFIED, properties=properties, **options
+        )
 
     def get_recently_created(self, limit: int = 100) -> List[Dict]:
         """
@@ -232,7 +500,7 @@ class ContactsClient(BaseClient):
                 params["vidOffset"] = vid_offset
                 params["timeOffset"] = time_offset
             batch = self._call(
-                f"lists/{list_id}/contacts/all",
+                EndpointPath("lists/{list_id}/contacts/all", list_id=list_id),
                 method="GET",
                 params=params,
                 doseq=True,
@@ -304,12 +572,20 @@ class ContactsClient(BaseClient):
 
     def get_secondary_emails(self, contact_id: str, **options):
         """Get contact's secondary emails by its ID"""
-        return self._call(f"secondary-email/{contact_id}", method="GET", **options)
+        return self._call(
+            EndpointPath("secondary-email/{contact_id}", contact_id=contact_id),
+            method="GET",
+            **options,
+        )
 
     def add_secondary_email(self, contact_id: str, email_address: str, **options):
         """Add a secondary email to a contact"""
         return self._call(
-            f"secondary-email/{contact_id}/email/{email_address}",
+            EndpointPath(
+                "secondary-email/{contact_id}/email/{email_address}",
+                contact_id=contact_id,
+                email_address=email_address,
+            ),
             method="PUT",
             **options,
         )
@@ -328,7 +604,7 @@ class ContactsClient(BaseClient):
         }
 
         return self._call(
-            f"secondary-email/{contact_id}",
+            EndpointPath("secondary-email/{contact_id}", contact_id=contact_id),
             data=data,
             method="PATCH",
             **options,
@@ -337,7 +613,11 @@ class ContactsClient(BaseClient):
     def delete_secondary_email(self, contact_id: str, email_address: str, **options):
         """Delete a secondary email of a contact"""
         return self._call(
-            f"secondary-email/{contact_id}/email/{email_address}",
+            EndpointPath(
+                "secondary-email/{contact_id}/email/{email_address}",
+                contact_id=contact_id,
+                email_address=email_address,
+            ),
             method="DELETE",
             **options,
         )
@@ -3,12 +3,18 @@ hubspot crm_association_labels api
 """
 
 from enum import Enum
-from typing import List, Dict, Optional, Union
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Union
 
 from hubspot3.base import BaseClient
+from hubspot3.batching import BatchResponse, chunked, dispatch
+from hubspot3.instrumentation import EndpointPath
+from hubspot3.pagination import prefetch
 from hubspot3.utils import get_log
 
 ASSOCIATIONS_API_VERSION = "4"
+# inputs per request of the batch endpoints
+BATCH_READ_LIMIT = 1000  # Max value according to docs
+BATCH_WRITE_LIMIT = 100
 
 
 class ObjectTypeDefinitions(Enum):
@@ -59,13 +65,35 @@ class CRMAssociationLabelsClient(BaseClient):
         from_object_type: ObjectTypeDefinitions,
         from_object_id: int,
         to_object_type: ObjectTypeDefinitions,
+        prefetch_pages: int = 0,
+        after: Optional[str] = "",
     ) -> List[Dict]:
         """
         List all association labels of an object by object type.
+        If `prefetch_pages` is set, up to this many pages are fetched in the background.
+        If `after` is set, only the associations from this paging cursor on are listed.
         """
-        finished = False
         output = []
-        after: Optional[str] = ""
+        pages = self._iter_pages(
+            from_object_type, from_object_id, to_object_type, after=after
+        )
+        for batch in prefetch(pages, prefetch_pages):
+            output.extend([id_ for id_ in batch["results"]])
+        return output
+
+    def _iter_pages(
+        self,
+        from_object_type: ObjectTypeDefinitions,
+        from_object_id: int,
+        to_object_type: ObjectTypeDefinitions,
+        after: Optional[str] = "",
+        **options,
+    ) -> Iterator[Dict]:
+        """
+        yields the raw pages of association labels of an object by object type, starting at
+        the given paging cursor, requesting each page with the given options
+        """
+        finished = False
         # 100 is max value according to docs, but "You can only request at most 500 associations
         # at once" error is thrown
         query_limit = 500
@@ -75,12 +103,17 @@ class CRMAssociationLabelsClient(BaseClient):
             if after:
                 params["after"] = after
             batch = self._call(
-                f"objects/{from_object_type.value}/{from_object_id}/"
-                f"associations/{to_object_type.value}",
+                EndpointPath(
+                    "objects/{from_object_type}/{from_object_id}/associations/{to_object_type}",
+                    from_object_type=from_object_type.value,
+                    from_object_id=from_object_id,
+                    to_object_type=to_object_type.value,
+                ),
                 method="GET",
                 params=params,
+                **options,
             )
-            output.extend([id_ for id_ in batch["results"]])
+            yield batch
             if (
                 "paging" in batch
                 and "next" in batch["paging"]
@@ -91,8 +124,6 @@ class CRMAssociationLabelsClient(BaseClient):
                 after = None
             finished = not bool(after)
 
-        return output
-
     def create_default(
         self,
         from_object_type: ObjectTypeDefinitions,
@@ -105,8 +136,14 @@ class CRMAssociationLabelsClient(BaseClient):
         Create the default (most generic) association label between two object types
         """
         return self._call(
-            f"objects/{from_object_type.value}/{from_object_id}/"
-            f"associations/default/{to_object_type.value}/{to_object_id}",
+            EndpointPath(
+                "objects/{from_object_type}/{from_object_id}/"
+                "associations/default/{to_object_type}/{to_object_id}",
+                from_object_type=from_object_type.value,
+                from_object_id=from_object_id,
+                to_object_type=to_object_type.value,
+                to_object_id=to_object_id,
+            ),
             method="PUT",
             **options,
         )
@@ -125,8 +162,14 @@ class CRMAssociationLabelsClient(BaseClient):
         Set association labels between two records.
         """
         return self._call(
-            f"objects/{from_object_type.value}/{from_object_id}/"
-            f"associations/{to_object_type.value}/{to_object_id}",
+            EndpointPath(
+                "objects/{from_object_type}/{from_object_id}/"
+                "associations/{to_object_type}/{to_object_id}",
+                from_object_type=from_object_type.value,
+                from_object_id=from_object_id,
+                to_object_type=to_object_type.value,
+                to_object_id=to_object_id,
+            ),
             method="PUT",
             data=[
                 {
@@ -149,26 +192,197 @@ class CRMAssociationLabelsClient(BaseClient):
         Deletes all association labels between two records.
         """
         return self._call(
-            f"objects/{from_object_type.value}/{from_object_id}/associations"
-            f"/{to_object_type.value}/{to_object_id}",
+            EndpointPath(
+                "objects/{from_object_type}/{from_object_id}/"
+                "associations/{to_object_type}/{to_object_id}",
+                from_object_type=from_object_type.value,
+                from_object_id=from_object_id,
+                to_object_type=to_object_type.value,
+                to_object_id=to_object_id,
+            ),
             method="DELETE",
             **options,
         )
 
-    def batch_list(self):
-        raise NotImplementedError("Not implemented yet")
+    def batch_list(
+        self,
+        from_object_type: ObjectTypeDefinitions,
+        to_object_type: ObjectTypeDefinitions,
+        from_object_ids: Iterable[int],
+        max_workers: int = 1,
+        **options,
+    ) -> BatchResponse:
+        """
+        List the associations of any number of objects by object type, in chunks of 1000 ids.
+        Objects with more than 500 associations have a `paging` cursor in their result, to
+        be passed to `list` as `after` for the rest.
+        """
+        inputs = ({"id": str(object_id)} for object_id in from_object_ids)
+        return self._send_batches(
+            "read",
+            from_object_type,
+            to_object_type,
+            inputs,
+            BATCH_READ_LIMIT,
+            max_workers,
+            **options,
+        )
+
+    def batch_create_default(
+        self,
+        from_object_type: ObjectTypeDefinitions,
+        to_object_type: ObjectTypeDefinitions,
+        object_ids: Iterable[Tuple[int, int]],
+        max_workers: int = 1,
+        **options,
+    ) -> BatchResponse:
+        """
+        Create the default (most generic) association label between any number of
+        (from_object_id, to_object_id) pairs of records
+        """
+        inputs = (
+            {"from": {"id": str(from_id)}, "to": {"id": str(to_id)}}
+            for from_id, to_id in object_ids
+        )
+        return self._send_batches(
+            "associate/default",
+            from_object_type,
+            to_object_type,
+            inputs,
+            BATCH_WRITE_LIMIT,
+            max_workers,
+            **options,
+        )
+
+    def batch_create(
+        self,
+        from_object_type: ObjectTypeDefinitions,
+        to_object_type: ObjectTypeDefinitions,
+        object_ids: Iterable[Tuple[int, int]],
+        association_category: AssociationCategory,
+        association_type_id: int,
+        max_workers: int = 1,
+        **options,
+    ) -> BatchResponse:
+        """
+        Set an association label between any number of (from_object_id, to_object_id) pairs
+        of records.
+        """
+        inputs = (
+            {
+                "from": {"id": str(from_id)},
+                "to": {"id": str(to_id)},
+                "types": [
+                    {
+                        "associationCategory": association_category.value,
+                        "associationTypeId": association_type_id,
+                    }
+                ],
+            }
+            for from_id, to_id in object_ids
+        )
+        return self._send_batches(
+            "create",
+            from_object_type,
+            to_object_type,
+            inputs,
+            BATCH_WRITE_LIMIT,
+            max_workers,
+            **options,
+        )
+
+    def batch_delete(
+        self,
+        from_object_type: ObjectTypeDefinitions,
+        to_object_type: ObjectTypeDefinitions,
+        object_ids: Iterable[Tuple[int, int]],
+        max_workers: int = 1,
+        **options,
+    ) -> BatchResponse:
+        """
+        Deletes all association labels between any number of (from_object_id, to_object_id)
+        pairs of records.
+        """
+        inputs = (
+            {"from": {"id": str(from_id)}, "to": [{"id": str(to_id)}]}
+            for from_id, to_id in object_ids
+        )
+        return self._send_batches(
+            "archive",
+            from_object_type,
+            to_object_type,
+            inputs,
+            BATCH_WRITE_LIMIT,
+            max_workers,
+            **options,
+        )
 
-    def batch_create_default(self):
-        raise NotImplementedError("Not implemented yet")
+    def batch_delete_specific(
+        self,
+        from_object_type: ObjectTypeDefinitions,
+        to_object_type: ObjectTypeDefinitions,
+        object_ids: Iterable[Tuple[int, int]],
+        association_category: AssociationCategory,
+        association_type_id: int,
+        max_workers: int = 1,
+        **options,
+    ) -> BatchResponse:
+        """
+        Deletes an association label between any number of (from_object_id, to_object_id)
+        pairs of records, keeping their other labels.
+        """
+        inputs = (
+            {
+                "from": {"id": str(from_id)},
+                "to": {"id": str(to_id)},
+                "types": [
+                    {
+                        "associationCategory": association_category.value,
+                        "associationTypeId": association_type_id,
+                    }
+                ],
+            }
+            for from_id, to_id in object_ids
+        )
+        return self._send_batches(
+            "labels/archive",
+            from_object_type,
+            to_object_type,
+            inputs,
+            BATCH_WRITE_LIMIT,
+            max_workers,
+            **options,
+        )
 
-    def batch_create(self):
-        raise NotImplementedError("Not implemented yet")
+    def _send_batches(
+        self,
+        action: str,
+        from_object_type: ObjectTypeDefinitions,
+        to_object_type: ObjectTypeDefinitions,
+        inputs: Iterable[Dict],
+        batch_size: int,
+        max_workers: int,
+        **options,
+    ) -> BatchResponse:
+        """
+        sends the inputs to the given batch endpoint in chunks on up to `max_workers` threads,
+        which share the client's rate limiter, and combines the responses
+        """
+        subpath = EndpointPath(
+            "associations/{from_object_type}/{to_object_type}/batch/" + action,
+            from_object_type=from_object_type.value,
+            to_object_type=to_object_type.value,
+        )
 
-    def batch_delete(self):
-        raise NotImplementedError("Not implemented yet")
+        def send(chunk: List[Dict]) -> Optional[Dict]:
+            return self._call(subpath, method="POST", data={"inputs": chunk}, **options)
 
-    def batch_delete_specific(self):
-        raise NotImplementedError("Not implemented yet")
+        response = BatchResponse()
+        for chunk, chunk_response, error in dispatch(
+            send, chunked(inputs, batch_size), max_workers
+        ):
+            response.add(chunk, chunk_response, error)
+        return response
 
     def read_schema(
         self,
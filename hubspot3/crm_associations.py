@@ -3,8 +3,19 @@ hubspot crm_associations api
 """
 
 from enum import Enum
-from typing import Union
+from functools import partial
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from hubspot3.base import BaseClient
+from hubspot3.batching import BatchReport, RecordResult, chunked, dispatch
+from hubspot3.crm_association_labels import (
+    BATCH_READ_LIMIT,
+    AssociationCategory,
+    CRMAssociationLabelsClient,
+    ObjectTypeDefinitions,
+)
+from hubspot3.error import HubspotBadRequest
+from hubspot3.instrumentation import EndpointPath
 from hubspot3.utils import get_log
 
 
@@ -43,6 +54,77 @@ class Definitions(Enum):
     OWNER_TO_COMPANY = 41
 
 
+# the object types of the definitions that can be read through the v4 batch endpoint, whose
+# HUBSPOT_DEFINED association type ids are the same as the definition ids
+BATCH_READ_OBJECT_TYPES = {
+    Definitions.CONTACT_TO_COMPANY: (
+        ObjectTypeDefinitions.CONTACTS,
+        ObjectTypeDefinitions.COMPANIES,
+    ),
+    Definitions.COMPANY_TO_CONTACT: (
+        ObjectTypeDefinitions.COMPANIES,
+        ObjectTypeDefinitions.CONTACTS,
+    ),
+    Definitions.DEAL_TO_CONTACT: (
+        ObjectTypeDefinitions.DEALS,
+        ObjectTypeDefinitions.CONTACTS,
+    ),
+    Definitions.CONTACT_TO_DEAL: (
+        ObjectTypeDefinitions.CONTACTS,
+        ObjectTypeDefinitions.DEALS,
+    ),
+    Definitions.DEAL_TO_COMPANY: (
+        ObjectTypeDefinitions.DEALS,
+        ObjectTypeDefinitions.COMPANIES,
+    ),
+    Definitions.COMPANY_TO_DEAL: (
+        ObjectTypeDefinitions.COMPANIES,
+        ObjectTypeDefinitions.DEALS,
+    ),
+    Definitions.PARENT_COMPANY_TO_CHILD_COMPANY: (
+        ObjectTypeDefinitions.COMPANIES,
+        ObjectTypeDefinitions.COMPANIES,
+    ),
+    Definitions.CHILD_COMPANY_TO_PARENT_COMPANY: (
+        ObjectTypeDefinitions.COMPANIES,
+        ObjectTypeDefinitions.COMPANIES,
+    ),
+    Definitions.CONTACT_TO_TICKET: (
+        ObjectTypeDefinitions.CONTACTS,
+        ObjectTypeDefinitions.TICKETS,
+    ),
+    Definitions.TICKET_TO_CONTACT: (
+        ObjectTypeDefinitions.TICKETS,
+        ObjectTypeDefinitions.CONTACTS,
+    ),
+    Definitions.DEAL_TO_LINE_ITEM: (
+        ObjectTypeDefinitions.DEALS,
+        ObjectTypeDefinitions.LINE_ITEMS,
+    ),
+    Definitions.LINE_ITEM_TO_DEAL: (
+        ObjectTypeDefinitions.LINE_ITEMS,
+        ObjectTypeDefinitions.DEALS,
+    ),
+    Definitions.COMPANY_TO_TICKET: (
+        ObjectTypeDefinitions.COMPANIES,
+        ObjectTypeDefinitions.TICKETS,
+    ),
+    Definitions.TICKET_TO_COMPANY: (
+        ObjectTypeDefinitions.TICKETS,
+        ObjectTypeDefinitions.COMPANIES,
+    ),
+    Definitions.DEAL_TO_TICKET: (
+        ObjectTypeDefinitions.DEALS,
+        ObjectTypeDefinitions.TICKETS,
+    ),
+    Definitions.TICKET_TO_DEAL: (
+        ObjectTypeDefinitions.TICKETS,
+        ObjectTypeDefinitions.DEALS,
+    ),
+}
+AssociationDefinition = Union[Definitions, int]
+
+
 class CRMAssociationsClient(BaseClient):
     """
     Associations extension for Associations API endpoint
@@ -52,6 +134,7 @@ class CRMAssociationsClient(BaseClient):
     def __init__(self, *args, **kwargs):
         super(CRMAssociationsClient, self).__init__(*args, **kwargs)
         self.log = get_log("hubspot3.crm_associations")
+        self._labels_client = None  # type: Optional[CRMAssociationLabelsClient]
 
     def _get_path(self, subpath: str) -> str:
         return (
@@ -65,23 +148,7 @@ class CRMAssociationsClient(BaseClient):
         :param object_id: Object ID for the object you're looking up
         :param definition: Definition ID for the objects you're looking for associations of
         """
-        finished = False
-        output = []
-        offset = 0
-        query_limit = 100  # Max value according to docs
-        definition_id = definition if isinstance(definition, int) else definition.value
-
-        while not finished:
-            batch = self._call(
-                f"associations/{object_id}/HUBSPOT_DEFINED/{definition_id}",
-                method="GET",
-                params={"limit": query_limit, "offset": offset},
-            )
-            output.extend([id_ for id_ in batch["results"]])
-            finished = not batch["hasMore"]
-            offset = batch["offset"]
-
-        return output
+        return list(self.iter_all(object_id, definition))
 
     def get_all(self, object_id: str, definition: Union[Definitions, int], **options):
         """
@@ -89,23 +156,161 @@ class CRMAssociationsClient(BaseClient):
         :param object_id: Object ID for the object you're looking up
         :param definition: Definition ID for the objects you're looking for associations of
         """
+        return list(self.iter_all(object_id, definition, **options))
+
+    def iter_all(
+        self, object_id: str, definition: Union[Definitions, int], **options
+    ) -> Iterator[int]:
+        """
+        lazily yield the IDs of all objects associated with the given object,
+        one page at a time
+        :param object_id: Object ID for the object you're looking up
+        :param definition: Definition ID for the objects you're looking for associations of
+        """
         finished = False
-        output = []
         offset = 0
         query_limit = 100  # Max value according to docs
         definition_id = definition if isinstance(definition, int) else definition.value
 
         while not finished:
             batch = self._call(
-                f"associations/{object_id}/HUBSPOT_DEFINED/{definition_id}",
+                EndpointPath(
+                    "associations/{object_id}/HUBSPOT_DEFINED/{definition_id}",
+                    object_id=object_id,
+                    definition_id=definition_id,
+                ),
                 method="GET",
                 params={"limit": query_limit, "offset": offset},
+                **options,
             )
-            output.extend([id_ for id_ in batch["results"]])
+            yield from batch["results"]
             finished = not batch["hasMore"]
             offset = batch["offset"]
 
-        return output
+    def iter_many(
+        self,
+        object_ids: Iterable[Union[int, str]],
+        definitions: Iterable[AssociationDefinition],
+        max_workers: int = 1,
+        **options,
+    ) -> Iterator[Tuple[int, AssociationDefinition, int]]:
+        """
+        lazily yield a (from_id, definition, to_id) tuple for every association of the given
+        objects by each of the given definitions, e.g. to build an association graph.
+        Definitions between contacts, companies, deals, tickets and line items are read for
+        up to 1000 objects per request through the v4 batch endpoint, which also serves
+        definitions between the same object types with a single request. The associations of
+        the other definitions are paged through for each object. The requests are sent on up to
+        `max_workers` threads, which share the client's rate limiter.
+        :param object_ids: Object IDs for the objects you're looking up
+        :param definitions: Definition IDs for the objects you're looking for associations of
+        """
+        object_ids = list(object_ids)
+        batched = {}  # type: Dict[Tuple, List[AssociationDefinition]]
+        single = []  # type: List[AssociationDefinition]
+        for definition in definitions:
+            object_types = BATCH_READ_OBJECT_TYPES.get(self._get_definition(definition))
+            if object_types:
+                batched.setdefault(object_types, []).append(definition)
+            else:
+                single.append(definition)
+
+        if batched:
+            # created upfront, so that the threads share it
+            self._get_labels_client()
+        tasks = chain(
+            (
+                partial(self._read_batch, *object_types, group, chunk, **options)
+                for object_types, group in batched.items()
+                for chunk in chunked(object_ids, BATCH_READ_LIMIT)
+            ),
+            (
+                partial(self._read_single, object_id, definition, **options)
+                for definition in single
+                for object_id in object_ids
+            ),
+        )
+        for _, associations, error in dispatch(lambda task: task(), tasks, max_workers):
+            if error is not None:
+                raise error
+            yield from associations
+
+    @staticmethod
+    def _get_definition(definition: AssociationDefinition) -> Optional[Definitions]:
+        """returns the Definitions member of the given definition or id, if there is one"""
+        try:
+            return Definitions(definition)
+        except ValueError:
+            return None
+
+    def _read_single(
+        self, object_id: Union[int, str], definition: AssociationDefinition, **options
+    ) -> List[Tuple[int, AssociationDefinition, int]]:
+        """returns the associations of one object by one definition"""
+        return [
+            (int(object_id), definition, to_id)
+            for to_id in self.iter_all(object_id, definition, **options)
+        ]
+
+    def _read_batch(
+        self,
+        from_object_type: ObjectTypeDefinitions,
+        to_object_type: ObjectTypeDefinitions,
+        definitions: List[AssociationDefinition],
+        object_ids: List[Union[int, str]],
+        **options,
+    ) -> List[Tuple[int, AssociationDefinition, int]]:
+        """
+        returns the associations of up to 1000 objects by the given definitions between the
+        same object types, read through the v4 batch endpoint
+        """
+        labels_client = self._get_labels_client()
+        response = labels_client.batch_list(
+            from_object_type, to_object_type, object_ids, **options
+        )
+        for _, error in response.failed:
+            raise error
+        type_ids = {}
+        for definition in definitions:
+            type_id = definition if isinstance(definition, int) else definition.value
+            type_ids[type_id] = definition
+        associations = []
+        # objects without associations are reported as errors, which can be ignored
+        for result in response.results:
+            from_id = int(result["from"]["id"])
+            targets = result["to"]
+            after = result.get("paging", {}).get("next", {}).get("after")
+            if after:
+                # the batch endpoint returns up to 500 associations per object
+                targets = targets + [
+                    target
+                    for page in labels_client._iter_pages(
+                        from_object_type,
+                        from_id,
+                        to_object_type,
+                        after=after,
+                        **options,
+                    )
+                    for target in page["results"]
+                ]
+            for target in targets:
+                for association_type in target["associationTypes"]:
+                    definition = type_ids.get(association_type["typeId"])
+                    if (
+                        definition is not None
+                        and association_type["category"]
+                        == AssociationCategory.HUBSPOT_DEFINED.value
+                    ):
+                        associations.append(
+                            (from_id, definition, int(target["toObjectId"]))
+                        )
+        return associations
+
+    def _get_labels_client(self) -> CRMAssociationLabelsClient:
+        """returns the client for the v4 endpoints, which shares this client's options"""
+        if self._labels_client is None:
+            self._labels_client = self._get_sibling_client(CRMAssociationLabelsClient)
+        return self._labels_client
 
     def create(
         self,
@@ -161,6 +366,115 @@ class CRMAssociationsClient(BaseClient):
             **options,
         )
 
+    def create_many(
+        self,
+        associations: Iterable[Tuple[str, str, AssociationDefinition]],
+        batch_size: int = 100,
+        max_workers: int = 1,
+        **options,
+    ) -> BatchReport:
+        """
+        create any number of hubspot associations through the batch endpoint. Each
+        association is a (from_object, to_object, definition) tuple. The associations are read
+        lazily and sent in chunks of `batch_size` (at most 100) on up to `max_workers`
+        threads, which share the client's rate limiter.
+
+        Returns a BatchReport with the outcome of every association, indexed by its position
+        in the input. As HubSpot rejects a whole chunk if it contains an invalid association,
+        such chunks are split up until the invalid associations are found.
+        :see: https://developers.hubspot.com/docs/methods/crm-associations/batch-associate-objects
+        """
+        return self._send_batches(
+            "associations/create-batch",
+            associations,
+            batch_size,
+            max_workers,
+            **options,
+        )
+
+    def delete_many(
+        self,
+        associations: Iterable[Tuple[str, str, AssociationDefinition]],
+        batch_size: int = 100,
+        max_workers: int = 1,
+        **options,
+    ) -> BatchReport:
+        """
+        delete any number of hubspot associations through the batch endpoint, the same way
+        `create_many` creates them
+        :see: https://developers.hubspot.com/docs/methods/crm-associations/batch-delete-associations
+        """
+        return self._send_batches(
+            "associations/delete-batch",
+            associations,
+            batch_size,
+            max_workers,
+            **options,
+        )
+
+    def _send_batches(
+        self,
+        subpath: str,
+        associations: Iterable[Tuple[str, str, AssociationDefinition]],
+        batch_size: int,
+        max_workers: int,
+        **options,
+    ) -> BatchReport:
+        """sends the associations to the given batch endpoint in chunks"""
+        batch_size = min(batch_size, 100)  # Max value according to docs
+        results = []
+        chunks = chunked(enumerate(associations), batch_size)
+        send = partial(self._send_batch, subpath, **options)
+        for chunk, chunk_results, error in dispatch(send, chunks, max_workers):
+            if error is not None:
+                chunk_results = [
+                    RecordResult(index, association, error, str(error))
+                    for index, association in chunk
+                ]
+            results.extend(chunk_results)
+        return BatchReport(results)
+
+    def _send_batch(
+        self,
+        subpath: str,
+        chunk: List[Tuple[int, Tuple[str, str, AssociationDefinition]]],
+        **options,
+    ) -> List[RecordResult]:
+        """
+        sends one chunk of (index, association) pairs to the given batch endpoint. If HubSpot
+        rejects it as a bad request, both halves are sent separately, down to the single
+        invalid associations. Other errors affect the whole chunk, so they are raised.
+        """
+        try:
+            self._call(
+                subpath,
+                data=[
+                    {
+                        "fromObjectId": from_object,
+                        "toObjectId": to_object,
+                        "category": "HUBSPOT_DEFINED",
+                        "definitionId": (
+                            definition
+                            if isinstance(definition, int)
+                            else definition.value
+                        ),
+                    }
+                    for _, (from_object, to_object, definition) in chunk
+                ],
+                method="PUT",
+                **options,
+            )
+        except HubspotBadRequest as error:
+            if error.result.status != 400:
+                raise
+            if len(chunk) == 1:
+                index, association = chunk[0]
+                return [RecordResult(index, association, error, str(error))]
+            middle = len(chunk) // 2
+            results = self._send_batch(subpath, chunk[:middle], **options)
+            return results + self._send_batch(subpath, chunk[middle:], **options)
+        return [RecordResult(index, association) for index, association in chunk]
+
     def get_deal_to_lines_items(self, deal_id: str):
         """Get the lines related to a deal."""
         return self.get(object_id=deal_id, definition=Definitions.DEAL_TO_LINE_ITEM)
@@ -3,6 +3,7 @@ hubspot crm_pipelines api
 """
 
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 from hubspot3.utils import get_log
 
 
@@ -34,7 +35,12 @@ class PipelinesClient(BaseClient):
     def update(self, object_type, key, data=None, **options):
         data = data or {}
         return self._call(
-            f"pipelines/{object_type}/{key}", data=data, method="PUT", **options
+            EndpointPath(
+                "pipelines/{object_type}/{key}", object_type=object_type, key=key
+            ),
+            data=data,
+            method="PUT",
+            **options,
         )
 
     def get_all(self, object_type="deals", offset=0, extra_properties=None, **options):
@@ -3,8 +3,10 @@ hubspot deals api
 """
 
 import urllib.parse
-from typing import Dict, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
+from hubspot3.pagination import Checkpoint, prefetch
 from hubspot3.utils import get_log, prettify
 
 
@@ -36,7 +38,9 @@ class DealsClient(BaseClient):
         get a single deal by id
         :see: https://developers.hubspot.com/docs/methods/deals/get_deal
         """
-        return self._call(f"deal/{deal_id}", method="GET", **options)
+        return self._call(
+            EndpointPath("deal/{deal_id}", deal_id=deal_id), method="GET", **options
+        )
 
     def create(self, data: Optional[Dict] = None, **options):
         """
@@ -52,14 +56,21 @@ class DealsClient(BaseClient):
         :see: https://developers.hubspot.com/docs/methods/deals/update_deal
         """
         data = data or {}
-        return self._call(f"deal/{deal_id}", data=data, method="PUT", **options)
+        return self._call(
+            EndpointPath("deal/{deal_id}", deal_id=deal_id),
+            data=data,
+            method="PUT",
+            **options,
+        )
 
     def delete(self, deal_id: str, **options) -> Dict:
         """
         Delete a deal.
         :see: https://developers.hubspot.com/docs/methods/deals/delete_deal
         """
-        return self._call(f"deal/{deal_id}", method="DELETE", **options)
+        return self._call(
+            EndpointPath("deal/{deal_id}", deal_id=deal_id), method="DELETE", **options
+        )
 
     def associate(self, deal_id, object_type, object_ids, **options):
         # Encoding the query string here since HubSpot is expecting the "id" parameter to be
@@ -69,31 +80,19 @@ class DealsClient(BaseClient):
         query = urllib.parse.urlencode(object_ids)
 
         return self._call(
-            f"deal/{deal_id}/associations/{object_type}",
+            EndpointPath(
+                "deal/{deal_id}/associations/{object_type}",
+                deal_id=deal_id,
+                object_type=object_type,
+            ),
             method="PUT",
             query=query,
             **options,
         )
 
-    def get_all(
-        self,
-        offset: int = 0,
-        extra_properties: Union[list, str, None] = None,
-        limit: int = -1,
-        **options,
-    ):
-        """
-        get all deals in the hubspot account.
-        extra_properties: a list used to extend the properties fetched
-        :see: https://developers.hubspot.com/docs/methods/deals/get-all-deals
-        """
-        finished = False
-        output = []
-        query_limit = 250  # Max value according to docs
-        limited = limit > 0
-        if limited and limit < query_limit:
-            query_limit = limit
-
+    @staticmethod
+    def _get_all_properties(extra_properties: Union[list, str, None] = None) -> list:
+        """returns the properties to fetch when paging through all deals"""
         # default properties to fetch
         properties = [
             "associations",
@@ -114,31 +113,118 @@ class DealsClient(BaseClient):
                 properties += extra_properties
             if isinstance(extra_properties, str):
                 properties.append(extra_properties)
+        return properties
 
-        while not finished:
-            batch = self._call(
-                "deal/paged",
-                method="GET",
-                params={
-                    "limit": query_limit,
-                    "offset": offset,
-                    "properties": properties,
-                    "includeAssociations": True,
-                },
-                doseq=True,
+    def get_all(
+        self,
+        offset: int = 0,
+        extra_properties: Union[list, str, None] = None,
+        limit: int = -1,
+        **options,
+    ):
+        """
+        get all deals in the hubspot account.
+        extra_properties: a list used to extend the properties fetched
+        :see: https://developers.hubspot.com/docs/methods/deals/get-all-deals
+        """
+        return list(
+            self.iter_all(
+                offset=offset,
+                extra_properties=extra_properties,
+                limit=limit,
                 **options,
             )
-            output.extend(
-                [
-                    prettify(deal, id_key="dealId")
-                    for deal in batch["deals"]
-                    if not deal["isDeleted"]
-                ]
-            )
-            finished = not batch["hasMore"] or (limited and len(output) >= limit)
-            offset = batch["offset"]
+        )
+
+    def iter_all(
+        self,
+        offset: int = 0,
+        extra_properties: Union[list, str, None] = None,
+        limit: int = -1,
+        prefetch_pages: int = 0,
+        checkpoint_store=None,
+        checkpoint_key: Optional[str] = None,
+        stream: bool = False,
+        **options,
+    ) -> Iterator[Dict]:
+        """
+        lazily yield all deals in the hubspot account, one page at a time.
+        Takes the same arguments as `get_all`.
 
-        return output if not limited else output[:limit]
+        :param prefetch_pages: if set, up to this many pages are fetched in the background
+        while the current page is being processed.
+        :param stream: if set, the deals of a page are yielded while the page is still being
+        received, instead of once it was received and decoded completely. Can't be combined
+        with `prefetch_pages`.
+        :param checkpoint_store: a store from `hubspot3.pagination` in which the offset of the
+        next page is saved whenever a page was consumed, so an interrupted export resumes from
+        there. `checkpoint_key` names the checkpoint and defaults to one derived from the query.
+        """
+        if stream and prefetch_pages:
+            raise ValueError("Streamed pages can't be prefetched.")
+        count = 0
+        query_limit = 250  # Max value according to docs
+        limited = limit > 0
+        if limited and limit < query_limit:
+            query_limit = limit
+        properties = self._get_all_properties(extra_properties)
+        checkpoint = Checkpoint(
+            checkpoint_store,
+            checkpoint_key,
+            {
+                "endpoint": "deals/deal/paged",
+                "limit": query_limit,
+                "properties": properties,
+            },
+        )
+        offset = checkpoint.resume(offset)
+        pages = self._iter_pages(
+            offset, query_limit, properties, stream=stream, **options
+        )
+
+        for batch in prefetch(pages, prefetch_pages):
+            for deal in batch["deals"]:
+                if deal["isDeleted"]:
+                    continue
+                yield prettify(deal, id_key="dealId")
+                count += 1
+                if limited and count >= limit:
+                    return
+            if batch["hasMore"]:
+                checkpoint.save(batch["offset"])
+        checkpoint.clear()
+
+    def _iter_pages(
+        self,
+        offset: int,
+        query_limit: int,
+        properties: List[str],
+        stream: bool = False,
+        **options,
+    ) -> Iterator[Dict]:
+        """
+        yields the raw pages of all deals, starting at the given offset.
+        with `stream`, the pages are `JSONArrayStream`s that are parsed while they arrive.
+        """
+        finished = False
+        while not finished:
+            params = {
+                "limit": query_limit,
+                "offset": offset,
+                "properties": properties,
+                "includeAssociations": True,
+            }
+            if stream:
+                batch = self._call_stream(
+                    "deal/paged", "deals", params=params, doseq=True, **options
+                )
+            else:
+                batch = self._call(
+                    "deal/paged", method="GET", params=params, doseq=True, **options
+                )
+            yield batch
+            finished = not batch["hasMore"]
+            offset = batch["offset"]
 
     def _get_recent(
         self,
@@ -154,11 +240,34 @@ class DealsClient(BaseClient):
 
         :param since: unix formatted timestamp in milliseconds
         """
+        return list(
+            self._iter_recent(
+                recency_type,
+                limit=limit,
+                offset=offset,
+                since=since,
+                include_versions=include_versions,
+                **options,
+            )
+        )
+
+    def _iter_recent(
+        self,
+        recency_type: str,
+        limit: int = 100,
+        offset: int = 0,
+        since: Optional[int] = None,
+        include_versions: bool = False,
+        **options,
+    ) -> Iterator[Dict]:
+        """
+        lazily yield up to `limit` recently created or recently modified deals, one page at
+        a time. Takes the same arguments as `_get_recent`.
+        """
         finished = False
-        output = []
+        count = 0
         query_limit = 100  # max according to the docs
-        limited = limit > 0
-        if limited and limit < query_limit:
+        if 0 < limit < query_limit:
             query_limit = limit
 
         while not finished:
@@ -176,18 +285,16 @@ class DealsClient(BaseClient):
                 doseq=True,
                 **options,
             )
-            output.extend(
-                [
-                    prettify(deal, id_key="dealId")
-                    for deal in batch["results"]
-                    if not deal["isDeleted"]
-                ]
-            )
-            finished = not batch["hasMore"] or len(output) >= limit
+            for deal in batch["results"]:
+                if deal["isDeleted"]:
+                    continue
+                if count >= limit:
+                    return
+                count += 1
+                yield prettify(deal, id_key="dealId")
+            finished = not batch["hasMore"] or count >= limit
             offset = batch["offset"]
 
-        return output[:limit]
-
     def get_recently_created(
         self,
         limit: int = 100,
@@ -233,3 +340,24 @@ class DealsClient(BaseClient):
             include_versions=include_versions,
             **options,
         )
+
+    def iter_recently_modified(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        since: Optional[int] = None,
+        include_versions: bool = False,
+        **options,
+    ) -> Iterator[Dict]:
+        """
+        lazily yield recently modified deals, one page at a time.
+        Takes the same arguments as `get_recently_modified`.
+        """
+        return self._iter_recent(
+            DealsClient.Recency.MODIFIED,
+            limit=limit,
+            offset=offset,
+            since=since,
+            include_versions=include_versions,
+            **options,
+        )
@@ -2,10 +2,14 @@
 hubspot ecommerce bridge api
 """
 
-from collections.abc import Mapping, Sequence
-from typing import Dict, List, Optional
+import time
+from collections.abc import Iterable, Mapping
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 from hubspot3.base import BaseClient
-from hubspot3.error import HubspotBadConfig
+from hubspot3.batching import ChunkReport, ChunkResult, chunked, dispatch
+from hubspot3.error import HubspotBadConfig, HubspotError
+from hubspot3.instrumentation import EndpointPath
 from hubspot3.utils import get_log
 
 
@@ -58,25 +62,72 @@ class EcommerceBridgeClient(BaseClient):
         return f"extensions/ecomm/v{ECOMMERCE_BRIDGE_API_VERSION}/{subpath}"
 
     def send_sync_messages(
-        self, object_type: str, messages: Sequence, store_id: str = "default", **options
-    ) -> None:
+        self,
+        object_type: str,
+        messages: Iterable,
+        store_id: str = "default",
+        max_workers: int = 1,
+        chunk_retries: int = 2,
+        raise_on_error: bool = True,
+        **options,
+    ) -> ChunkReport:
         """
         Send multiple ecommerce sync messages for the given object type and store ID.
 
         If the number of sync messages exceeds the maximum number of sync messages per request,
-        the messages will automatically be split up into appropriately sized requests.
+        the messages will automatically be split up into appropriately sized requests. The
+        messages may be any iterable and are only read as the requests go out, on up to
+        `max_workers` threads that share the client's rate limiter. Requests failing with a
+        server error, a timeout or a rate limit are sent again up to `chunk_retries` times.
+
+        The error of the first failed request is raised, and no further messages are sent.
+        With `raise_on_error=False`, all messages are sent instead and the returned
+        ChunkReport tells which requests failed. Either way, the report tells which requests
+        succeeded or were retried.
 
         :see: https://developers.hubspot.com/docs/methods/ecommerce/v2/send-sync-messages
         """
         # Break the messages down into chunks that do not contain more than the maximum number
         # of allowed sync messages per request.
-        chunks = [
-            list(messages[i : i + MAX_ECOMMERCE_BRIDGE_SYNC_MESSAGES])
-            for i in range(0, len(messages), MAX_ECOMMERCE_BRIDGE_SYNC_MESSAGES)
-        ]
-        for chunk in chunks:
-            data = {"objectType": object_type, "storeId": store_id, "messages": chunk}
-            self._call("sync/messages", data=data, method="PUT", **options)
+        chunks = enumerate(chunked(messages, MAX_ECOMMERCE_BRIDGE_SYNC_MESSAGES))
+        send = partial(
+            self._send_sync_chunk, object_type, store_id, chunk_retries, **options
+        )
+        report = ChunkReport()
+        for _, result, _ in dispatch(send, chunks, max_workers):
+            if raise_on_error and not result.ok:
+                raise result.error
+            report.results.append(result)
+        return report
+
+    def _send_sync_chunk(
+        self,
+        object_type: str,
+        store_id: str,
+        chunk_retries: int,
+        chunk: Tuple[int, List],
+        **options,
+    ) -> ChunkResult:
+        """sends one chunk of sync messages, retrying it on transient errors"""
+        index, messages = chunk
+        data = {"objectType": object_type, "storeId": store_id, "messages": messages}
+        # the chunk is retried here, so the request itself mustn't be retried as well
+        options = dict(options, number_retries=0)
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                self._call("sync/messages", data=data, method="PUT", **options)
+                return ChunkResult(index, len(messages), attempts)
+            except HubspotError as error:
+                status = error.result.status if error.result else None
+                transient = not status or status >= 500 or status == 429
+                if not transient or attempts > chunk_retries:
+                    self.log.warning(
+                        f"Sending chunk {index} of sync messages failed: {error}"
+                    )
+                    return ChunkResult(index, len(messages), attempts, error)
+                time.sleep(self._get_retry_delay(attempts, error))
 
     def _get_sync_errors(
         self,
@@ -276,7 +327,12 @@ class EcommerceBridgeClient(BaseClient):
         :see: https://developers.hubspot.com/docs/methods/ecommerce/v2/check-sync-status
         """
         return self._call(
-            f"sync/status/{store_id}/{object_type}/{external_object_id}",
+            EndpointPath(
+                "sync/status/{store_id}/{object_type}/{external_object_id}",
+                store_id=store_id,
+                object_type=object_type,
+                external_object_id=external_object_id,
+            ),
             method="GET",
             **options,
         )
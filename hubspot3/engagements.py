@@ -2,8 +2,9 @@
 hubspot engagements api
 """
 
-from typing import Dict, List
+from typing import Dict, Iterator, List
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 from hubspot3.utils import get_log
 
 
@@ -26,7 +27,11 @@ class EngagementsClient(BaseClient):
 
     def get(self, engagement_id, **options):
         """Get a HubSpot engagement."""
-        return self._call(f"engagements/{engagement_id}", method="GET", **options)
+        return self._call(
+            EndpointPath("engagements/{engagement_id}", engagement_id=engagement_id),
+            method="GET",
+            **options,
+        )
 
     def get_associated(self, object_type, object_id, **options) -> List[Dict]:
         """
@@ -40,7 +45,11 @@ class EngagementsClient(BaseClient):
         offset = 0
         while not finished:
             batch = self._call(
-                f"engagements/associated/{object_type}/{object_id}/paged",
+                EndpointPath(
+                    "engagements/associated/{object_type}/{object_id}/paged",
+                    object_type=object_type,
+                    object_id=object_id,
+                ),
                 method="GET",
                 params={"limit": query_limit, "offset": offset},
                 **options,
@@ -57,16 +66,29 @@ class EngagementsClient(BaseClient):
 
     def update(self, key, data=None, **options):
         data = data or {}
-        return self._call(f"engagements/{key}", data=data, method="PUT", **options)
+        return self._call(
+            EndpointPath("engagements/{key}", key=key),
+            data=data,
+            method="PUT",
+            **options,
+        )
 
     def patch(self, key, data=None, **options):
         data = data or {}
-        return self._call(f"engagements/{key}", data=data, method="PATCH", **options)
+        return self._call(
+            EndpointPath("engagements/{key}", key=key),
+            data=data,
+            method="PATCH",
+            **options,
+        )
 
     def get_all(self, **options) -> List[Dict]:
         """get all engagements"""
+        return list(self.iter_all(**options))
+
+    def iter_all(self, **options) -> Iterator[Dict]:
+        """lazily yield all engagements, one page at a time"""
         finished = False
-        output = []  # type: List[Dict]
         query_limit = 250  # Max value according to docs
         offset = 0
         while not finished:
@@ -76,16 +98,17 @@ class EngagementsClient(BaseClient):
                 params={"limit": query_limit, "offset": offset},
                 **options,
             )
-            output.extend(batch["results"])
+            yield from batch["results"]
             finished = not batch["hasMore"]
             offset = batch["offset"]
 
-        return output
-
     def get_recently_modified(self, since, **options) -> List[Dict]:
         """get recently modified engagements"""
+        return list(self.iter_recently_modified(since, **options))
+
+    def iter_recently_modified(self, since, **options) -> Iterator[Dict]:
+        """lazily yield recently modified engagements, one page at a time"""
         finished = False
-        output = []  # type: List[Dict]
         query_limit = 100  # Max value according to docs
         offset = 0
         while not finished:
@@ -95,8 +118,6 @@ class EngagementsClient(BaseClient):
                 params={"limit": query_limit, "offset": offset, "since": since},
                 **options,
             )
-            output.extend(batch["results"])
+            yield from batch["results"]
             finished = not batch["hasMore"]
             offset = batch["offset"]
-
-        return output
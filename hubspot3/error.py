@@ -113,6 +113,10 @@ class HubspotNoConfig(Exception):
     """no api_key or access_token credentials were passed to the client"""
 
 
+class HubspotNotSupported(NotImplementedError):
+    """a method or option that the client doesn't support, e.g. on the asyncio clients"""
+
+
 # Create more specific error cases, to make filtering errors easier
 class HubspotBadRequest(HubspotError):
     """most 40X results and 501 results"""
@@ -8,6 +8,7 @@ from http.client import HTTPResponse
 from typing import Dict, Optional
 from hubspot3.base import BaseClient
 from hubspot3.error import HubspotNotFound, HubspotServerError
+from hubspot3.instrumentation import EndpointPath
 
 
 FORMS_API_VERSION = 2
@@ -90,7 +91,9 @@ class FormsClient(BaseClient):
         get a form by its form_id
         :see: https://developers.hubspot.com/docs/methods/forms/v2/get_form
         """
-        return self._call(f"forms/{form_id}", method="GET", **options)
+        return self._call(
+            EndpointPath("forms/{form_id}", form_id=form_id), method="GET", **options
+        )
 
     def get_all(self, limit: int = -1, offset: int = 0, **options) -> list:
         """
@@ -0,0 +1,261 @@
+"""
+hooks to observe the requests of hubspot3 clients, e.g. to export their latency as metrics
+"""
+
+import re
+import time
+from typing import Any, Dict, Iterable, Optional, Union
+
+
+_ID_SEGMENT = re.compile(r"(?<=/)(?:\d+|[0-9a-f]{8}-[0-9a-f-]{27})(?=/|$)")
+
+
+class EndpointPath(str):
+    """
+    a request subpath that remembers the template it was formatted from, so that requests
+    can be told apart by endpoint without parsing their paths:
+    `EndpointPath("contact/vid/{contact_id}/profile", contact_id=123)`
+    """
+
+    template = ""  # type: str
+
+    def __new__(cls, template: str, **params: Any) -> "EndpointPath":
+        path = super().__new__(cls, template.format(**params))
+        path.template = template
+        return path
+
+
+def get_endpoint_template(path: str) -> str:
+    """
+    returns the path with the ids in it replaced by `{id}`, for subpaths that aren't an
+    EndpointPath
+    """
+    return _ID_SEGMENT.sub("{id}", path)
+
+
+class RequestEvent:
+    """
+    what is known about one attempt of a request. It is passed to every hook of the
+    attempt, and the response related attributes are filled in once the response arrived.
+    Durations are in seconds, sizes in bytes. Instrumentations can keep their own state for
+    the attempt in `context`.
+    """
+
+    def __init__(
+        self, method: str, endpoint: str, url: str, attempt: int, request_size: int = 0
+    ) -> None:
+        self.method = method
+        # the path without its query and with ids replaced by placeholders
+        self.endpoint = endpoint
+        self.url = url
+        # 1 for the first attempt, 2 for the first retry and so on
+        self.attempt = attempt
+        self.request_size = request_size
+        self.status = None  # type: Optional[int]
+        # until the status line and the headers of the response were received
+        self.time_to_first_byte = None  # type: Optional[float]
+        self.total_time = None  # type: Optional[float]
+        # the size of the body as it was received, and after decompressing it
+        self.response_size = None  # type: Optional[int]
+        self.decoded_size = None  # type: Optional[int]
+        self.context = {}  # type: Dict[str, Any]
+        self.started_at = time.perf_counter()
+
+    def __repr__(self) -> str:
+        return (
+            f"<RequestEvent: {self.method} {self.endpoint} #{self.attempt} "
+            f"status={self.status} total_time={self.total_time}>"
+        )
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        """how much smaller the received body was than the decompressed one"""
+        if not self.response_size or not self.decoded_size:
+            return None
+        return self.response_size / self.decoded_size
+
+    def record_response(self, result) -> None:
+        """takes the timings, status and sizes from a (possibly failed) response"""
+        self.total_time = time.perf_counter() - self.started_at
+        if result is None or not getattr(result, "status", None):
+            return
+        self.status = result.status
+        headers_received_at = getattr(result, "headers_received_at", None)
+        if headers_received_at is not None:
+            self.time_to_first_byte = headers_received_at - self.started_at
+        self.response_size = getattr(result, "raw_size", None)
+        body = getattr(result, "body", None)
+        if isinstance(body, (str, bytes)):
+            self.decoded_size = len(body)
+
+
+class Instrumentation:
+    """
+    Base class of the instrumentations that can be passed to clients as their
+    `instrumentation` option. The hooks are called for every attempt of every request, in
+    the thread that sends it, and do nothing by default. Exceptions raised by hooks are not
+    caught, so keep them cheap and safe.
+    """
+
+    def before_request(self, event: RequestEvent) -> None:
+        """called right before an attempt is sent"""
+
+    def after_request(self, event: RequestEvent) -> None:
+        """called once a successful response was received completely"""
+
+    def request_failed(self, event: RequestEvent, exception: Exception) -> None:
+        """
+        called when an attempt failed with an exception, which is a HubspotError for error
+        responses. `event.status` is None if no response was received at all.
+        """
+
+
+class MultiInstrumentation(Instrumentation):
+    """calls the hooks of several instrumentations, in the given order"""
+
+    def __init__(self, instrumentations: Iterable[Instrumentation]) -> None:
+        self.instrumentations = list(instrumentations)
+
+    def before_request(self, event: RequestEvent) -> None:
+        for instrumentation in self.instrumentations:
+            instrumentation.before_request(event)
+
+    def after_request(self, event: RequestEvent) -> None:
+        for instrumentation in self.instrumentations:
+            instrumentation.after_request(event)
+
+    def request_failed(self, event: RequestEvent, exception: Exception) -> None:
+        for instrumentation in self.instrumentations:
+            instrumentation.request_failed(event, exception)
+
+
+def get_instrumentation(
+    instrumentation: Union[Instrumentation, Iterable[Instrumentation], None],
+) -> Optional[Instrumentation]:
+    """returns the instrumentation to use for the given `instrumentation` client option"""
+    if instrumentation is None or isinstance(instrumentation, Instrumentation):
+        return instrumentation
+    return MultiInstrumentation(instrumentation)
+
+
+class PrometheusInstrumentation(Instrumentation):
+    """
+    exports the requests as prometheus metrics, labeled by method, endpoint template and
+    status (the exception class for attempts without a response). Requires `prometheus_client`.
+    """
+
+    def __init__(self, registry=None, namespace: str = "hubspot3") -> None:
+        import prometheus_client
+
+        options = {"namespace": namespace}
+        if registry is not None:
+            options["registry"] = registry
+        labels = ["method", "endpoint", "status"]
+        self.requests = prometheus_client.Counter(
+            "requests", "Request attempts sent to HubSpot", labels, **options
+        )
+        self.retries = prometheus_client.Counter(
+            "retries", "Request attempts that were retries", labels[:2], **options
+        )
+        self.duration = prometheus_client.Histogram(
+            "request_duration_seconds",
+            "Total time of request attempts",
+            labels,
+            **options,
+        )
+        self.time_to_first_byte = prometheus_client.Histogram(
+            "request_time_to_first_byte_seconds",
+            "Time until the response headers arrived",
+            labels,
+            **options,
+        )
+        self.response_bytes = prometheus_client.Counter(
+            "response_bytes", "Response body bytes as received", labels[:2], **options
+        )
+        self.decoded_bytes = prometheus_client.Counter(
+            "response_decoded_bytes",
+            "Response body bytes after decompression",
+            labels[:2],
+            **options,
+        )
+
+    def before_request(self, event: RequestEvent) -> None:
+        if event.attempt > 1:
+            self.retries.labels(event.method, event.endpoint).inc()
+
+    def after_request(self, event: RequestEvent) -> None:
+        self._observe(event, str(event.status))
+
+    def request_failed(self, event: RequestEvent, exception: Exception) -> None:
+        self._observe(event, str(event.status or type(exception).__name__))
+
+    def _observe(self, event: RequestEvent, status: str) -> None:
+        labels = (event.method, event.endpoint, status)
+        self.requests.labels(*labels).inc()
+        if event.total_time is not None:
+            self.duration.labels(*labels).observe(event.total_time)
+        if event.time_to_first_byte is not None:
+            self.time_to_first_byte.labels(*labels).observe(event.time_to_first_byte)
+        if event.response_size:
+            self.response_bytes.labels(event.method, event.endpoint).inc(
+                event.response_size
+            )
+        if event.decoded_size:
+            self.decoded_bytes.labels(event.method, event.endpoint).inc(
+                event.decoded_size
+            )
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    records every request attempt as a client span of the current trace, named after the
+    method and endpoint template. Requires `opentelemetry-api`.
+    """
+
+    def __init__(self, tracer=None) -> None:
+        from opentelemetry import trace
+
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("hubspot3")
+
+    def before_request(self, event: RequestEvent) -> None:
+        event.context["span"] = self.tracer.start_span(
+            f"{event.method} {event.endpoint}",
+            kind=self._trace.SpanKind.CLIENT,
+            attributes={
+                "http.request.method": event.method,
+                "url.path": event.url,
+                "hubspot.endpoint": event.endpoint,
+                "hubspot.attempt": event.attempt,
+                "http.request.body.size": event.request_size,
+            },
+        )
+
+    def after_request(self, event: RequestEvent) -> None:
+        span = event.context.pop("span", None)
+        if span is None:
+            return
+        self._set_response_attributes(span, event)
+        span.end()
+
+    def request_failed(self, event: RequestEvent, exception: Exception) -> None:
+        span = event.context.pop("span", None)
+        if span is None:
+            return
+        self._set_response_attributes(span, event)
+        span.record_exception(exception)
+        span.set_status(
+            self._trace.Status(self._trace.StatusCode.ERROR, type(exception).__name__)
+        )
+        span.end()
+
+    @staticmethod
+    def _set_response_attributes(span, event: RequestEvent) -> None:
+        if event.status is not None:
+            span.set_attribute("http.response.status_code", event.status)
+        if event.time_to_first_byte is not None:
+            span.set_attribute("hubspot.time_to_first_byte", event.time_to_first_byte)
+        if event.response_size is not None:
+            span.set_attribute("http.response.body.size", event.response_size)
+        if event.decoded_size is not None:
+            span.set_attribute("hubspot.response.decoded_size", event.decoded_size)
@@ -3,6 +3,7 @@ hubspot keywords api
 """
 
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 
 KEYWORDS_API_VERSION = "v1"
 
@@ -22,7 +23,10 @@ class KeywordsClient(BaseClient):
         return self._call("keywords", **options)["keywords"]
 
     def get_keyword(self, keyword_guid, **options):
-        return self._call(f"keywords/{keyword_guid}", **options)
+        return self._call(
+            EndpointPath("keywords/{keyword_guid}", keyword_guid=keyword_guid),
+            **options,
+        )
 
     def add_keyword(self, keyword, **options):
         return self._call(
@@ -40,4 +44,8 @@ class KeywordsClient(BaseClient):
         return self._call("keywords", data=data, method="PUT", **options)["keywords"]
 
     def delete_keyword(self, keyword_guid, **options):
-        return self._call(f"keywords/{keyword_guid}", method="DELETE", **options)
+        return self._call(
+            EndpointPath("keywords/{keyword_guid}", keyword_guid=keyword_guid),
+            method="DELETE",
+            **options,
+        )
@@ -5,6 +5,7 @@ hubspot leads api
 import time
 from typing import Dict, List
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 from hubspot3.utils import get_log
 
 
@@ -134,7 +135,9 @@ class LeadsClient(BaseClient):
         lead = {"guid": "-1"}
         # wrap lead call so that it doesn't error out when not finding a lead
         try:
-            lead = self._call(f"lead/{cur_guid}", params, **options)
+            lead = self._call(
+                EndpointPath("lead/{cur_guid}", cur_guid=cur_guid), params, **options
+            )
         except Exception:
             # no lead here
             pass
@@ -143,7 +146,12 @@ class LeadsClient(BaseClient):
     def update_lead(self, guid, update_data=None, **options):
         update_data = update_data or {}
         update_data["guid"] = guid
-        return self._call(f"lead/{guid}/", data=update_data, method="PUT", **options)
+        return self._call(
+            EndpointPath("lead/{guid}/", guid=guid),
+            data=update_data,
+            method="PUT",
+            **options,
+        )
 
     def get_webhook(self, **options):  # WTF are these 2 methods for?
         return self._call("callback-url", **options)
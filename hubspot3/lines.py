@@ -2,9 +2,10 @@
 hubspot lines api
 """
 
-from typing import Dict, Union
+from typing import Dict, Iterator, Union
 from hubspot3.base import BaseClient
 from hubspot3.crm_associations import CRMAssociationsClient
+from hubspot3.instrumentation import EndpointPath
 from hubspot3.utils import get_log, prettify, ordered_dict
 
 
@@ -39,14 +40,16 @@ class LinesClient(BaseClient):
         Delete a line item by its ID.
         :see: https://developers.hubspot.com/docs/methods/line-items/delete-line-item
         """
-        return self._call(f"{line_id}", method="DELETE", **options)
+        return self._call(
+            EndpointPath("{line_id}", line_id=line_id), method="DELETE", **options
+        )
 
     def get(self, line_id: int, **options) -> Dict:
         """
         Retrieve a line by its ID.
         :see: https://developers.hubspot.com/docs/methods/line-items/get_line_item_by_id
         """
-        return self._call(f"{line_id}", **options)
+        return self._call(EndpointPath("{line_id}", line_id=line_id), **options)
 
     def update(self, line_id: int, data=None, **options) -> Dict:
         """
@@ -54,7 +57,26 @@ class LinesClient(BaseClient):
         :see: https://developers.hubspot.com/docs/methods/line-items/update-line-item
         """
         data = data or {}
-        return self._call(f"{line_id}", data=data, method="PUT", **options)
+        return self._call(
+            EndpointPath("{line_id}", line_id=line_id),
+            data=data,
+            method="PUT",
+            **options,
+        )
+
+    @staticmethod
+    def _get_all_properties(extra_properties: Union[list, str, None] = None) -> list:
+        """returns the properties to fetch when paging through all line items"""
+        # Default properties to fetch
+        properties = ["name", "price", "quantity"]
+
+        # append extras if they exist
+        if extra_properties:
+            if isinstance(extra_properties, list):
+                properties += extra_properties
+            if isinstance(extra_properties, str):
+                properties.append(extra_properties)
+        return properties
 
     def get_all(
         self,
@@ -76,19 +98,30 @@ class LinesClient(BaseClient):
         :param limit: could be used to prevent to fetch the entire results. Default value is `-1`,
         meaning unlimited.
         """
+        return list(
+            self.iter_all(
+                offset=offset,
+                extra_properties=extra_properties,
+                limit=limit,
+                **options,
+            )
+        )
+
+    def iter_all(
+        self,
+        offset: int = 0,
+        extra_properties: Union[list, str, None] = None,
+        limit: int = -1,
+        **options,
+    ) -> Iterator[Dict]:
+        """
+        Lazily yield all the line items in the Hubspot account, one page at a time.
+        Takes the same arguments as `get_all`.
+        """
         finished = False
-        output = []
+        count = 0
         limited = limit > 0
-
-        # Default properties to fetch
-        properties = ["name", "price", "quantity"]
-
-        # append extras if they exist
-        if extra_properties:
-            if isinstance(extra_properties, list):
-                properties += extra_properties
-            if isinstance(extra_properties, str):
-                properties.append(extra_properties)
+        properties = self._get_all_properties(extra_properties)
 
         while not finished:
             batch = self._call(
@@ -98,18 +131,16 @@ class LinesClient(BaseClient):
                 doseq=True,
                 **options,
             )
-            output.extend(
-                [
-                    prettify(line_item, id_key="objectId")
-                    for line_item in batch["objects"]
-                    if not line_item["isDeleted"]
-                ]
-            )
-            finished = not batch["hasMore"] or (limited and len(output) >= limit)
+            for line_item in batch["objects"]:
+                if line_item["isDeleted"]:
+                    continue
+                yield prettify(line_item, id_key="objectId")
+                count += 1
+                if limited and count >= limit:
+                    return
+            finished = not batch["hasMore"]
             offset = batch["offset"]
 
-        return output if not limited else output[:limit]
-
     def link_line_item_to_deal(self, line_item_id, deal_id) -> Dict:
         """Link a line item to a deal."""
         associations_client = CRMAssociationsClient(**self.credentials)
@@ -0,0 +1,277 @@
+"""
+a local sqlite mirror of hubspot objects, to look them up without a request
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from hubspot3.batching import chunked
+from hubspot3.error import HubspotNotFound
+from hubspot3.pagination import SQLiteCheckpointStore
+from hubspot3.sync import IncrementalSync
+from hubspot3.utils import get_log, prettify
+
+
+def _normalize(value) -> Optional[str]:
+    """emails and domains are looked up case-insensitively"""
+    return value.strip().lower() if isinstance(value, str) and value else None
+
+
+class CRMMirror:
+    """
+    Keeps contacts, companies, deals and owners in an indexed table of a local sqlite
+    database, so that they can be looked up by id, email or domain without a request.
+
+    `sync` pulls the changes since its previous run with an `IncrementalSync`, whose
+    watermarks are kept in the same database: the first run loads all objects through the
+    paginators and later ones only the recently modified objects. Owners have no recently
+    modified endpoint and are always loaded completely, which is cheap. The properties that a
+    change doesn't include keep their stored values.
+
+    The lookups read through: objects that aren't mirrored yet are fetched from HubSpot and
+    stored. Objects deleted in HubSpot stay in the mirror until the next `reload`. The mirror
+    can be shared by threads, the path has to be a file.
+    """
+
+    OBJECT_TYPES = ("contacts", "companies", "deals", "owners")
+    # the number of records written in one transaction
+    chunk_size = 500
+
+    def __init__(self, hubspot, path: str, table: str = "hubspot3_mirror") -> None:
+        self.hubspot = hubspot
+        self.path = path
+        self.table = table
+        self.sync_state = IncrementalSync(
+            hubspot,
+            SQLiteCheckpointStore(path),
+            key_prefix=f"{table}:sync",
+            extra_properties={"contacts": ["email"], "companies": ["domain"]},
+        )
+        self.log = get_log("hubspot3.mirror")
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            # lets other processes read while a sync is writing
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (object_type TEXT NOT NULL, "
+                "id TEXT NOT NULL, email TEXT, domain TEXT, data TEXT NOT NULL, "
+                "synced_at REAL NOT NULL, PRIMARY KEY (object_type, id))"
+            )
+            for column in ("email", "domain"):
+                self._connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_{column} "
+                    f"ON {table} (object_type, {column})"
+                )
+
+    def close(self) -> None:
+        """closes the connection to the database"""
+        self._connection.close()
+
+    def __enter__(self) -> "CRMMirror":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _get_object_types(self, object_types: Optional[Sequence[str]]) -> Sequence[str]:
+        object_types = object_types or self.OBJECT_TYPES
+        for object_type in object_types:
+            if object_type not in self.OBJECT_TYPES:
+                raise ValueError(
+                    f"Unknown object type '{object_type}', "
+                    f"expected one of {self.OBJECT_TYPES}."
+                )
+        return object_types
+
+    def sync(self, object_types: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """
+        stores the objects of the given types (all by default) that changed since the
+        previous sync and returns how many were stored per type
+        """
+        counts = {}
+        for object_type in self._get_object_types(object_types):
+            if object_type == "owners":
+                counts[object_type] = self._reload_owners()
+            else:
+                counts[object_type] = self._store(
+                    object_type, self.sync_state.changes(object_type)
+                )
+            self.log.info(f"Mirrored {counts[object_type]} {object_type}")
+        return counts
+
+    def reload(self, object_types: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """
+        loads all objects of the given types (all by default) again and removes the ones
+        that no longer exist in HubSpot
+        """
+        for object_type in self._get_object_types(object_types):
+            if object_type != "owners":
+                self.sync_state.reset(object_type)
+        started_at = time.time()
+        counts = self.sync(object_types)
+        with self._lock, self._connection:
+            for object_type in counts:
+                self._connection.execute(
+                    f"DELETE FROM {self.table} WHERE object_type = ? AND synced_at < ?",
+                    (object_type, started_at),
+                )
+        return counts
+
+    def _reload_owners(self) -> int:
+        started_at = time.time()
+        count = self._store("owners", self.hubspot.owners.get_owners())
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"DELETE FROM {self.table} WHERE object_type = 'owners' "
+                "AND synced_at < ?",
+                (started_at,),
+            )
+        return count
+
+    def _store(self, object_type: str, records: Iterable[Dict]) -> int:
+        """upserts the records in chunks and returns how many were stored"""
+        count = 0
+        for chunk in chunked(records, self.chunk_size):
+            self._upsert(object_type, chunk)
+            count += len(chunk)
+        return count
+
+    def _upsert(self, object_type: str, records: List[Dict]) -> None:
+        ids = [str(record["id"]) for record in records]
+        synced_at = time.time()
+        with self._lock, self._connection:
+            stored = dict(
+                self._connection.execute(
+                    f"SELECT id, data FROM {self.table} WHERE object_type = ? "
+                    f"AND id IN ({', '.join('?' * len(ids))})",
+                    (object_type, *ids),
+                )
+            )
+            rows = []
+            for record_id, record in zip(ids, records):
+                if record_id in stored:
+                    record = {**json.loads(stored[record_id]), **record}
+                rows.append(
+                    (
+                        object_type,
+                        record_id,
+                        _normalize(record.get("email")),
+                        _normalize(record.get("domain")),
+                        json.dumps(record),
+                        synced_at,
+                    )
+                )
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(object_type, id, email, domain, data, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def find(self, object_type: str, column: str, value) -> List[Dict]:
+        """returns the mirrored objects of the type whose id, email or domain matches"""
+        if column not in ("id", "email", "domain"):
+            raise ValueError(f"Can't look up objects by '{column}'.")
+        value = str(value) if column == "id" else _normalize(value)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT data FROM {self.table} WHERE object_type = ? AND {column} = ?",
+                (object_type, value),
+            ).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def _read_through(
+        self,
+        object_type: str,
+        column: str,
+        value,
+        fetch: Callable[[], List[Dict]],
+    ) -> List[Dict]:
+        """returns the mirrored objects, or fetches and stores them if there are none"""
+        records = self.find(object_type, column, value)
+        if records:
+            return records
+        try:
+            records = [record for record in fetch() if record]
+        except HubspotNotFound:
+            return []
+        if records:
+            self._upsert(object_type, records)
+        return records
+
+    def _get_one(self, object_type: str, column: str, value, fetch) -> Optional[Dict]:
+        records = self._read_through(object_type, column, value, lambda: [fetch()])
+        return records[0] if records else None
+
+    def get_contact(self, contact_id) -> Optional[Dict]:
+        """returns the contact with the given vid, None if it doesn't exist"""
+        return self._get_one(
+            "contacts",
+            "id",
+            contact_id,
+            lambda: prettify(self.hubspot.contacts.get_by_id(contact_id), id_key="vid"),
+        )
+
+    def get_contact_by_email(self, email: str) -> Optional[Dict]:
+        """returns the contact with the given email address, None if it doesn't exist"""
+        return self._get_one(
+            "contacts",
+            "email",
+            email,
+            lambda: prettify(self.hubspot.contacts.get_by_email(email), id_key="vid"),
+        )
+
+    def get_company(self, company_id) -> Optional[Dict]:
+        """returns the company with the given id, None if it doesn't exist"""
+        return self._get_one(
+            "companies",
+            "id",
+            company_id,
+            lambda: prettify(
+                self.hubspot.companies.get(company_id), id_key="companyId"
+            ),
+        )
+
+    def get_companies_by_domain(self, domain: str) -> List[Dict]:
+        """returns the companies with the given domain"""
+        return self._read_through(
+            "companies",
+            "domain",
+            domain,
+            lambda: [
+                prettify(company, id_key="companyId")
+                for company in self.hubspot.companies.search_domain(
+                    domain, limit=100
+                ).get("results", [])
+            ],
+        )
+
+    def get_deal(self, deal_id) -> Optional[Dict]:
+        """returns the deal with the given id, None if it doesn't exist"""
+        return self._get_one(
+            "deals",
+            "id",
+            deal_id,
+            lambda: prettify(self.hubspot.deals.get(deal_id), id_key="dealId"),
+        )
+
+    def get_owner(self, owner_id) -> Optional[Dict]:
+        """returns the owner with the given id, None if it doesn't exist"""
+        return self._get_one(
+            "owners",
+            "id",
+            owner_id,
+            lambda: self.hubspot.owners.get_owner_by_id(owner_id),
+        )
+
+    def get_owner_by_email(self, email: str) -> Optional[Dict]:
+        """returns the owner with the given email address, None if it doesn't exist"""
+        return self._get_one(
+            "owners",
+            "email",
+            email,
+            lambda: self.hubspot.owners.get_owner_by_email(email),
+        )
@@ -5,6 +5,8 @@ hubspot OAuth2 api
 from typing import Optional
 from urllib.parse import urlencode
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
+from hubspot3.token_refresh import record_expiry
 from hubspot3.utils import get_log
 
 
@@ -50,6 +52,8 @@ class OAuth2Client(BaseClient):
         If the value for all optional parameters had to be read from the attributes, the refresh
         token returned from the API will be stored on this client to allow for further
         `refresh_token` calls without having to provide the refresh token.
+        The expiry of the returned access token is remembered, so clients using that token
+        refresh it shortly before it expires.
 
         :see: https://developers.hubspot.com/docs/methods/oauth2/get-access-and-refresh-tokens
         """
@@ -61,6 +65,7 @@ class OAuth2Client(BaseClient):
             "code": authorization_code,
         }
         result = self._call("token", method="POST", data=urlencode(data), **options)
+        record_expiry(result.get("access_token"), result.get("expires_in"))
 
         if not client_id and not client_secret:
             self.refresh_token = result["refresh_token"]
@@ -81,6 +86,8 @@ class OAuth2Client(BaseClient):
         If the value for all optional parameters had to be read from the attributes, the refresh
         token returned from the API will be stored on this client to allow for further
         `refresh_token` calls without having to provide the refresh token.
+        The expiry of the returned access token is remembered, so clients using that token
+        refresh it shortly before it expires.
 
         :see: https://developers.hubspot.com/docs/methods/oauth2/refresh-access-token
         """
@@ -91,6 +98,7 @@ class OAuth2Client(BaseClient):
             "refresh_token": refresh_token or self.refresh_token,
         }
         result = self._call("token", method="POST", data=urlencode(data), **options)
+        record_expiry(result.get("access_token"), result.get("expires_in"))
 
         if not client_id and not client_secret and not refresh_token:
             self.refresh_token = result["refresh_token"]
@@ -102,7 +110,10 @@ class OAuth2Client(BaseClient):
 
         :see: https://developers.hubspot.com/docs/methods/oauth2/get-access-token-information
         """
-        return self._call(f"access-tokens/{access_token}", **options)
+        return self._call(
+            EndpointPath("access-tokens/{access_token}", access_token=access_token),
+            **options,
+        )
 
     def get_refresh_token_data(self, refresh_token: Optional[str] = None, **options):
         """
@@ -114,7 +125,11 @@ class OAuth2Client(BaseClient):
         :see: https://developers.hubspot.com/docs/methods/oauth2/get-refresh-token-information
         """
         return self._call(
-            f"refresh-tokens/{refresh_token or self.refresh_token}", **options
+            EndpointPath(
+                "refresh-tokens/{refresh_token}",
+                refresh_token=refresh_token or self.refresh_token,
+            ),
+            **options,
         )
 
     def delete_refresh_token(self, refresh_token: Optional[str] = None):
@@ -128,6 +143,9 @@ class OAuth2Client(BaseClient):
         :see: https://developers.hubspot.com/docs/methods/oauth2/delete-refresh-token
         """
         return self._call(
-            f"refresh-tokens/{refresh_token or self.refresh_token}",
+            EndpointPath(
+                "refresh-tokens/{refresh_token}",
+                refresh_token=refresh_token or self.refresh_token,
+            ),
             method="DELETE",
         )
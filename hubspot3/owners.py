@@ -2,11 +2,15 @@
 hubspot owners api
 """
 
+from typing import Dict, Iterator, Optional
 from hubspot3.crm_associations import CRMAssociationsClient
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
+from hubspot3.pagination import prefetch
 
 
 OWNERS_API_VERSION = "v3"
+OWNERS_PAGE_LIMIT = 500  # Max value according to docs
 
 
 class OwnersClient(BaseClient):
@@ -19,31 +23,40 @@ class OwnersClient(BaseClient):
         """get the full api url for the given subpath on this client"""
         return f"crm/{OWNERS_API_VERSION}/{subpath}"
 
-    def get_owners(self, **options):
-        """Only returns the list of owners, does not include additional metadata"""
+    def get_owners(self, prefetch_pages: int = 0, **options):
+        """
+        Only returns the list of owners, does not include additional metadata.
+        If `prefetch_pages` is set, up to this many pages are fetched in the background.
+        If `limit` is set, at most this many owners are returned.
+        """
+        limit = options.pop("limit", None)
         owners = []
-        opts = dict(options)
-        more = True
-        while more:
-            data = self._call("owners", **opts)
-            new_owners = data["results"]
-            if "limit" in opts:
-                new_owners = new_owners[: opts["limit"]]
-                opts["limit"] -= len(data["results"])
-                if opts["limit"] < 1:
-                    more = False
+        pages = self._iter_pages(limit, **options)
+        for page in prefetch(pages, prefetch_pages):
+            owners.extend(page["results"])
+            if limit is not None and len(owners) >= limit:
+                break
+        return owners if limit is None else owners[:limit]
 
-            owners.extend(new_owners)
-            if "paging" in data:
-                opts["after"] = data["paging"]["next"]["after"]
-            else:
-                more = False
-        return owners
+    def _iter_pages(self, limit: Optional[int] = None, **options) -> Iterator[Dict]:
+        """yields the raw pages of owners, following the `after` cursor"""
+        params = dict(options.pop("params", None) or {})
+        if limit is not None:
+            params["limit"] = min(limit, OWNERS_PAGE_LIMIT)
+        while True:
+            data = self._call("owners", params=params, **options)
+            yield data
+            after = data.get("paging", {}).get("next", {}).get("after")
+            if not after:
+                return
+            params["after"] = after
 
     def get_owner_name_by_id(self, owner_id: str, **options) -> str:
         """Given an id of an owner, return their name"""
         owner_name = "value_missing"
-        owner = self._call(f"owners/{owner_id}", **options)
+        owner = self._call(
+            EndpointPath("owners/{owner_id}", owner_id=owner_id), **options
+        )
         if owner:
             owner_name = f"{owner['firstName']} {owner['lastName']}"
         return owner_name
@@ -51,14 +64,18 @@ class OwnersClient(BaseClient):
     def get_owner_email_by_id(self, owner_id: str, **options) -> str:
         """given an id of an owner, return their email"""
         owner_email = "value_missing"
-        owner = self._call(f"owners/{owner_id}", **options)
+        owner = self._call(
+            EndpointPath("owners/{owner_id}", owner_id=owner_id), **options
+        )
         if owner:
             owner_email = owner["email"]
         return owner_email
 
     def get_owner_by_id(self, owner_id, **options):
         """Retrieve an owner by its id."""
-        owner = self._call(f"owners/{owner_id}", **options)
+        owner = self._call(
+            EndpointPath("owners/{owner_id}", owner_id=owner_id), **options
+        )
         if owner:
             return owner
         return None
@@ -0,0 +1,200 @@
+"""
+helpers for paginated hubspot endpoints
+"""
+
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+_PAGE, _DONE, _ERROR = range(3)
+
+
+def prefetch(pages: Iterator[T], depth: int = 1) -> Iterator[T]:
+    """
+    iterates the given page iterator in a background thread that runs up to `depth` pages
+    ahead of the consumer, so the request for the next page is already in flight while the
+    current one is being processed. At most `depth` fetched pages are buffered, and with a
+    `depth` of 0 the pages are passed through as they are. Errors raised while fetching a page
+    are re-raised to the consumer when it reaches that page.
+    """
+    if depth < 1:
+        yield from pages
+        return
+
+    buffer = queue.Queue(maxsize=depth)  # type: queue.Queue
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        """puts the item into the buffer unless the consumer went away in the meantime"""
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for page in pages:
+                if not put((_PAGE, page)):
+                    break
+            else:
+                put((_DONE, None))
+        except Exception as exception:
+            put((_ERROR, exception))
+        finally:
+            close = getattr(pages, "close", None)
+            if close is not None:
+                close()
+
+    producer = threading.Thread(target=produce, name="hubspot3-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            kind, item = buffer.get()
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                raise item
+            yield item
+    finally:
+        stopped.set()
+
+
+class FileCheckpointStore:
+    """keeps pagination checkpoints in a local JSON file, keyed by checkpoint key"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, checkpoints: Dict) -> None:
+        # write to a temporary file first, so a crash never leaves a truncated checkpoint
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(checkpoints, file)
+        os.replace(temporary_path, self.path)
+
+    def load(self, key: str) -> Optional[Dict]:
+        """returns the checkpoint stored under the given key, if any"""
+        with self._lock:
+            return self._read().get(key)
+
+    def save(self, key: str, checkpoint: Dict) -> None:
+        """stores the checkpoint under the given key"""
+        with self._lock:
+            checkpoints = self._read()
+            checkpoints[key] = checkpoint
+            self._write(checkpoints)
+
+    def delete(self, key: str) -> None:
+        """removes the checkpoint stored under the given key"""
+        with self._lock:
+            checkpoints = self._read()
+            if checkpoints.pop(key, None) is not None:
+                self._write(checkpoints)
+
+
+class SQLiteCheckpointStore:
+    """keeps pagination checkpoints in a table of a local sqlite database"""
+
+    def __init__(self, path: str, table: str = "hubspot3_checkpoints") -> None:
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, checkpoint TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def load(self, key: str) -> Optional[Dict]:
+        """returns the checkpoint stored under the given key, if any"""
+        with self._lock, closing(self._connect()) as connection:
+            row = connection.execute(
+                f"SELECT checkpoint FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, key: str, checkpoint: Dict) -> None:
+        """stores the checkpoint under the given key"""
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, checkpoint) VALUES (?, ?)",
+                (key, json.dumps(checkpoint)),
+            )
+
+    def delete(self, key: str) -> None:
+        """removes the checkpoint stored under the given key"""
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+
+class Checkpoint:
+    """
+    Tracks the cursor of a paginated export in a checkpoint store, so that an interrupted export
+    can continue where it stopped instead of starting over.
+
+    The checkpoint records the cursor of the next page together with the query that is being
+    paginated. It is saved once all records of a page were consumed and deleted once the export
+    is complete. Without a store, all methods are no-ops.
+    """
+
+    def __init__(self, store, key: Optional[str], query: Dict) -> None:
+        self.store = store
+        serialized_query = json.dumps(query, sort_keys=True, default=str)
+        # the query as it reads back from the store, so it can be compared to saved ones
+        self.query = json.loads(serialized_query)
+        if key is None:
+            digest = hashlib.sha1(serialized_query.encode()).hexdigest()
+            key = f"{query.get('endpoint', 'export')}:{digest}"
+        self.key = key
+
+    def resume(self, cursor: Any) -> Any:
+        """returns the cursor to continue from, or the given initial cursor"""
+        if self.store is None:
+            return cursor
+        checkpoint = self.store.load(self.key)
+        if checkpoint is None:
+            return cursor
+        if checkpoint["query"] != self.query:
+            raise ValueError(
+                f"The checkpoint '{self.key}' was saved for a different query "
+                f"({checkpoint['query']}), delete it to start over."
+            )
+        return checkpoint["cursor"]
+
+    def save(self, cursor: Any) -> None:
+        """records the cursor of the next page"""
+        if self.store is not None:
+            checkpoint = {
+                "cursor": cursor,
+                "query": self.query,
+                "saved_at": time.time(),
+            }
+            self.store.save(self.key, checkpoint)
+
+    def clear(self) -> None:
+        """deletes the checkpoint once the export is complete"""
+        if self.store is not None:
+            self.store.delete(self.key)
@@ -2,8 +2,9 @@
 hubspot products api
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 from hubspot3.utils import prettify, get_log, ordered_dict
 
 
@@ -27,7 +28,7 @@ class ProductsClient(BaseClient):
         """get single product based on product ID in the hubspot account"""
         properties = properties or []
         return self._call(
-            f"objects/products/{product_id}",
+            EndpointPath("objects/products/{product_id}", product_id=product_id),
             method="GET",
             params={"properties": ["name", "description", *properties]},
             doseq=True,
@@ -38,9 +39,16 @@ class ProductsClient(BaseClient):
         self, properties: Optional[List[str]] = None, offset: int = 0, **options
     ):
         """get all products in the hubspot account"""
+        return list(
+            self.iter_all_products(properties=properties, offset=offset, **options)
+        )
+
+    def iter_all_products(
+        self, properties: Optional[List[str]] = None, offset: int = 0, **options
+    ) -> Iterator[Dict]:
+        """lazily yield all products in the hubspot account, one page at a time"""
         properties = properties or []
         finished = False
-        output = []
         querylimit = 100  # Max value according to docs
         while not finished:
             batch = self._call(
@@ -56,18 +64,12 @@ class ProductsClient(BaseClient):
                 doseq=True,
                 **options,
             )
-            output.extend(
-                [
-                    prettify(obj, id_key="objectId")
-                    for obj in batch["objects"]
-                    if not obj["isDeleted"]
-                ]
-            )
+            for obj in batch["objects"]:
+                if not obj["isDeleted"]:
+                    yield prettify(obj, id_key="objectId")
             finished = not batch["hasMore"]
             offset = batch["offset"]
 
-        return output
-
     def _get_path(self, subpath: str):
         return f"crm-objects/v{self.options.get('version') or PRODUCTS_API_VERSION}/{subpath}"
 
@@ -80,9 +82,16 @@ class ProductsClient(BaseClient):
         """Update a product based on its product ID."""
         data = data or {}
         return self._call(
-            f"objects/products/{product_id}", data=data, method="PUT", **options
+            EndpointPath("objects/products/{product_id}", product_id=product_id),
+            data=data,
+            method="PUT",
+            **options,
         )
 
     def delete(self, product_id: str, **options):
         """Delete a product based on its product ID."""
-        return self._call(f"objects/products/{product_id}", method="DELETE", **options)
+        return self._call(
+            EndpointPath("objects/products/{product_id}", product_id=product_id),
+            method="DELETE",
+            **options,
+        )
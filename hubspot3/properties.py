@@ -2,7 +2,7 @@
 hubspot properties api
 """
 
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 from hubspot3.base import BaseClient
 from hubspot3.globals import (
     OBJECT_TYPE_COMPANIES,
@@ -14,6 +14,9 @@ from hubspot3.globals import (
     VALID_PROPERTY_WIDGET_TYPES,
     DATA_TYPE_ENUM,
 )
+from hubspot3.instrumentation import EndpointPath
+from hubspot3.property_groups import PropertyGroupsClient
+from hubspot3.schema_cache import SchemaCache
 from hubspot3.utils import get_log
 
 
@@ -75,6 +78,66 @@ class PropertiesClient(BaseClient):
                 )
             )
 
+    def _validate_schema(
+        self, object_type: str, code: str, group_code: Optional[str], exists: bool
+    ) -> None:
+        """
+        checks that the property does or doesn't exist yet and that its group exists, if the
+        schemas are in the `schema_cache`. They aren't fetched for calls that pass the check,
+        but as the cached ones may be outdated, they are fetched again before a call is
+        rejected.
+        """
+        cache = self.options.get("schema_cache")
+        if cache is None:
+            return
+        error = self._get_schema_error(
+            cache.peek(SchemaCache.PROPERTIES, object_type),
+            cache.peek(SchemaCache.GROUPS, object_type),
+            object_type,
+            code,
+            group_code,
+            exists,
+        )
+        if error is None:
+            return
+        cache.invalidate(object_type=object_type)
+        error = self._get_schema_error(
+            self.get_all(object_type),
+            self._get_sibling_client(PropertyGroupsClient).get_all(object_type),
+            object_type,
+            code,
+            group_code,
+            exists,
+        )
+        if error is not None:
+            raise ValueError(error)
+
+    @staticmethod
+    def _get_schema_error(
+        properties: Optional[List[Dict]],
+        groups: Optional[List[Dict]],
+        object_type: str,
+        code: str,
+        group_code: Optional[str],
+        exists: bool,
+    ) -> Optional[str]:
+        """returns why the property doesn't match the given schemas, if it doesn't"""
+        if properties is not None:
+            found = any(prop["name"] == code for prop in properties)
+            if found and not exists:
+                return f"The {object_type} property '{code}' already exists."
+            if exists and not found:
+                return f"Unknown {object_type} property '{code}'."
+        if group_code and groups is not None:
+            if all(group["name"] != group_code for group in groups):
+                return f"Unknown {object_type} property group '{group_code}'."
+        return None
+
+    def _invalidate_schema(self, object_type: str) -> None:
+        cache = self.options.get("schema_cache")
+        if cache is not None:
+            cache.invalidate(SchemaCache.PROPERTIES, object_type)
+
     def create(
         self,
         object_type: str,
@@ -92,23 +155,27 @@ class PropertiesClient(BaseClient):
         extra_params = extra_params or {}
 
         self._validate(data_type, widget_type, extra_params)
+        self._validate_schema(object_type, code, group_code, exists=False)
 
         # Save the current object type.
         self._object_type = object_type
 
-        return self._call(
-            "",
-            method="POST",
-            data={
-                "name": code,
-                "label": label,
-                "description": description,
-                "groupName": group_code,
-                "type": data_type,
-                "fieldType": widget_type,
-                **extra_params,
-            },
-        )
+        try:
+            return self._call(
+                "",
+                method="POST",
+                data={
+                    "name": code,
+                    "label": label,
+                    "description": description,
+                    "groupName": group_code,
+                    "type": data_type,
+                    "fieldType": widget_type,
+                    **extra_params,
+                },
+            )
+        finally:
+            self._invalidate_schema(object_type)
 
     def update(
         self,
@@ -128,6 +195,7 @@ class PropertiesClient(BaseClient):
         extra_params = extra_params or {}
 
         self._validate(data_type, widget_type, extra_params)
+        self._validate_schema(object_type, code, group_code, exists=True)
 
         # Save the current object type.
         self._object_type = object_type
@@ -142,11 +210,35 @@ class PropertiesClient(BaseClient):
         }
         data = {key: value for key, value in fields.items() if value is not None}
 
-        return self._call(f"named/{code}", method="PUT", data=data)
+        try:
+            return self._call(
+                EndpointPath("named/{code}", code=code), method="PUT", data=data
+            )
+        finally:
+            self._invalidate_schema(object_type)
 
     def get_all(self, object_type):
-        """Retrieve all the custom properties."""
+        """
+        Retrieve all the custom properties. They are only fetched once per ttl if a
+        `schema_cache` is configured.
+        """
+        cache = self.options.get("schema_cache")
+        if cache is None:
+            return self._get_all(object_type)
+        return cache.get(
+            SchemaCache.PROPERTIES, object_type, lambda: self._get_all(object_type)
+        )
+
+    def filter_existing(self, object_type: str, names: Iterable[str]) -> List[str]:
+        """
+        Returns the given property names that exist for the object type, in their order, to
+        only request properties that exist. With a `schema_cache`, no request is needed while
+        the properties are cached.
+        """
+        existing = {prop["name"] for prop in self.get_all(object_type)}
+        return [name for name in names if name in existing]
 
+    def _get_all(self, object_type):
         # Save the current object type.
         self._object_type = object_type
 
@@ -160,7 +252,7 @@ class PropertiesClient(BaseClient):
         # Save the current object type.
         self._object_type = object_type
 
-        return self._call(f"named/{code}", method="GET")
+        return self._call(EndpointPath("named/{code}", code=code), method="GET")
 
     def delete(self, object_type, code):
         """Delete a custom property."""
@@ -168,7 +260,10 @@ class PropertiesClient(BaseClient):
         # Save the current object type.
         self._object_type = object_type
 
-        return self._call(f"named/{code}", method="DELETE")
+        try:
+            return self._call(EndpointPath("named/{code}", code=code), method="DELETE")
+        finally:
+            self._invalidate_schema(object_type)
 
     def delete_all(self, object_type):
         """Delete all the custom properties. Please use it carefully."""
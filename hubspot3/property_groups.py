@@ -10,6 +10,8 @@ from hubspot3.globals import (
     OBJECT_TYPE_LINE_ITEMS,
     OBJECT_TYPE_PRODUCTS,
 )
+from hubspot3.instrumentation import EndpointPath
+from hubspot3.schema_cache import SchemaCache
 from hubspot3.utils import get_log
 
 PROPERTY_GROUPS_API_VERSION = {
@@ -41,16 +43,36 @@ class PropertyGroupsClient(BaseClient):
             f"/{self._object_type}/groups/{subpath}"
         )
 
+    def _invalidate_schema(self, object_type, *kinds):
+        cache = self.options.get("schema_cache")
+        if cache is not None:
+            for kind in kinds:
+                cache.invalidate(kind, object_type)
+
     def create(self, object_type, code, label, extra_params=None):
         self._object_type = object_type
 
         extra_params = extra_params or {}
 
-        return self._call(
-            "", method="POST", data={"name": code, "displayName": label, **extra_params}
-        )
+        try:
+            return self._call(
+                "",
+                method="POST",
+                data={"name": code, "displayName": label, **extra_params},
+            )
+        finally:
+            self._invalidate_schema(object_type, SchemaCache.GROUPS)
 
     def get_all(self, object_type):
+        """the groups are only fetched once per ttl if a `schema_cache` is configured"""
+        cache = self.options.get("schema_cache")
+        if cache is None:
+            return self._get_all(object_type)
+        return cache.get(
+            SchemaCache.GROUPS, object_type, lambda: self._get_all(object_type)
+        )
+
+    def _get_all(self, object_type):
         self._object_type = object_type
 
         return self._call("", method="GET")
@@ -58,7 +80,13 @@ class PropertyGroupsClient(BaseClient):
     def delete(self, object_type, code):
         self._object_type = object_type
 
-        return self._call(f"named/{code}", method="DELETE")
+        try:
+            return self._call(EndpointPath("named/{code}", code=code), method="DELETE")
+        finally:
+            # the properties of a deleted group change as well
+            self._invalidate_schema(
+                object_type, SchemaCache.GROUPS, SchemaCache.PROPERTIES
+            )
 
     def delete_all_custom(self, object_type):
         groups_data = self.get_all(object_type)
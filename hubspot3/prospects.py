@@ -3,6 +3,7 @@ hubspot prospects client
 """
 
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 
 
 PROSPECTS_API_VERSION = "v1"
@@ -40,7 +41,9 @@ class ProspectsClient(BaseClient):
 
     def get_company(self, company_slug):
         """Return the specific named organization for the given API key, if we find a match."""
-        return self._call(f"timeline/{company_slug}")
+        return self._call(
+            EndpointPath("timeline/{company_slug}", company_slug=company_slug)
+        )
 
     def get_options_for_query(self, query):
         """This method allows for discovery of prospects with partial names."""
@@ -0,0 +1,247 @@
+"""
+client-side rate limiting for hubspot3 clients
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional, Tuple
+from hubspot3.error import HubspotRateLimited
+
+
+class MemoryBackend:
+    """keeps the rate limiter state in memory, shared by all threads of a process"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state = {}  # type: Dict
+
+    @contextmanager
+    def state(self) -> Iterator[Dict]:
+        """yields the mutable limiter state while holding an exclusive lock"""
+        with self._lock:
+            yield self._state
+
+
+class FileBackend:
+    """
+    keeps the rate limiter state in a JSON file guarded by an advisory file lock, so that
+    multiple processes on the same host can share one limiter (POSIX only)
+    """
+
+    def __init__(self, path: str) -> None:
+        import fcntl
+
+        self._fcntl = fcntl
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def state(self) -> Iterator[Dict]:
+        """yields the mutable limiter state while holding an exclusive lock"""
+        with self._lock, open(self.path, "a+", encoding="utf-8") as file:
+            self._fcntl.flock(file, self._fcntl.LOCK_EX)
+            try:
+                file.seek(0)
+                content = file.read()
+                state = json.loads(content) if content else {}
+                yield state
+                file.seek(0)
+                file.truncate()
+                json.dump(state, file)
+                file.flush()
+            finally:
+                self._fcntl.flock(file, self._fcntl.LOCK_UN)
+
+
+class RedisBackend:
+    """
+    keeps the rate limiter state in redis, so that processes on multiple hosts can share one
+    limiter. Accepts a `redis.Redis` instance or any stand-in offering `get`, `set` and `lock`.
+    """
+
+    def __init__(
+        self, client, key: str = "hubspot3:rate_limiter", lock_timeout: int = 5
+    ) -> None:
+        self.client = client
+        self.key = key
+        self.lock_timeout = lock_timeout
+
+    @contextmanager
+    def state(self) -> Iterator[Dict]:
+        """yields the mutable limiter state while holding an exclusive lock"""
+        with self.client.lock(f"{self.key}:lock", timeout=self.lock_timeout):
+            content = self.client.get(self.key)
+            state = json.loads(content) if content else {}
+            yield state
+            self.client.set(self.key, json.dumps(state))
+
+
+class RateLimiter:
+    """
+    A token bucket rate limiter honoring HubSpot's burst and daily limits.
+
+    Every request reserves one token from each burst bucket. If a bucket is empty, the caller is
+    told how long to wait until its token becomes available, so concurrent callers are spread out
+    evenly instead of being rejected by HubSpot with a 429. The daily budget is unknown until it
+    is fed through `update_daily_budget` (the Hubspot3 client does this whenever its
+    `usage_limits` are fetched); once it is exhausted, requests fail fast until the reset.
+    :see: https://developers.hubspot.com/docs/api/usage-details
+    """
+
+    def __init__(
+        self,
+        per_second: Optional[int] = 10,
+        per_ten_seconds: Optional[int] = 100,
+        backend=None,
+    ) -> None:
+        self.buckets = {}  # type: Dict[str, Tuple[int, float]]
+        if per_second:
+            self.buckets["second"] = (per_second, 1.0)
+        if per_ten_seconds:
+            self.buckets["ten_seconds"] = (per_ten_seconds, 10.0)
+        self.backend = backend or MemoryBackend()
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        reserves tokens for a request and returns the number of seconds the caller has to wait
+        before sending it. Raises HubspotRateLimited if the daily budget is exhausted.
+        """
+        now = time.time()
+        with self.backend.state() as state:
+            daily = state.get("daily")
+            if daily:
+                remaining, resets_at = daily
+                if now >= resets_at:
+                    state["daily"] = None
+                elif remaining < tokens:
+                    raise HubspotRateLimited(
+                        None,
+                        None,
+                        "The daily API call budget is exhausted, it resets in "
+                        f"{int(resets_at - now)}s.",
+                    )
+                else:
+                    state["daily"] = [remaining - tokens, resets_at]
+
+            delay = 0.0
+            for name, (capacity, interval) in self.buckets.items():
+                rate = capacity / interval
+                level, updated_at = state.get(name) or (capacity, now)
+                # reservations may push the level below zero, which queues up later callers
+                level = min(capacity, level + (now - updated_at) * rate) - tokens
+                state[name] = [level, now]
+                if level < 0:
+                    delay = max(delay, -level / rate)
+        return delay
+
+    def acquire(self, tokens: int = 1) -> None:
+        """blocks until the given number of tokens is available"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    def update_daily_budget(self, calls_remaining: int, resets_at: float) -> None:
+        """
+        sets the remaining daily budget and the unix timestamp at which it resets.
+        :see: Hubspot3.usage_limits
+        """
+        with self.backend.state() as state:
+            state["daily"] = [calls_remaining, resets_at]
+
+
+class RateLimitState:
+    """
+    The rate limit information HubSpot reported with a response.
+    :see: https://developers.hubspot.com/docs/api/usage-details#rate-limits
+    """
+
+    def __init__(
+        self,
+        max_requests: Optional[int] = None,
+        remaining: Optional[int] = None,
+        interval_milliseconds: Optional[int] = None,
+        daily: Optional[int] = None,
+        daily_remaining: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        collected_at: Optional[float] = None,
+    ) -> None:
+        self.max_requests = max_requests
+        self.remaining = remaining
+        self.interval_milliseconds = interval_milliseconds
+        self.daily = daily
+        self.daily_remaining = daily_remaining
+        self.retry_after = retry_after
+        self.collected_at = collected_at or time.time()
+
+    def __repr__(self) -> str:
+        return (
+            f"<RateLimitState: {self.remaining}/{self.max_requests} per "
+            f"{self.interval_milliseconds}ms, daily {self.daily_remaining}/{self.daily}, "
+            f"retry after {self.retry_after}s>"
+        )
+
+    @classmethod
+    def from_headers(cls, headers: Dict[str, str]) -> Optional["RateLimitState"]:
+        """
+        parses the rate limit headers of a response (with lowercased header names).
+        returns None if the response did not contain any rate limit information.
+        """
+
+        def number(name: str) -> Optional[int]:
+            try:
+                return int(headers[name])
+            except (KeyError, TypeError, ValueError):
+                return None
+
+        state = cls(
+            max_requests=number("x-hubspot-ratelimit-max"),
+            remaining=number("x-hubspot-ratelimit-remaining"),
+            interval_milliseconds=number("x-hubspot-ratelimit-interval-milliseconds"),
+            daily=number("x-hubspot-ratelimit-daily"),
+            daily_remaining=number("x-hubspot-ratelimit-daily-remaining"),
+            retry_after=_parse_retry_after(headers.get("retry-after")),
+        )
+        if all(
+            value is None
+            for value in (
+                state.max_requests,
+                state.remaining,
+                state.interval_milliseconds,
+                state.daily_remaining,
+                state.retry_after,
+            )
+        ):
+            return None
+        return state
+
+    @property
+    def wait_time(self) -> float:
+        """
+        returns the number of seconds until another request can be expected to succeed:
+        the `Retry-After` delay if given, otherwise the rest of the current interval if its
+        budget is used up, otherwise 0.
+        """
+        elapsed = time.time() - self.collected_at
+        if self.retry_after is not None:
+            return max(0.0, self.retry_after - elapsed)
+        if self.remaining == 0 and self.interval_milliseconds:
+            return max(0.0, self.interval_milliseconds / 1000 - elapsed)
+        return 0.0
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """parses a Retry-After header given either in seconds or as an HTTP date"""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,70 @@
+"""
+a cache for the property and property group schemas of hubspot objects
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class SchemaCache:
+    """
+    Keeps the responses of `PropertiesClient.get_all` and `PropertyGroupsClient.get_all` per
+    object type for `ttl` seconds. Pass it to clients as their `schema_cache` option; clients
+    created by one `Hubspot3` instance share it. The writes of these clients invalidate the
+    schemas they change, other changes become visible once the ttl expired or after
+    `invalidate`.
+
+    Concurrent lookups of a missing schema load it only once. The cached schemas are shared,
+    so they must not be modified.
+    """
+
+    PROPERTIES = "properties"
+    GROUPS = "groups"
+
+    def __init__(self, ttl: float = 300) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # the schema and until when to use it per (kind, object type)
+        self._entries = {}  # type: Dict[Tuple[str, str], Tuple[Any, float]]
+        # bumped by every invalidation, so loads that overlap with one aren't stored
+        self._generations = {}  # type: Dict[Tuple[str, str], int]
+        self._load_locks = {}  # type: Dict[Tuple[str, str], threading.Lock]
+
+    def peek(self, kind: str, object_type: str) -> Optional[Any]:
+        """returns the cached schema, or None if it isn't cached or expired"""
+        entry = self._entries.get((kind, object_type))
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def get(self, kind: str, object_type: str, load: Callable[[], Any]) -> Any:
+        """returns the cached schema, calling `load` to fetch it if necessary"""
+        schema = self.peek(kind, object_type)
+        if schema is not None:
+            return schema
+        key = (kind, object_type)
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            schema = self.peek(kind, object_type)
+            if schema is not None:
+                return schema
+            generation = self._generations.get(key, 0)
+            schema = load()
+            with self._lock:
+                if self._generations.get(key, 0) == generation:
+                    self._entries[key] = (schema, time.monotonic() + self.ttl)
+        return schema
+
+    def invalidate(
+        self, kind: Optional[str] = None, object_type: Optional[str] = None
+    ) -> None:
+        """forgets the cached schemas of the given kind and object type, all by default"""
+        kinds = (kind,) if kind else (self.PROPERTIES, self.GROUPS)
+        with self._lock:
+            # schemas that are being loaded have a load lock, but no entry yet
+            for key in set(self._entries) | set(self._load_locks):
+                if key[0] in kinds and object_type in (None, key[1]):
+                    self._entries.pop(key, None)
+                    self._generations[key] = self._generations.get(key, 0) + 1
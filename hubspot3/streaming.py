@@ -0,0 +1,192 @@
+"""
+incremental parsing of large JSON responses, so their records can be processed while the
+rest of the body is still being received
+"""
+
+import codecs
+import json
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional
+
+
+_WHITESPACE = " \t\n\r"
+
+
+class _NeedMoreData(Exception):
+    """the buffered part of the document ends in the middle of a value"""
+
+
+class JSONArrayStream:
+    """
+    Parses a JSON object from an iterable of byte chunks while the chunks arrive, like a page
+    of one of HubSpot's list endpoints. Iterating over it yields the items of the array under
+    `items_key` (e.g. `results`, `objects` or `contacts`) one at a time, so only the item that
+    is currently being parsed is buffered instead of the whole body.
+
+    The other top-level values are available by subscription, e.g. `page["hasMore"]`. As they
+    are usually sent after the array, looking one of them up before the items were consumed
+    parses the rest of the body and keeps the remaining items in memory until they are
+    consumed. `page[items_key]` returns the stream itself, so a stream can be used in place of
+    a decoded page.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], items_key: str) -> None:
+        self.items_key = items_key
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")("ignore")
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._exhausted = False
+        self._state = "start"
+        self._key = None  # type: Optional[str]
+        self._document = {}  # type: Dict[str, Any]
+        self._pending = deque()  # type: Deque[Any]
+
+    def __repr__(self) -> str:
+        return f"<JSONArrayStream: {self.items_key}>"
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        if self._pending or self._parse_next():
+            return self._pending.popleft()
+        raise StopIteration
+
+    def __getitem__(self, key: str) -> Any:
+        if key == self.items_key:
+            return self
+        while key not in self._document and self._parse_next():
+            pass
+        return self._document[key]
+
+    def __enter__(self) -> "JSONArrayStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def close(self) -> None:
+        """stops reading the body, e.g. when the remaining items are not needed anymore"""
+        close = getattr(self._chunks, "close", None)
+        if close:
+            close()
+
+    def _read_chunk(self) -> None:
+        """appends the next chunk to the buffer, dropping the part that was parsed already"""
+        text = ""
+        while not text:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._exhausted = True
+                text = self._text_decoder.decode(b"", final=True)
+                break
+            text = self._text_decoder.decode(chunk)
+        self._buffer = self._buffer[self._position :] + text
+        self._position = 0
+
+    def _parse_next(self) -> bool:
+        """
+        parses the document up to the next item of the array and appends it to the pending
+        items, returns False once the whole document was parsed
+        """
+        while self._state != "done":
+            try:
+                if self._advance():
+                    return True
+            except _NeedMoreData:
+                if self._exhausted:
+                    raise json.JSONDecodeError(
+                        "Unexpected end of document", self._buffer, len(self._buffer)
+                    )
+                self._read_chunk()
+        return False
+
+    def _skip_whitespace(self, position: int) -> int:
+        """returns the position of the next non-whitespace character"""
+        buffer = self._buffer
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        if position == len(buffer):
+            raise _NeedMoreData()
+        return position
+
+    def _expect(self, position: int, character: str) -> int:
+        position = self._skip_whitespace(position)
+        if self._buffer[position] != character:
+            raise json.JSONDecodeError(
+                f"Expecting '{character}'", self._buffer, position
+            )
+        return position + 1
+
+    def _decode(self, position: int):
+        """decodes the value at the given position and returns it and the position after it"""
+        try:
+            value, end = self._json_decoder.raw_decode(self._buffer, position)
+        except json.JSONDecodeError:
+            if self._exhausted:
+                raise
+            raise _NeedMoreData()
+        # a number at the end of the buffer might continue in the next chunk
+        if end == len(self._buffer) and not self._exhausted:
+            raise _NeedMoreData()
+        return value, end
+
+    def _advance(self) -> bool:
+        """
+        parses the next token of the document, returns True if it was an item of the array.
+        The position only moves once a token was parsed completely, so parsing can simply be
+        repeated with more data whenever _NeedMoreData is raised.
+        """
+        position = self._position
+        if self._state == "start":
+            self._position = self._expect(position, "{")
+            self._state = "key"
+        elif self._state == "key":
+            position = self._skip_whitespace(position)
+            if self._buffer[position] == ",":
+                position = self._skip_whitespace(position + 1)
+            if self._buffer[position] == "}":
+                self._position = position + 1
+                self._state = "done"
+                self._finish()
+                return False
+            key, position = self._decode(position)
+            self._position = self._expect(position, ":")
+            self._key = key
+            self._state = "value"
+        elif self._state == "value":
+            position = self._skip_whitespace(position)
+            if self._key == self.items_key and self._buffer[position] == "[":
+                self._position = position + 1
+                self._state = "items"
+            else:
+                self._document[self._key], self._position = self._decode(position)
+                self._state = "key"
+        elif self._state == "items":
+            position = self._skip_whitespace(position)
+            if self._buffer[position] == ",":
+                position = self._skip_whitespace(position + 1)
+            if self._buffer[position] == "]":
+                self._position = position + 1
+                self._state = "key"
+                return False
+            item, self._position = self._decode(position)
+            self._pending.append(item)
+            return True
+        return False
+
+    def _finish(self) -> None:
+        """reads the rest of the body, so the connection it was received on can be reused"""
+        while not self._exhausted:
+            self._read_chunk()
+        if self._buffer[self._position :].strip(_WHITESPACE):
+            raise json.JSONDecodeError("Extra data", self._buffer, self._position)
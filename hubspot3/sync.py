@@ -0,0 +1,209 @@
+"""
+incremental synchronization of hubspot objects via their recently modified endpoints
+"""
+
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from hubspot3.utils import get_log, prettify
+
+
+class SyncSource(NamedTuple):
+    """how to pull the changes of one object type"""
+
+    # yields the records modified since the given timestamp (in milliseconds)
+    recent: Callable[[int], Iterator[Dict]]
+    # yields all records of the object type
+    full_scan: Callable[[], Iterator[Dict]]
+    # returns the id and the last modification timestamp (in milliseconds) of a record
+    identify: Callable[[Dict], Tuple[str, int]]
+    # whether `recent` yields the most recently modified records first and ignores `since`
+    newest_first: bool = False
+
+
+def _timestamp(value) -> int:
+    """converts a hubspot timestamp property value to milliseconds, 0 if it is missing"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class IncrementalSync:
+    """
+    Pulls only the records that changed since the previous run of a job.
+
+    For each object type (contacts, companies, deals and engagements), a high-water mark is kept
+    in a store from `hubspot3.pagination`: the last modification timestamp of the newest record
+    that was emitted, plus the ids of all records modified at exactly that millisecond as a
+    tie-breaker. A run emits the records of the recently modified endpoint that are newer than
+    the mark, each record only once even if it shows up in overlapping pages. As HubSpot only
+    keeps the last 30 days or 10k records in that window, a run falls back to a full scan
+    whenever the window could not cover all changes since the mark, and on the very first run.
+
+    The new mark is only saved once all changes were consumed, so a run that stops early is
+    repeated by the next one. `extra_properties` maps object types to additional properties to
+    request for their records, both in the recent window and in full scans.
+    :see: https://developers.hubspot.com/docs/methods/deals/get_deals_modified
+    """
+
+    OBJECT_TYPES = ("contacts", "companies", "deals", "engagements")
+    window_size = 10000
+    window_age = 30 * 24 * 60 * 60 * 1000
+
+    def __init__(
+        self,
+        hubspot,
+        store,
+        key_prefix: str = "hubspot3:sync",
+        extra_properties: Optional[Dict[str, List[str]]] = None,
+    ) -> None:
+        self.hubspot = hubspot
+        self.store = store
+        self.key_prefix = key_prefix
+        self.extra_properties = extra_properties or {}
+        self.log = get_log("hubspot3.sync")
+
+    def _get_key(self, object_type: str) -> str:
+        return f"{self.key_prefix}:{object_type}"
+
+    def _get_properties(self, object_type: str, modified_property: str) -> List[str]:
+        return [modified_property, *self.extra_properties.get(object_type, [])]
+
+    def get_source(self, object_type: str) -> SyncSource:
+        """returns how to pull the changes of the given object type"""
+        if object_type == "contacts":
+            contacts = self.hubspot.contacts
+            properties = self._get_properties(object_type, "lastmodifieddate")
+            # the recent contacts only have a few properties unless some are requested
+            recent_options = (
+                {"extra_properties": properties}
+                if object_type in self.extra_properties
+                else {}
+            )
+            return SyncSource(
+                recent=lambda since: (
+                    prettify(contact, id_key="vid")
+                    for contact in contacts.iter_recently_modified(**recent_options)
+                ),
+                full_scan=lambda: contacts.iter_all(extra_properties=properties),
+                identify=lambda contact: (
+                    contact["id"],
+                    _timestamp(contact.get("lastmodifieddate")),
+                ),
+                newest_first=True,
+            )
+        if object_type == "companies":
+            companies = self.hubspot.companies
+            return SyncSource(
+                recent=lambda since: companies.iter_recently_modified(since=since),
+                full_scan=lambda: companies.iter_all(
+                    extra_properties=self._get_properties(
+                        object_type, "hs_lastmodifieddate"
+                    )
+                ),
+                identify=lambda company: (
+                    company["id"],
+                    _timestamp(company.get("hs_lastmodifieddate")),
+                ),
+            )
+        if object_type == "deals":
+            deals = self.hubspot.deals
+            return SyncSource(
+                recent=lambda since: deals.iter_recently_modified(
+                    limit=self.window_size, since=since
+                ),
+                full_scan=lambda: deals.iter_all(
+                    extra_properties=self._get_properties(
+                        object_type, "hs_lastmodifieddate"
+                    )
+                ),
+                identify=lambda deal: (
+                    deal["id"],
+                    _timestamp(deal.get("hs_lastmodifieddate")),
+                ),
+            )
+        if object_type == "engagements":
+            engagements = self.hubspot.engagements
+            return SyncSource(
+                recent=lambda since: engagements.iter_recently_modified(since),
+                full_scan=engagements.iter_all,
+                identify=lambda engagement: (
+                    engagement["engagement"]["id"],
+                    _timestamp(engagement["engagement"].get("lastUpdated")),
+                ),
+            )
+        raise ValueError(
+            f"Unknown object type '{object_type}', expected one of {self.OBJECT_TYPES}."
+        )
+
+    def get_watermark(self, object_type: str) -> Optional[Dict]:
+        """returns the high-water mark of the given object type, None before the first run"""
+        return self.store.load(self._get_key(object_type))
+
+    def reset(self, object_type: str) -> None:
+        """forgets the high-water mark, so the next run does a full scan again"""
+        self.store.delete(self._get_key(object_type))
+
+    def changes(self, object_type: str) -> Iterator[Dict]:
+        """lazily yield the records of the given object type that changed since the last run"""
+        source = self.get_source(object_type)
+        watermark = self.get_watermark(object_type)
+        started_at = int(time.time() * 1000)
+        emitted = set()
+
+        if watermark is None:
+            self.log.info(f"No watermark for {object_type} yet, doing a full scan")
+        elif started_at - watermark["timestamp"] >= self.window_age:
+            self.log.info(
+                f"Watermark for {object_type} is older than the recent window, "
+                "doing a full scan"
+            )
+        else:
+            new_watermark = yield from self._emit_recent(source, watermark, emitted)
+            if new_watermark is not None:
+                self.store.save(self._get_key(object_type), new_watermark)
+                return
+            self.log.info(
+                f"Too many {object_type} changed for the recent window, "
+                "falling back to a full scan"
+            )
+
+        for record in source.full_scan():
+            record_id, _ = source.identify(record)
+            if record_id in emitted:
+                continue
+            emitted.add(record_id)
+            yield record
+        # changes made while scanning are picked up by the next run
+        self.store.save(
+            self._get_key(object_type), {"timestamp": started_at, "ids": []}
+        )
+
+    def _emit_recent(self, source: SyncSource, watermark: Dict, emitted: set):
+        """
+        yields the records of the recent window that are newer than the watermark and returns
+        the new watermark, or None if the window overflowed
+        """
+        since = watermark["timestamp"]
+        already_emitted = set(watermark["ids"])
+        new_watermark = {"timestamp": since, "ids": list(watermark["ids"])}
+
+        for count, record in enumerate(source.recent(since), start=1):
+            if count >= self.window_size:
+                return None
+            record_id, modified_at = source.identify(record)
+            if modified_at < since:
+                if source.newest_first:
+                    break
+                continue
+            if modified_at == since and record_id in already_emitted:
+                continue
+            if record_id in emitted:
+                continue
+            emitted.add(record_id)
+            if modified_at > new_watermark["timestamp"]:
+                new_watermark = {"timestamp": modified_at, "ids": [record_id]}
+            elif modified_at == new_watermark["timestamp"]:
+                new_watermark["ids"].append(record_id)
+            yield record
+        return new_watermark
@@ -0,0 +1,370 @@
+"""
+a local stand-in for the HubSpot API, serving realistic paged responses over real sockets
+"""
+
+import gzip
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from hubspot3.crm_associations import BATCH_READ_OBJECT_TYPES, Definitions
+
+
+PROPERTIES = (
+    "name",
+    "domain",
+    "city",
+    "country",
+    "industry",
+    "hubspot_owner_id",
+    "hs_lastmodifieddate",
+    "createdate",
+)
+CONTACT_PROPERTIES = (
+    "email",
+    "firstname",
+    "lastname",
+    "company",
+    "website",
+    "phone",
+    "city",
+    "state",
+    "zip",
+    "associatedcompanyid",
+    "lastmodifieddate",
+)
+
+
+def _property(name: str, value, index: int, with_history: bool = False) -> Dict:
+    prop = {
+        "value": value,
+        "timestamp": 1600000000000 + index,
+        "source": "CRM_UI",
+        "sourceId": "user@example.com",
+    }
+    if with_history:
+        prop["versions"] = [{"name": name, **prop}]
+    return prop
+
+
+def make_company(index: int) -> Dict:
+    return {
+        "companyId": 1000000 + index,
+        "isDeleted": False,
+        "portalId": 62515,
+        "properties": {
+            name: _property(name, f"{name} {index} – ünïcödé", index, True)
+            for name in PROPERTIES
+        },
+        "mergeAudits": [],
+    }
+
+
+def make_deal(index: int) -> Dict:
+    return {
+        "dealId": 2000000 + index,
+        "isDeleted": False,
+        "portalId": 62515,
+        "properties": {
+            name: _property(name, f"{name} {index}", index)
+            for name in PROPERTIES + ("dealname", "amount", "dealstage", "pipeline")
+        },
+        "associations": {
+            "associatedVids": [3000000 + index],
+            "associatedCompanyIds": [1000000 + index],
+            "associatedDealIds": [],
+        },
+    }
+
+
+def make_contact(index: int) -> Dict:
+    vid = 3000000 + index
+    return {
+        "vid": vid,
+        "canonical-vid": vid,
+        "merged-vids": [],
+        "portal-id": 62515,
+        "is-contact": True,
+        "properties": {
+            name: {"value": f"{name} {index}"} for name in CONTACT_PROPERTIES
+        },
+        "identity-profiles": [
+            {
+                "vid": vid,
+                "identities": [
+                    {"type": "EMAIL", "value": f"contact{index}@example.com"}
+                ],
+            }
+        ],
+    }
+
+
+def make_ticket(index: int) -> Dict:
+    return {
+        "objectType": "TICKET",
+        "portalId": 62515,
+        "objectId": 4000000 + index,
+        "properties": {
+            name: {
+                "versions": [_property(name, f"{name} {index}", index)],
+                "value": f"{name} {index}",
+                "timestamp": 1600000000000 + index,
+                "source": "CRM_UI",
+            }
+            for name in ("subject", "content", "hs_pipeline", "hs_pipeline_stage")
+        },
+        "isDeleted": False,
+    }
+
+
+def _int(params: Dict[str, List[str]], name: str, default: int) -> int:
+    try:
+        return int(params[name][0])
+    except (KeyError, IndexError, ValueError):
+        return default
+
+
+class MockHubspot:
+    """
+    A threaded HTTP/1.1 server with keep-alive that answers the paged endpoints of contacts,
+    companies, deals, tickets and CRM associations with `records` generated records each, the
+    contact batch endpoints, the association batch endpoints and the ecommerce bridge sync
+    endpoint.
+
+    Every response is delayed by `latency` seconds. A share of `error_rate` requests fails with
+    a 502 and a share of `rate_limit_rate` with a 429 that asks to retry after `retry_after`
+    seconds. Bodies are gzipped if the client accepts it and `gzip` is set. Use it as a
+    context manager and pass `url` as the `api_base` of the clients.
+    """
+
+    def __init__(
+        self,
+        records: int = 1000,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: int = 0,
+        gzip: bool = True,
+        seed: int = 0,
+    ) -> None:
+        self.records = records
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.gzip = gzip
+        self.requests = []  # type: List[Tuple[str, str]]
+        self.statuses = Counter()  # type: Counter
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None  # type: Optional[ThreadingHTTPServer]
+        self._thread = None  # type: Optional[threading.Thread]
+
+    def __enter__(self) -> "MockHubspot":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                mock.handle(self)
+
+            do_POST = do_PUT = do_DELETE = do_GET
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests = []
+            self.statuses = Counter()
+            self.bytes_sent = 0
+
+    def _draw_failure(self) -> Optional[int]:
+        """returns the status of an injected failure, None if the request should succeed"""
+        with self._lock:
+            draw = self._random.random()
+        if draw < self.rate_limit_rate:
+            return 429
+        if draw < self.rate_limit_rate + self.error_rate:
+            return 502
+        return None
+
+    def handle(self, handler: BaseHTTPRequestHandler) -> None:
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        url = urlsplit(handler.path)
+        with self._lock:
+            self.requests.append((handler.command, url.path))
+        if self.latency:
+            time.sleep(self.latency)
+
+        headers = {
+            "X-HubSpot-RateLimit-Max": "100",
+            "X-HubSpot-RateLimit-Remaining": "99",
+            "X-HubSpot-RateLimit-Interval-Milliseconds": "10000",
+        }
+        status = self._draw_failure()
+        if status == 429:
+            headers["Retry-After"] = str(self.retry_after)
+            payload = {
+                "status": "error",
+                "message": "You have reached your secondly limit.",
+            }
+        elif status == 502:
+            payload = {"status": "error", "message": "Bad Gateway"}
+        else:
+            status, payload = self.route(
+                handler.command, url.path, parse_qs(url.query), body
+            )
+        self.respond(handler, status, payload, headers)
+
+    def respond(
+        self,
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        payload,
+        headers: Dict[str, str],
+    ) -> None:
+        body = b"" if payload is None else json.dumps(payload).encode()
+        if body and self.gzip and "gzip" in handler.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        with self._lock:
+            self.statuses[status] += 1
+            self.bytes_sent += len(body)
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        if body:
+            handler.send_header("Content-Type", "application/json;charset=utf-8")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _page(self, params, limit_name: str, default_limit: int, max_limit: int):
+        """returns the offset, the range of record indexes and whether there are more"""
+        offset = _int(params, "offset", 0)
+        limit = min(_int(params, limit_name, default_limit), max_limit)
+        end = min(offset + limit, self.records)
+        return range(offset, end), end < self.records, end
+
+    def route(self, method: str, path: str, params, body: bytes):
+        """returns the status and the payload for a successful request"""
+        parts = path.strip("/").split("/")
+        if method == "GET" and path == "/contacts/v1/lists/all/contacts/all":
+            vid_offset = _int(params, "vidOffset", 0)
+            start = max(vid_offset - 3000000, 0) if vid_offset else 0
+            end = min(start + min(_int(params, "count", 100), 100), self.records)
+            return 200, {
+                "contacts": [{"vid": 3000000 + index} for index in range(start, end)],
+                "has-more": end < self.records,
+                "vid-offset": 3000000 + end,
+            }
+        if method == "GET" and path == "/contacts/v1/contact/vids/batch":
+            return 200, {
+                vid: make_contact(int(vid) - 3000000) for vid in params.get("vid", [])
+            }
+        if method == "POST" and path == "/contacts/v1/contact/batch":
+            return 202, None
+        if method == "GET" and path == "/companies/v2/companies/paged":
+            indexes, has_more, offset = self._page(params, "limit", 100, 250)
+            return 200, {
+                "companies": [make_company(index) for index in indexes],
+                "has-more": has_more,
+                "offset": offset,
+            }
+        if method == "GET" and path == "/deals/v1/deal/paged":
+            indexes, has_more, offset = self._page(params, "limit", 100, 250)
+            return 200, {
+                "deals": [make_deal(index) for index in indexes],
+                "hasMore": has_more,
+                "offset": offset,
+            }
+        if method == "GET" and path == "/crm-objects/v1/objects/tickets/paged":
+            indexes, has_more, offset = self._page(params, "limit", 100, 100)
+            return 200, {
+                "objects": [make_ticket(index) for index in indexes],
+                "hasMore": has_more,
+                "offset": offset,
+            }
+        if method == "GET" and parts[:3] == ["crm-associations", "v1", "associations"]:
+            indexes, has_more, offset = self._page(params, "limit", 100, 100)
+            return 200, {
+                "results": [5000000 + index for index in indexes],
+                "hasMore": has_more,
+                "offset": offset,
+            }
+        if (
+            method == "POST"
+            and parts[:3] == ["crm", "v4", "associations"]
+            and parts[5:] == ["batch", "read"]
+        ):
+            type_ids = [
+                definition.value
+                for definition, object_types in BATCH_READ_OBJECT_TYPES.items()
+                if [object_type.value for object_type in object_types] == parts[3:5]
+            ]
+            return 200, {
+                "status": "COMPLETE",
+                "results": [
+                    {
+                        "from": {"id": item["id"]},
+                        "to": [
+                            {
+                                "toObjectId": 5000000 + index,
+                                "associationTypes": [
+                                    {"category": "HUBSPOT_DEFINED", "typeId": type_id}
+                                    for type_id in type_ids
+                                ],
+                            }
+                            for index in range(3)
+                        ],
+                    }
+                    for item in json.loads(body)["inputs"]
+                ],
+            }
+        if method == "PUT" and path in (
+            "/crm-associations/v1/associations/create-batch",
+            "/crm-associations/v1/associations/delete-batch",
+        ):
+            definition_ids = {definition.value for definition in Definitions}
+            if any(
+                association["definitionId"] not in definition_ids
+                for association in json.loads(body)
+            ):
+                return 400, {"status": "error", "message": "Invalid definitionId"}
+            return 204, None
+        if method == "PUT" and path == "/extensions/ecomm/v2/sync/messages":
+            return 204, None
+        return 404, {"status": "error", "message": f"No mock for {method} {path}"}
@@ -0,0 +1,262 @@
+"""
+testing hubspot3.aio
+"""
+
+import asyncio
+import gzip
+import json
+import socket
+import threading
+
+import pytest
+
+from hubspot3 import aio
+from hubspot3.error import HubspotNotFound, HubspotNotSupported, HubspotServerError
+from hubspot3.oauth2 import OAuth2Client
+from hubspot3.token_refresh import record_expiry
+
+
+class FakeHubspot:
+    """
+    A tiny HTTP/1.1 server that answers every request with the next queued
+    (status, body, headers) tuple and records the requests it received.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.connections = 0
+        self.server = None
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode().partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            method, url, _ = request_line.decode().split(" ")
+            self.requests.append((method, url, body))
+
+            status, response_body, response_headers = self.responses.pop(0)
+            if isinstance(response_body, str):
+                response_body = response_body.encode()
+            head = [f"HTTP/1.1 {status} Reason"]
+            if response_headers.get("Transfer-Encoding") == "chunked":
+                response_body = (
+                    b"".join(
+                        b"%x\r\n%s\r\n" % (len(part), part)
+                        for part in (response_body[:5], response_body[5:])
+                    )
+                    + b"0\r\n\r\n"
+                )
+            else:
+                head.append(f"Content-Length: {len(response_body)}")
+            head.extend(f"{name}: {value}" for name, value in response_headers.items())
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + response_body)
+            await writer.drain()
+        writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def run_against(responses, scenario):
+    """runs the scenario coroutine against a fake server and returns the server"""
+    fake = FakeHubspot(responses)
+
+    async def main():
+        api_base = await fake.start()
+        try:
+            await scenario(api_base)
+        finally:
+            await fake.stop()
+
+    asyncio.run(main())
+    return fake
+
+
+def test_call_reuses_keep_alive_connection():
+    async def scenario(api_base):
+        async with aio.AsyncContactsClient(
+            disable_auth=True, api_base=api_base
+        ) as client:
+            assert await client.get_by_id("1") == {"vid": 1}
+            assert await client.get_by_email("a@b.com") == {"vid": 2}
+
+    fake = run_against(
+        [(200, json.dumps({"vid": 1}), {}), (200, json.dumps({"vid": 2}), {})],
+        scenario,
+    )
+    assert fake.connections == 1
+    assert [request[1] for request in fake.requests] == [
+        "/contacts/v1/contact/vid/1/profile?",
+        "/contacts/v1/contact/email/a@b.com/profile?",
+    ]
+
+
+def test_call_decodes_chunked_gzip_responses():
+    body = gzip.compress(json.dumps({"results": []}).encode())
+
+    async def scenario(api_base):
+        async with aio.AsyncDealsClient(disable_auth=True, api_base=api_base) as client:
+            assert await client.get("1") == {"results": []}
+
+    run_against(
+        [
+            (
+                200,
+                body,
+                {"Transfer-Encoding": "chunked", "Content-Encoding": "gzip"},
+            )
+        ],
+        scenario,
+    )
+
+
+def test_call_sends_json_body():
+    async def scenario(api_base):
+        async with aio.AsyncDealsClient(disable_auth=True, api_base=api_base) as client:
+            await client.create({"properties": []})
+
+    fake = run_against([(200, "{}", {})], scenario)
+    [(method, url, body)] = fake.requests
+    assert (method, url) == ("POST", "/deals/v1/deal/?")
+    assert json.loads(body) == {"properties": []}
+
+
+def test_call_maps_errors_and_retries_gets(monkeypatch):
+    monkeypatch.setattr(aio.AsyncBaseClient, "sleep_multiplier", 0)
+
+    async def scenario(api_base):
+        async with aio.AsyncDealsClient(disable_auth=True, api_base=api_base) as client:
+            with pytest.raises(HubspotNotFound):
+                await client.get("missing")
+            assert await client.get("flaky") == {"dealId": 1}
+            with pytest.raises(HubspotServerError):
+                await client.delete("1")
+
+    fake = run_against(
+        [
+            (404, "{}", {}),
+            (500, "{}", {}),
+            (200, json.dumps({"dealId": 1}), {}),
+            (500, "{}", {}),
+        ],
+        scenario,
+    )
+    assert len(fake.requests) == 4
+
+
+def test_get_all_paginates():
+    pages = [
+        {
+            "deals": [
+                {"dealId": 1, "isDeleted": False, "properties": {}},
+                {"dealId": 2, "isDeleted": True, "properties": {}},
+            ],
+            "hasMore": True,
+            "offset": 2,
+        },
+        {
+            "deals": [{"dealId": 3, "isDeleted": False, "properties": {}}],
+            "hasMore": False,
+            "offset": 3,
+        },
+    ]
+
+    async def scenario(api_base):
+        async with aio.AsyncDealsClient(disable_auth=True, api_base=api_base) as client:
+            deals = await client.get_all()
+            assert [deal["id"] for deal in deals] == [1, 3]
+
+    fake = run_against([(200, json.dumps(page), {}) for page in pages], scenario)
+    assert "offset=2" in fake.requests[1][1]
+
+
+def test_link_helpers_use_the_options_of_the_client():
+    async def scenario(api_base):
+        async with aio.AsyncContactsClient(
+            disable_auth=True, api_base=api_base
+        ) as client:
+            await client.link_contact_to_company(1, 2)
+
+    fake = run_against([(204, "", {})], scenario)
+    [(method, url, body)] = fake.requests
+    assert (method, url) == ("PUT", "/crm-associations/v1/associations?")
+    assert json.loads(body)["definitionId"] == 1
+
+
+def test_expiring_tokens_are_not_refreshed_on_the_event_loop(monkeypatch):
+    threads = []
+
+    def refresh_tokens(self, client_id=None, client_secret=None, refresh_token=None):
+        threads.append(threading.current_thread())
+        raise HubspotServerError(None, None)
+
+    monkeypatch.setattr(OAuth2Client, "refresh_tokens", refresh_tokens)
+    record_expiry("expiring-async", 60)
+
+    async def scenario(api_base):
+        async with aio.AsyncDealsClient(
+            access_token="expiring-async",
+            refresh_token="refresh",
+            client_id="async-app",
+            client_secret="secret",
+            api_base=api_base,
+        ) as client:
+            assert await client.get("1") == {"dealId": 1}
+
+    fake = run_against([(200, json.dumps({"dealId": 1}), {})], scenario)
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
+    assert fake.requests[0][1] == "/deals/v1/deal/1?"
+
+
+def test_sync_only_methods_are_rejected():
+    client = aio.AsyncContactsClient(disable_auth=True)
+    with pytest.raises(HubspotNotSupported, match="AsyncContactsClient.iter_all"):
+        client.iter_all()
+    with pytest.raises(HubspotNotSupported):
+        aio.AsyncCRMAssociationsClient(disable_auth=True).iter_many([1], [1])
+    with pytest.raises(HubspotNotSupported, match="enrichment_workers"):
+        asyncio.run(client.get_all(enrichment_workers=2))
+
+
+def test_connections_of_other_event_loops_are_closed():
+    server = socket.create_server(("127.0.0.1", 0))
+    client = aio.AsyncDealsClient(
+        disable_auth=True, api_base=f"http://127.0.0.1:{server.getsockname()[1]}"
+    )
+
+    async def connect():
+        connection = aio.AsyncConnection(client.options["api_base"], protocol="http")
+        connection.loop = asyncio.get_running_loop()
+        connection._reader, connection._writer = await asyncio.open_connection(
+            "127.0.0.1", server.getsockname()[1]
+        )
+        return connection
+
+    client._idle_connections.append(asyncio.run(connect()))
+    accepted, _ = server.accept()
+
+    async def acquire():
+        return client._acquire_connection(client.options)
+
+    connection, reused = asyncio.run(acquire())
+    assert not reused and not client._idle_connections
+    accepted.settimeout(1)
+    assert accepted.recv(1) == b""
+    accepted.close()
+    server.close()
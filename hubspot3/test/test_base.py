@@ -0,0 +1,204 @@
+"""
+testing hubspot3.base
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+from hubspot3.base import BaseClient
+from hubspot3.contacts import ContactsClient
+from hubspot3.deals import DealsClient
+from hubspot3.oauth2 import OAuth2Client
+from hubspot3.token_refresh import get_expiry, record_expiry
+
+
+class GreetingMixin:
+    def greet(self):
+        return f"hello from {self._get_path('')}"
+
+
+class LoudMixin:
+    def greet(self):
+        return "HELLO"
+
+
+def test_mixins_do_not_change_the_client_class():
+    bases = ContactsClient.__bases__
+    client = ContactsClient(disable_auth=True, mixins=[GreetingMixin])
+    assert client.greet() == "hello from contacts/v1/"
+    assert isinstance(client, ContactsClient)
+    assert isinstance(client, GreetingMixin)
+    assert ContactsClient.__bases__ == bases
+    assert not hasattr(ContactsClient(disable_auth=True), "greet")
+    assert not hasattr(DealsClient(disable_auth=True), "greet")
+
+
+def test_composed_classes_are_cached():
+    first = ContactsClient(disable_auth=True, mixins=[GreetingMixin])
+    second = ContactsClient(disable_auth=True, mixins=[GreetingMixin])
+    assert type(first) is type(second)
+    assert type(first).__name__ == "ContactsClient"
+    assert type(ContactsClient(disable_auth=True, mixins=[LoudMixin])) is not type(
+        first
+    )
+
+
+def test_first_mixin_takes_precedence():
+    client = BaseClient(disable_auth=True, mixins=[LoudMixin, GreetingMixin])
+    assert client.greet() == "HELLO"
+
+
+def test_repeated_and_inherited_mixins_are_skipped():
+    client = ContactsClient(disable_auth=True, mixins=[LoudMixin, LoudMixin])
+    assert type(client).__bases__ == (LoudMixin, ContactsClient)
+    assert (
+        type(ContactsClient(disable_auth=True, mixins=[BaseClient])) is ContactsClient
+    )
+    composed = type(client)
+    assert type(composed(disable_auth=True, mixins=[LoudMixin])) is composed
+
+
+def test_composing_is_thread_safe():
+    classes = []
+
+    def create():
+        classes.append(type(DealsClient(disable_auth=True, mixins=[LoudMixin])))
+
+    threads = [threading.Thread(target=create) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(classes)) == 1
+
+
+def mock_refresh(monkeypatch, delay=0.0):
+    """replaces the token endpoint, returns the list of refresh tokens that were used"""
+    calls = []
+
+    def refresh_tokens(self, client_id=None, client_secret=None, refresh_token=None):
+        calls.append(refresh_token)
+        time.sleep(delay)
+        access_token = f"access-{len(calls)}"
+        record_expiry(access_token, 21600)
+        return {
+            "access_token": access_token,
+            "refresh_token": f"refresh-{len(calls)}",
+            "expires_in": 21600,
+        }
+
+    monkeypatch.setattr(OAuth2Client, "refresh_tokens", refresh_tokens)
+    return calls
+
+
+def oauth2_client(tokens, client_id="app", **options):
+    return BaseClient(
+        client_id=client_id,
+        client_secret="secret",
+        oauth2_token_getter=lambda token_type, client_id: tokens.get(token_type),
+        oauth2_token_setter=lambda token_type, client_id, token: tokens.update(
+            {token_type: token}
+        ),
+        **options,
+    )
+
+
+def test_concurrent_refreshes_are_coalesced(monkeypatch):
+    calls = mock_refresh(monkeypatch, delay=0.05)
+    tokens = {"access_token": "expired", "refresh_token": "refresh-0"}
+    clients = [oauth2_client(tokens, client_id="coalesced-app") for _ in range(8)]
+    results = []
+
+    def refresh(client):
+        results.append(client._refresh_access_token(False, "expired"))
+
+    threads = [threading.Thread(target=refresh, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["refresh-0"]
+    assert results == [True] * 8
+    assert tokens == {"access_token": "access-1", "refresh_token": "refresh-1"}
+    assert get_expiry("access-1") > time.time()
+
+
+def test_unauthorized_requests_are_retried_with_a_new_token(
+    monkeypatch, mock_connection
+):
+    calls = mock_refresh(monkeypatch)
+    client = BaseClient(
+        access_token="expired",
+        refresh_token="refresh-0",
+        client_id="retry-app",
+        client_secret="secret",
+    )
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    mock_connection.set_responses([(401, ""), (200, "{}")])
+
+    assert client._call("objects") == {}
+    assert calls == ["refresh-0"]
+    headers = mock_connection.request.call_args_list[-1][0][3]
+    assert headers["Authorization"] == "Bearer access-1"
+
+
+def test_expiring_tokens_are_refreshed_ahead_of_time(monkeypatch):
+    calls = mock_refresh(monkeypatch)
+    record_expiry("expiring", 60)
+    record_expiry("valid", 3600)
+    tokens = {"access_token": "valid", "refresh_token": "refresh-0"}
+    client = oauth2_client(tokens, client_id="proactive-app")
+
+    _, headers, _ = client._prepare_request("objects", {}, None, client.options)
+    assert headers["Authorization"] == "Bearer valid"
+    assert calls == []
+
+    client.access_token = "expiring"
+    _, headers, _ = client._prepare_request("objects", {}, None, client.options)
+    assert headers["Authorization"] == "Bearer access-1"
+    assert calls == ["refresh-0"]
+
+
+def test_token_lookups_are_cached(monkeypatch, mock_connection):
+    mock_refresh(monkeypatch)
+    tokens = {"access_token": "cached", "refresh_token": "refresh-0"}
+    getter = Mock(side_effect=lambda token_type, client_id: tokens.get(token_type))
+    client = BaseClient(
+        client_id="cached-app",
+        client_secret="secret",
+        oauth2_token_getter=getter,
+        oauth2_token_setter=lambda token_type, client_id, token: tokens.update(
+            {token_type: token}
+        ),
+    )
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    mock_connection.set_response(200, "{}")
+    for _ in range(3):
+        client._call("objects")
+    assert getter.call_count == 1
+
+    # tokens that were set are used without asking the getter
+    client.access_token = "updated"
+    assert client.access_token == "updated"
+    assert getter.call_count == 1
+
+    # after a 401, the tokens are looked up again
+    tokens["access_token"] = "elsewhere"
+    mock_connection.set_responses([(401, ""), (200, "{}")])
+    client._call("objects")
+    headers = mock_connection.request.call_args_list[-1][0][3]
+    assert headers["Authorization"] == "Bearer elsewhere"
+
+
+def test_token_cache_expires(monkeypatch):
+    tokens = {"access_token": "first"}
+    client = oauth2_client(tokens, client_id="ttl-app", token_cache_ttl=30)
+    assert client.access_token == "first"
+    tokens["access_token"] = "second"
+    assert client.access_token == "first"
+
+    now = time.time()
+    monkeypatch.setattr("hubspot3.base.time.time", lambda: now + 31)
+    assert client.access_token == "second"
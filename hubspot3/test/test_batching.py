@@ -0,0 +1,101 @@
+"""
+testing hubspot3.batching
+"""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from hubspot3.batching import (
+    BatchReport,
+    BatchResponse,
+    RecordResult,
+    chunked,
+    dispatch,
+)
+from hubspot3.error import HubspotServerError
+
+
+def test_chunked_is_lazy():
+    consumed = []
+
+    def items():
+        for item in range(5):
+            consumed.append(item)
+            yield item
+
+    chunks = chunked(items(), 2)
+    assert next(chunks) == [0, 1]
+    assert consumed == [0, 1]
+    assert list(chunks) == [[2, 3], [4]]
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_dispatch_keeps_order_and_collects_errors(max_workers):
+    error = HubspotServerError(Mock(status=500, body="", msg="", reason=""), {})
+
+    def send(chunk):
+        if chunk == [3]:
+            raise error
+        return sum(chunk)
+
+    results = list(dispatch(send, [[1, 1], [2], [3], [4]], max_workers=max_workers))
+    assert results == [
+        ([1, 1], 2, None),
+        ([2], 2, None),
+        ([3], None, error),
+        ([4], 4, None),
+    ]
+
+
+def test_dispatch_sends_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def send(chunk):
+        barrier.wait()
+        return chunk
+
+    assert [response for _, response, _ in dispatch(send, [1, 2], max_workers=2)] == [
+        1,
+        2,
+    ]
+
+
+def test_dispatch_bounds_read_ahead():
+    read = []
+
+    def chunks():
+        for chunk in range(100):
+            read.append(chunk)
+            yield chunk
+
+    results = dispatch(lambda chunk: chunk, chunks(), max_workers=2, max_pending=3)
+    next(results)
+    assert len(read) <= 3
+    results.close()
+
+
+def test_batch_report():
+    error = ValueError("invalid")
+    report = BatchReport(
+        [RecordResult(0, "a"), RecordResult(1, "b", error, "invalid email")]
+    )
+    assert not report.ok
+    assert [result.record for result in report.succeeded] == ["a"]
+    assert [result.message for result in report.failed] == ["invalid email"]
+
+
+def test_batch_response():
+    error = HubspotServerError(Mock(status=500, body="", msg="", reason=""), {})
+    response = BatchResponse()
+    response.add([1], {"status": "COMPLETE", "results": [{"id": "1"}]})
+    response.add([2], None)
+    assert response.ok and response.status == "COMPLETE"
+
+    response.add([3], {"results": [{"id": "3"}], "errors": [{"message": "nope"}]})
+    response.add([4, 5], None, error)
+    assert response.results == [{"id": "1"}, {"id": "3"}]
+    assert response.errors == [{"message": "nope"}]
+    assert response.failed == [([4, 5], error)]
+    assert not response.ok and response.status == "COMPLETE_WITH_ERRORS"
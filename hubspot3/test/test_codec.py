@@ -0,0 +1,53 @@
+"""
+testing hubspot3.codec
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from hubspot3.base import BaseClient
+from hubspot3.codec import JSONCodec, get_available_codecs, get_codec
+from hubspot3.error import HubspotBadConfig
+
+INSTALLED_CODECS = [codec for codec in get_available_codecs().values() if codec]
+
+
+@pytest.mark.parametrize("codec", INSTALLED_CODECS, ids=lambda codec: codec.name)
+def test_codecs_round_trip(codec):
+    document = {"name": "Zoë – 東京", "count": 3, "tags": [None, True]}
+    encoded = codec.dumps(document)
+    assert json.loads(encoded) == document
+    assert codec.loads(encoded) == document
+    assert codec.loads(json.dumps(document).encode("utf-8")) == document
+    with pytest.raises(ValueError):
+        codec.loads(b"SUCCESS")
+
+
+def test_get_codec():
+    assert get_codec() is get_codec()
+    assert get_codec().name == "json"
+    assert get_codec("json").name == "json"
+    codec = JSONCodec()
+    assert get_codec(codec) is codec
+    with pytest.raises(HubspotBadConfig):
+        get_codec("yaml")
+
+
+def test_client_uses_configured_codec(mock_connection):
+    codec = Mock(wraps=JSONCodec())
+    codec.__class__ = JSONCodec
+    client = BaseClient(disable_auth=True, json_codec=codec)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    mock_connection.set_response(200, b'{"ok": true}')
+
+    assert client._call("things", method="POST", data={"a": 1}) == {"ok": True}
+    codec.dumps.assert_called_once_with({"a": 1})
+    codec.loads.assert_called_once_with(b'{"ok": true}')
+
+
+def test_non_json_bodies_are_returned_as_text():
+    client = BaseClient(disable_auth=True)
+    assert client._digest_result(b"SUCCESS") == "SUCCESS"
+    assert client._digest_result("") == ""
@@ -0,0 +1,127 @@
+"""
+testing hubspot3.connection_pool
+"""
+
+import http.client
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from hubspot3 import Hubspot3
+from hubspot3.base import BaseClient
+from hubspot3.connection_pool import ConnectionPool
+from hubspot3.error import HubspotNotFound, HubspotTimeout
+from hubspot3.test.globals import TEST_KEY
+
+
+@pytest.fixture
+def pooled_client(mock_connection):
+    client = BaseClient(disable_auth=True, connection_pool=ConnectionPool())
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    return client
+
+
+def test_acquire_creates_and_reuses_connections():
+    connection_type = Mock()
+    pool = ConnectionPool()
+    key = pool.key(connection_type, "api.hubapi.com", 10)
+
+    connection, reused = pool.acquire(key)
+    assert not reused
+    connection_type.assert_called_once_with("api.hubapi.com", timeout=10)
+
+    pool.release(key, connection)
+    assert pool.idle_count() == 1
+    assert pool.acquire(key) == (connection, True)
+    assert pool.idle_count() == 0
+
+
+def test_release_respects_max_size():
+    pool = ConnectionPool(max_size=1)
+    key = pool.key(Mock(), "api.hubapi.com", 10)
+    first, second = Mock(), Mock()
+    pool.release(key, first)
+    pool.release(key, second)
+    assert pool.idle_count() == 1
+    second.close.assert_called_once_with()
+    first.close.assert_not_called()
+
+
+def test_idle_connections_are_evicted(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("hubspot3.connection_pool.time.monotonic", lambda: now[0])
+    connection_type = Mock()
+    pool = ConnectionPool(idle_timeout=5)
+    key = pool.key(connection_type, "api.hubapi.com", 10)
+    idle = Mock()
+    pool.release(key, idle)
+
+    now[0] += 10
+    connection, reused = pool.acquire(key)
+    assert not reused
+    assert connection is connection_type.return_value
+    idle.close.assert_called_once_with()
+
+
+def test_clear_closes_idle_connections():
+    pool = ConnectionPool()
+    key = pool.key(Mock(), "api.hubapi.com", 10)
+    idle = Mock()
+    pool.release(key, idle)
+    pool.clear()
+    assert pool.idle_count() == 0
+    idle.close.assert_called_once_with()
+
+
+def test_client_reuses_pooled_connection(pooled_client, mock_connection):
+    mock_connection.set_response(200, json.dumps({}))
+    pooled_client._call("first")
+    pooled_client._call("second")
+    mock_connection.assert_num_requests(2)
+    assert pooled_client.options["connection_type"].call_count == 1
+    mock_connection.close.assert_not_called()
+
+
+def test_client_keeps_connection_after_error_status(pooled_client, mock_connection):
+    mock_connection.set_response(404, "")
+    with pytest.raises(HubspotNotFound):
+        pooled_client._call("missing")
+    assert pooled_client.options["connection_pool"].idle_count() == 1
+
+
+def test_client_reconnects_on_stale_connection(pooled_client, mock_connection):
+    fresh_connection = Mock(spec=http.client.HTTPSConnection, host="", timeout=10)
+    fresh_connection.getresponse.return_value = Mock(
+        status=200, read=Mock(return_value=b"{}"), getheaders=Mock(return_value=[])
+    )
+    pool = pooled_client.options["connection_pool"]
+    key = pool.key(pooled_client.options["connection_type"], "api.hubapi.com", 10)
+    pool.release(key, mock_connection)
+    pooled_client.options["connection_type"].return_value = fresh_connection
+    mock_connection.getresponse.side_effect = http.client.RemoteDisconnected()
+
+    assert pooled_client._call("contacts") == {}
+    mock_connection.close.assert_called_once_with()
+    fresh_connection.request.assert_called_once()
+
+
+def test_client_does_not_retry_fresh_connection_failures(
+    pooled_client, mock_connection
+):
+    mock_connection.getresponse.side_effect = http.client.RemoteDisconnected()
+    with pytest.raises(HubspotTimeout):
+        pooled_client._call("contacts", number_retries=0)
+    mock_connection.assert_num_requests(1)
+
+
+def test_facade_shares_connection_pool():
+    hubspot = Hubspot3(api_key=TEST_KEY)
+    pool = hubspot.options["connection_pool"]
+    assert isinstance(pool, ConnectionPool)
+    assert hubspot.contacts.options["connection_pool"] is pool
+    assert hubspot.deals.options["connection_pool"] is pool
+    assert (
+        Hubspot3(api_key=TEST_KEY, connection_pool=False).options["connection_pool"]
+        is False
+    )
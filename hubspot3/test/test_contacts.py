@@ -193,6 +193,120 @@ class TestContactsClient:
             extra_properties=extra_properties,
         )
 
+    def test_iter_all_is_lazy(self, contacts_client, mock_connection):
+        pages = [
+            {"contacts": [{"vid": 1}], "has-more": True, "vid-offset": 1},
+            {"contacts": [{"vid": 2}], "has-more": False, "vid-offset": 2},
+        ]
+        mock_connection.set_responses([(200, json.dumps(page)) for page in pages])
+        contacts_client.get_batch = Mock(
+            side_effect=lambda vids, **_: [{"id": vids[0]}]
+        )
+
+        contacts = contacts_client.iter_all()
+        assert next(contacts) == {"id": 1}
+        mock_connection.assert_num_requests(1)
+        assert list(contacts) == [{"id": 2}]
+        mock_connection.assert_num_requests(2)
+        mock_connection.assert_has_request(
+            "GET", "/contacts/v1/lists/all/contacts/all", count=100, vidOffset=1
+        )
+
+    @pytest.mark.parametrize("limit", [0, 3])
+    def test_iter_all_pipelined(self, contacts_client, mock_connection, limit):
+        pages = [
+            {"contacts": [{"vid": vid}], "has-more": vid < 4, "vid-offset": vid}
+            for vid in range(1, 5)
+        ]
+        mock_connection.set_responses([(200, json.dumps(page)) for page in pages])
+        contacts_client.get_batch = Mock(
+            side_effect=lambda vids, **_: [{"id": vids[0]}]
+        )
+
+        contacts = list(
+            contacts_client.iter_all(
+                extra_properties="lead_source",
+                limit=limit,
+                enrichment_workers=2,
+                max_pending_batches=2,
+            )
+        )
+        expected = [{"id": vid} for vid in range(1, 5)]
+        assert contacts == (expected[:limit] if limit else expected)
+        contacts_client.get_batch.assert_any_call([1], extra_properties="lead_source")
+
+    def test_get_recently_modified(self, contacts_client, mock_connection):
+        pages = [
+            {
+                "contacts": [{"vid": 3}, {"vid": 2}],
+                "has-more": True,
+                "vid-offset": 2,
+                "time-offset": 1000,
+            },
+            {"contacts": [{"vid": 1}], "has-more": False, "vid-offset": 1},
+        ]
+        mock_connection.set_responses([(200, json.dumps(page)) for page in pages])
+
+        contacts = contacts_client.get_recently_modified(limit=2)
+        assert contacts == [{"vid": 3}, {"vid": 2}]
+        mock_connection.assert_num_requests(1)
+        mock_connection.assert_has_request(
+            "GET", "/contacts/v1/lists/recently_updated/contacts/recent", count=2
+        )
+
+    def test_iter_recently_modified_with_extra_properties(
+        self, contacts_client, mock_connection
+    ):
+        page = {
+            "contacts": [{"vid": 1}],
+            "has-more": False,
+            "vid-offset": 1,
+            "time-offset": 1000,
+        }
+        mock_connection.set_response(200, json.dumps(page))
+
+        contacts = contacts_client.iter_recently_modified(
+            extra_properties="lead_source"
+        )
+        assert list(contacts) == [{"vid": 1}]
+        ((args, _),) = mock_connection.request.call_args_list
+        assert "property=lead_source" in args[1]
+        assert "property=email" in args[1]
+
+    def test_create_or_update_batch(self, contacts_client, mock_connection):
+        contacts_input = [
+            {"email": f"contact{index}@example.com", "properties": []}
+            for index in range(5)
+        ]
+        invalid = {
+            "status": "error",
+            "failureMessages": [
+                {"index": 1, "error": {"message": "Email address is invalid"}}
+            ],
+        }
+        mock_connection.set_responses(
+            [(400, json.dumps(invalid)), (202, ""), (202, "")]
+        )
+
+        report = contacts_client.create_or_update_batch(
+            iter(contacts_input), batch_size=3, number_retries=0
+        )
+        mock_connection.assert_num_requests(3)
+        mock_connection.assert_has_request(
+            "POST", "/contacts/v1/contact/batch?", contacts_input[:3]
+        )
+        mock_connection.assert_has_request(
+            "POST",
+            "/contacts/v1/contact/batch?",
+            [contacts_input[0], contacts_input[2]],
+        )
+        mock_connection.assert_has_request(
+            "POST", "/contacts/v1/contact/batch?", contacts_input[3:]
+        )
+        assert [result.index for result in report] == [0, 1, 2, 3, 4]
+        assert [result.index for result in report.failed] == [1]
+        assert report.failed[0].message == "Email address is invalid"
+
     def test_get_in_list(self, contacts_client, mock_connection):
         list_id = 15
         response_body = {
@@ -0,0 +1,138 @@
+"""Tests for the CRM association labels client."""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+from hubspot3.crm_association_labels import (
+    AssociationCategory,
+    CRMAssociationLabelsClient,
+    ObjectTypeDefinitions,
+)
+from hubspot3.error import HubspotServerError
+
+
+CONTACTS = ObjectTypeDefinitions.CONTACTS
+COMPANIES = ObjectTypeDefinitions.COMPANIES
+
+
+@pytest.fixture
+def labels_client(mock_connection):
+    client = CRMAssociationLabelsClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    return client
+
+
+def get_inputs(mock_connection):
+    return [
+        json.loads(args[2])["inputs"]
+        for args, _ in mock_connection.request.call_args_list
+    ]
+
+
+class TestBatchOperations(object):
+    def test_batch_list(self, labels_client, mock_connection):
+        mock_connection.set_responses(
+            [
+                (
+                    207,
+                    json.dumps(
+                        {
+                            "status": "COMPLETE",
+                            "results": [{"from": {"id": str(index)}, "to": []}],
+                            "errors": [{"category": "NO_ASSOCIATIONS_FOUND"}],
+                        }
+                    ),
+                )
+                for index in range(3)
+            ]
+        )
+        response = labels_client.batch_list(CONTACTS, COMPANIES, range(2500))
+
+        assert [result["from"]["id"] for result in response.results] == ["0", "1", "2"]
+        assert len(response.errors) == 3
+        assert response.status == "COMPLETE_WITH_ERRORS"
+        assert [len(inputs) for inputs in get_inputs(mock_connection)] == [
+            1000,
+            1000,
+            500,
+        ]
+        mock_connection.assert_has_request(
+            "POST",
+            "/crm/v4/associations/0-1/0-2/batch/read?",
+            {"inputs": [{"id": str(index)} for index in range(2000, 2500)]},
+        )
+
+    def test_list_from_a_batch_list_cursor(self, labels_client, mock_connection):
+        mock_connection.set_response(
+            200, json.dumps({"results": [{"toObjectId": 501}]})
+        )
+        assert labels_client.list(CONTACTS, 1, COMPANIES, after="cursor") == [
+            {"toObjectId": 501}
+        ]
+        mock_connection.assert_has_request(
+            "GET", "/crm/v4/objects/0-1/1/associations/0-2?", after="cursor"
+        )
+
+    def test_batch_create_default(self, labels_client, mock_connection):
+        mock_connection.set_response(200, json.dumps({"results": [{"id": 1}]}))
+        response = labels_client.batch_create_default(
+            CONTACTS, COMPANIES, [(1, 2), (3, 4)], max_workers=2
+        )
+
+        assert response.ok
+        assert response.results == [{"id": 1}]
+        mock_connection.assert_has_request(
+            "POST",
+            "/crm/v4/associations/0-1/0-2/batch/associate/default?",
+            {
+                "inputs": [
+                    {"from": {"id": "1"}, "to": {"id": "2"}},
+                    {"from": {"id": "3"}, "to": {"id": "4"}},
+                ]
+            },
+        )
+
+    @pytest.mark.parametrize(
+        "method, action",
+        [("batch_create", "create"), ("batch_delete_specific", "labels/archive")],
+    )
+    def test_batch_labels(self, labels_client, mock_connection, method, action):
+        mock_connection.set_response(201, json.dumps({"results": []}))
+        pairs = ((index, 1000 + index) for index in range(250))
+        response = getattr(labels_client, method)(
+            CONTACTS,
+            COMPANIES,
+            pairs,
+            AssociationCategory.USER_DEFINED,
+            36,
+            max_workers=3,
+        )
+
+        assert response.ok
+        inputs = get_inputs(mock_connection)
+        assert sorted(len(chunk) for chunk in inputs) == [50, 100, 100]
+        assert {
+            "from": {"id": "0"},
+            "to": {"id": "1000"},
+            "types": [{"associationCategory": "USER_DEFINED", "associationTypeId": 36}],
+        } in sum(inputs, [])
+        for args, _ in mock_connection.request.call_args_list:
+            assert args[1] == f"/crm/v4/associations/0-1/0-2/batch/{action}?"
+
+    def test_batch_delete_reports_failed_chunks(self, labels_client, mock_connection):
+        labels_client.options["number_retries"] = 0
+        mock_connection.set_responses([(204, ""), (500, "{}")])
+        pairs = [(index, 1000 + index) for index in range(150)]
+        response = labels_client.batch_delete(CONTACTS, COMPANIES, pairs)
+
+        assert not response.ok
+        ((inputs, error),) = response.failed
+        assert inputs[0] == {"from": {"id": "100"}, "to": [{"id": "1100"}]}
+        assert len(inputs) == 50
+        assert isinstance(error, HubspotServerError)
+        mock_connection.assert_has_request(
+            "POST",
+            "/crm/v4/associations/0-1/0-2/batch/archive?",
+            {"inputs": inputs},
+        )
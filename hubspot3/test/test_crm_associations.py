@@ -0,0 +1,254 @@
+"""Tests for the CRM associations client."""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+from hubspot3.crm_associations import CRMAssociationsClient, Definitions
+from hubspot3.error import HubspotBadRequest, HubspotServerError
+from hubspot3.test.mock_hubspot import MockHubspot
+
+
+@pytest.fixture
+def associations_client(mock_connection):
+    client = CRMAssociationsClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    return client
+
+
+def batch_result(from_id, *targets, after=None):
+    result = {
+        "from": {"id": str(from_id)},
+        "to": [
+            {
+                "toObjectId": to_id,
+                "associationTypes": [
+                    {"category": category, "typeId": type_id}
+                    for category, type_id in association_types
+                ],
+            }
+            for to_id, association_types in targets
+        ],
+    }
+    if after:
+        result["paging"] = {"next": {"after": after}}
+    return result
+
+
+class TestIterMany(object):
+    def test_batch_read(self, associations_client, mock_connection):
+        mock_connection.set_responses(
+            [
+                (
+                    207,
+                    json.dumps(
+                        {
+                            "status": "COMPLETE",
+                            "results": [
+                                batch_result(
+                                    1,
+                                    (10, [("HUBSPOT_DEFINED", 1)]),
+                                    (11, [("USER_DEFINED", 1)]),
+                                ),
+                                batch_result(
+                                    2, (12, [("HUBSPOT_DEFINED", 1)]), after="cursor"
+                                ),
+                            ],
+                            "errors": [
+                                {
+                                    "category": "NO_ASSOCIATIONS_FOUND",
+                                    "context": {"fromObjectId": ["3"]},
+                                }
+                            ],
+                        }
+                    ),
+                ),
+                (
+                    200,
+                    json.dumps(
+                        {
+                            "results": [
+                                {
+                                    "toObjectId": 13,
+                                    "associationTypes": [
+                                        {"category": "HUBSPOT_DEFINED", "typeId": 1}
+                                    ],
+                                }
+                            ]
+                        }
+                    ),
+                ),
+            ]
+        )
+
+        associations = list(
+            associations_client.iter_many(
+                [1, 2, 3], [Definitions.CONTACT_TO_COMPANY], timeout=7
+            )
+        )
+        assert associations == [
+            (1, Definitions.CONTACT_TO_COMPANY, 10),
+            (2, Definitions.CONTACT_TO_COMPANY, 12),
+            (2, Definitions.CONTACT_TO_COMPANY, 13),
+        ]
+        mock_connection.assert_num_requests(2)
+        # the options apply to the requests for further pages as well
+        connection_type = associations_client.options["connection_type"]
+        assert [call[1]["timeout"] for call in connection_type.call_args_list] == [7, 7]
+        mock_connection.assert_has_request(
+            "POST",
+            "/crm/v4/associations/0-1/0-2/batch/read?",
+            {"inputs": [{"id": "1"}, {"id": "2"}, {"id": "3"}]},
+        )
+        mock_connection.assert_has_request(
+            "GET", "/crm/v4/objects/0-1/2/associations/0-2?", after="cursor"
+        )
+
+    def test_definitions_between_the_same_object_types_share_requests(
+        self, associations_client, mock_connection
+    ):
+        mock_connection.set_response(
+            200,
+            json.dumps(
+                {
+                    "results": [
+                        batch_result(
+                            1,
+                            (10, [("HUBSPOT_DEFINED", 13)]),
+                            (11, [("HUBSPOT_DEFINED", 14)]),
+                        )
+                    ]
+                }
+            ),
+        )
+        associations = list(
+            associations_client.iter_many(
+                ["1"],
+                [
+                    Definitions.PARENT_COMPANY_TO_CHILD_COMPANY,
+                    Definitions.CHILD_COMPANY_TO_PARENT_COMPANY.value,
+                ],
+            )
+        )
+        assert associations == [
+            (1, Definitions.PARENT_COMPANY_TO_CHILD_COMPANY, 10),
+            (1, 14, 11),
+        ]
+        mock_connection.assert_num_requests(1)
+
+    def test_fan_out_for_definitions_without_batch_endpoint(
+        self, associations_client, mock_connection
+    ):
+        mock_connection.set_responses(
+            [
+                (200, json.dumps({"results": [10], "hasMore": True, "offset": 1})),
+                (200, json.dumps({"results": [11], "hasMore": False, "offset": 2})),
+                (200, json.dumps({"results": [], "hasMore": False, "offset": 0})),
+            ]
+        )
+        associations = list(
+            associations_client.iter_many([1, 2], [Definitions.COMPANY_TO_ENGAGEMENT])
+        )
+        assert associations == [
+            (1, Definitions.COMPANY_TO_ENGAGEMENT, 10),
+            (1, Definitions.COMPANY_TO_ENGAGEMENT, 11),
+        ]
+        mock_connection.assert_num_requests(3)
+        mock_connection.assert_has_request(
+            "GET",
+            "/crm-associations/v1/associations/2/HUBSPOT_DEFINED/7?",
+            limit=100,
+            offset=0,
+        )
+
+    def test_errors_are_raised(self, associations_client, mock_connection):
+        associations_client.options["number_retries"] = 0
+        mock_connection.set_response(500, "{}")
+        with pytest.raises(HubspotServerError):
+            list(associations_client.iter_many([1], [Definitions.DEAL_TO_LINE_ITEM]))
+
+    def test_concurrent_batches(self):
+        with MockHubspot() as mock:
+            client = CRMAssociationsClient(api_key="key", api_base=mock.url)
+            associations = list(
+                client.iter_many(
+                    range(2500),
+                    [Definitions.COMPANY_TO_CONTACT, Definitions.COMPANY_TO_DEAL],
+                    max_workers=4,
+                )
+            )
+            assert (
+                sorted(mock.requests)
+                == [("POST", "/crm/v4/associations/0-2/0-1/batch/read")] * 3
+                + [("POST", "/crm/v4/associations/0-2/0-3/batch/read")] * 3
+            )
+
+        assert len(associations) == 2500 * 3 * 2
+        assert associations[:3] == [
+            (0, Definitions.COMPANY_TO_CONTACT, 5000000 + index) for index in range(3)
+        ]
+        assert associations[-1] == (2499, Definitions.COMPANY_TO_DEAL, 5000002)
+
+
+class TestCreateMany(object):
+    def test_chunks(self, associations_client, mock_connection):
+        mock_connection.set_response(204, "")
+        associations = [
+            (index, 100 + index, Definitions.CONTACT_TO_COMPANY) for index in range(3)
+        ]
+        report = associations_client.create_many(iter(associations), batch_size=2)
+
+        assert report.ok
+        assert [result.record for result in report] == associations
+        mock_connection.assert_num_requests(2)
+        mock_connection.assert_has_request(
+            "PUT",
+            "/crm-associations/v1/associations/create-batch?",
+            [
+                {
+                    "fromObjectId": 2,
+                    "toObjectId": 102,
+                    "category": "HUBSPOT_DEFINED",
+                    "definitionId": 1,
+                }
+            ],
+        )
+
+    def test_invalid_associations_are_isolated(self):
+        associations = [(index, 100 + index, 1) for index in range(10)]
+        associations[3] = (3, 103, 999)
+        associations[8] = (8, 108, 998)
+        with MockHubspot() as mock:
+            client = CRMAssociationsClient(api_key="key", api_base=mock.url)
+            report = client.delete_many(associations, max_workers=2)
+
+        assert [result.index for result in report.failed] == [3, 8]
+        assert report.failed[0].record == (3, 103, 999)
+        assert "Invalid definitionId" in report.failed[0].message
+        assert len(report.succeeded) == 8
+        assert all(path.endswith("/delete-batch") for _, path in mock.requests)
+
+    def test_errors_are_reported_per_association(
+        self, associations_client, mock_connection
+    ):
+        associations_client.options["number_retries"] = 0
+        mock_connection.set_response(500, "{}")
+        report = associations_client.create_many(
+            [(1, 2, Definitions.DEAL_TO_COMPANY)] * 2
+        )
+
+        assert not report.ok
+        assert [result.index for result in report.failed] == [0, 1]
+        assert isinstance(report.failed[0].error, HubspotServerError)
+        mock_connection.assert_num_requests(1)
+
+    def test_only_bad_requests_are_split(self, associations_client, mock_connection):
+        mock_connection.set_response(403, "{}")
+        report = associations_client.create_many(
+            [(index, 100 + index, Definitions.DEAL_TO_COMPANY) for index in range(4)],
+            batch_size=2,
+        )
+
+        assert [result.index for result in report.failed] == [0, 1, 2, 3]
+        assert isinstance(report.failed[0].error, HubspotBadRequest)
+        mock_connection.assert_num_requests(2)
@@ -2,7 +2,7 @@ import json
 import pytest
 from unittest.mock import Mock, patch
 from hubspot3 import ecommerce_bridge
-from hubspot3.error import HubspotBadConfig
+from hubspot3.error import HubspotBadConfig, HubspotBadRequest
 
 
 DUMMY_PROPERTY_MAPPINGS = {
@@ -82,10 +82,13 @@ def test_send_sync_messages(
         for i in range(0, num_messages, max_messages)
     ]
 
-    assert (
-        ecommerce_bridge_client.send_sync_messages(object_type, messages, store_id)
-        is None
+    report = ecommerce_bridge_client.send_sync_messages(
+        object_type, iter(messages), store_id
     )
+    assert report.ok
+    assert [result.size for result in report] == [
+        len(data["messages"]) for data in expected_requests
+    ]
     mock_connection.assert_num_requests(expected_request_count)
     for data in expected_requests:
         mock_connection.assert_has_request(
@@ -93,6 +96,64 @@ def test_send_sync_messages(
         )
 
 
+def test_send_sync_messages_reports_retries_and_failures(
+    monkeypatch, ecommerce_bridge_client, mock_connection
+):
+    monkeypatch.setattr(ecommerce_bridge, "MAX_ECOMMERCE_BRIDGE_SYNC_MESSAGES", 1)
+    monkeypatch.setattr(ecommerce_bridge_client, "sleep_multiplier", 0)
+    mock_connection.set_responses(
+        [(500, ""), (204, ""), (400, ""), (204, ""), (204, "")]
+    )
+    messages = [{"action": "DELETE", "externalObjectId": str(i)} for i in range(4)]
+
+    report = ecommerce_bridge_client.send_sync_messages(
+        "CONTACT", messages, max_workers=1, raise_on_error=False
+    )
+    mock_connection.assert_num_requests(5)
+    assert not report.ok
+    assert [result.index for result in report.retried] == [0]
+    assert [result.index for result in report.failed] == [1]
+    assert [result.index for result in report.succeeded] == [0, 2, 3]
+
+
+def test_send_sync_messages_raises_the_first_error(
+    monkeypatch, ecommerce_bridge_client, mock_connection
+):
+    monkeypatch.setattr(ecommerce_bridge, "MAX_ECOMMERCE_BRIDGE_SYNC_MESSAGES", 1)
+    mock_connection.set_responses([(204, ""), (403, ""), (204, "")])
+    messages = [{"action": "DELETE", "externalObjectId": str(i)} for i in range(3)]
+
+    with pytest.raises(HubspotBadRequest):
+        ecommerce_bridge_client.send_sync_messages("CONTACT", messages)
+    mock_connection.assert_num_requests(2)
+
+
+def test_send_sync_messages_are_only_retried_per_chunk(
+    monkeypatch, ecommerce_bridge_client, mock_connection
+):
+    monkeypatch.setattr(ecommerce_bridge_client, "sleep_multiplier", 0)
+    mock_connection.set_response(500, "")
+    messages = [{"action": "DELETE", "externalObjectId": "1"}]
+
+    report = ecommerce_bridge_client.send_sync_messages(
+        "CONTACT", messages, raise_on_error=False, retry_on_post=True
+    )
+    assert [result.attempts for result in report.failed] == [3]
+    mock_connection.assert_num_requests(3)
+
+
+def test_send_sync_messages_concurrently(ecommerce_bridge_client, mock_connection):
+    mock_connection.set_response(204, "")
+    messages = ({"action": "DELETE", "externalObjectId": str(i)} for i in range(1000))
+
+    report = ecommerce_bridge_client.send_sync_messages(
+        "CONTACT", messages, max_workers=3
+    )
+    assert report.ok
+    assert [result.index for result in report] == [0, 1, 2, 3, 4]
+    mock_connection.assert_num_requests(5)
+
+
 @pytest.mark.parametrize(
     "subpath, include_resolved, error_type, object_type, starting_page, limit, num_errors, max_errors, "
     "expected_pages",
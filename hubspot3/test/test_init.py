@@ -56,3 +56,57 @@ def test_create_hubspot3_client():
     assert isinstance(hubspot.owners, OwnersClient)
     assert isinstance(hubspot.prospects, ProspectsClient)
     assert isinstance(hubspot.settings, SettingsClient)
+
+
+def test_clients_are_memoized():
+    hubspot = Hubspot3(api_key=TEST_KEY)
+    contacts = hubspot.contacts
+    assert hubspot.contacts is contacts
+    assert hubspot.deals is not contacts
+    assert (
+        hubspot.deals.options["connection_pool"] is contacts.options["connection_pool"]
+    )
+
+    hubspot.invalidate_clients()
+    assert hubspot.contacts is not contacts
+    # they keep the object type of the current call on the instance
+    assert hubspot.properties is not hubspot.properties
+    assert hubspot.property_groups is not hubspot.property_groups
+
+
+def test_clients_share_oauth2_tokens():
+    hubspot = Hubspot3(access_token="old-access", refresh_token="old-refresh")
+    hubspot.contacts.access_token = "new-access"
+    hubspot.contacts.refresh_token = "new-refresh"
+    assert hubspot.deals.access_token == "new-access"
+    assert hubspot.deals.refresh_token == "new-refresh"
+
+
+def test_update_credentials_recreates_clients():
+    hubspot = Hubspot3(access_token="old-access")
+    contacts = hubspot.contacts
+    contacts.access_token = "refreshed-access"
+
+    hubspot.update_credentials(access_token="other-access")
+    assert hubspot.access_token == "other-access"
+    assert hubspot.contacts is not contacts
+    assert hubspot.contacts.access_token == "other-access"
+    with pytest.raises(HubspotBadConfig):
+        hubspot.update_credentials(password="secret")
+
+
+def test_oauth2_client_keeps_the_shared_tokens():
+    hubspot = Hubspot3(access_token="A", refresh_token="R")
+    hubspot.deals.refresh_token = "R2"
+    hubspot.deals.access_token = "A2"
+
+    assert hubspot.oauth2.access_token is None
+    # a client that didn't cache the tokens yet
+    assert hubspot.contacts.access_token == "A2"
+    assert hubspot.contacts.refresh_token == "R2"
+
+
+def test_oauth2_token_setter_without_getter():
+    hubspot = Hubspot3(access_token="A", oauth2_token_setter=lambda *args: None)
+    with pytest.raises(HubspotBadConfig):
+        hubspot.deals
@@ -0,0 +1,203 @@
+"""
+testing hubspot3.instrumentation
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from hubspot3.base import BaseClient
+from hubspot3.companies import CompaniesClient
+from hubspot3.connection_pool import ConnectionPool
+from hubspot3.contacts import ContactsClient
+from hubspot3.deals import DealsClient
+from hubspot3.error import HubspotServerError, HubspotTimeout
+from hubspot3.instrumentation import (
+    EndpointPath,
+    Instrumentation,
+    get_endpoint_template,
+)
+from hubspot3.test.globals import TEST_KEY
+from hubspot3.test.mock_hubspot import MockHubspot
+
+
+class RecordingInstrumentation(Instrumentation):
+    def __init__(self):
+        self.calls = []
+
+    def before_request(self, event):
+        self.calls.append(("before", event))
+
+    def after_request(self, event):
+        self.calls.append(("after", event))
+
+    def request_failed(self, event, exception):
+        self.calls.append(("failed", event, exception))
+
+
+@pytest.mark.parametrize(
+    "path, template",
+    [
+        ("contacts/v1/contact/vid/123/profile", "contacts/v1/contact/vid/{id}/profile"),
+        ("deals/v1/deal/paged", "deals/v1/deal/paged"),
+        (
+            "crm-associations/v1/associations/42/HUBSPOT_DEFINED/2",
+            "crm-associations/v1/associations/{id}/HUBSPOT_DEFINED/{id}",
+        ),
+        (
+            "files/v3/files/0b9e4b6a-1c2d-4e5f-8a9b-0c1d2e3f4a5b",
+            "files/v3/files/{id}",
+        ),
+    ],
+)
+def test_get_endpoint_template(path, template):
+    assert get_endpoint_template(path) == template
+
+
+def test_endpoint_path():
+    path = EndpointPath("contact/email/{email}/profile", email="hello@example.com")
+    assert path == "contact/email/hello@example.com/profile"
+    assert path.template == "contact/email/{email}/profile"
+
+
+def test_endpoint_templates_of_client_methods(mock_connection):
+    instrumentation = RecordingInstrumentation()
+    client = ContactsClient(disable_auth=True, instrumentation=instrumentation)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    mock_connection.set_response(200, "{}")
+    client.get_by_email("hello@example.com")
+    client.get_by_id(123)
+
+    endpoints = [call[1].endpoint for call in instrumentation.calls[1::2]]
+    assert endpoints == [
+        "contacts/v1/contact/email/{email}/profile",
+        "contacts/v1/contact/vid/{contact_id}/profile",
+    ]
+    assert instrumentation.calls[1][1].url.startswith(
+        "/contacts/v1/contact/email/hello@example.com/profile"
+    )
+
+
+def test_retries_are_logged_with_their_endpoint(monkeypatch, caplog):
+    monkeypatch.setattr(BaseClient, "sleep_multiplier", 0)
+    with MockHubspot(error_rate=1.0) as mock:
+        client = DealsClient(api_key=TEST_KEY, api_base=mock.url, number_retries=1)
+        with pytest.raises(HubspotServerError):
+            client.get(123)
+
+    (record,) = [record for record in caplog.records if "retrying" in record.message]
+    assert record.endpoint == "deals/v1/deal/{deal_id}"
+    assert record.attempt == 1
+
+
+def test_successful_requests_are_reported():
+    first, second = RecordingInstrumentation(), RecordingInstrumentation()
+    with MockHubspot(records=300) as mock:
+        client = DealsClient(
+            api_key=TEST_KEY,
+            api_base=mock.url,
+            connection_pool=ConnectionPool(),
+            instrumentation=[first, second],
+        )
+        client.get_all()
+
+    assert first.calls == second.calls
+    assert [call[0] for call in first.calls] == ["before", "after"] * 2
+    event = first.calls[1][1]
+    assert event.method == "GET"
+    assert event.endpoint == "deals/v1/deal/paged"
+    assert event.url.startswith("/deals/v1/deal/paged?") and TEST_KEY not in event.url
+    assert event.attempt == 1
+    assert event.status == 200
+    assert 0 < event.time_to_first_byte <= event.total_time
+    assert 0 < event.response_size < event.decoded_size
+    assert event.compression_ratio < 1
+
+
+def test_failed_attempts_are_reported(monkeypatch):
+    monkeypatch.setattr(BaseClient, "sleep_multiplier", 0)
+    instrumentation = RecordingInstrumentation()
+    with MockHubspot(error_rate=1.0) as mock:
+        client = DealsClient(
+            api_key=TEST_KEY, api_base=mock.url, instrumentation=instrumentation
+        )
+        with pytest.raises(HubspotServerError):
+            client.get_all()
+
+    failures = [call for call in instrumentation.calls if call[0] == "failed"]
+    assert [failure[1].attempt for failure in failures] == [1, 2, 3]
+    assert all(failure[1].status == 502 for failure in failures)
+    assert isinstance(failures[0][2], HubspotServerError)
+
+
+def test_attempts_without_response_are_reported(mock_connection):
+    instrumentation = RecordingInstrumentation()
+    client = BaseClient(
+        disable_auth=True, instrumentation=instrumentation, number_retries=0
+    )
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    mock_connection.getresponse.side_effect = TimeoutError()
+    with pytest.raises(HubspotTimeout):
+        client._call("contacts/123")
+
+    _, event, exception = instrumentation.calls[-1]
+    assert event.status is None
+    assert event.endpoint == "contacts/{id}"
+    assert event.total_time is not None
+    assert isinstance(exception, HubspotTimeout)
+
+
+def test_streamed_responses_are_reported_once_read():
+    instrumentation = RecordingInstrumentation()
+    with MockHubspot(records=10) as mock:
+        client = CompaniesClient(
+            api_key=TEST_KEY, api_base=mock.url, instrumentation=instrumentation
+        )
+        companies = client.iter_all(stream=True)
+        next(companies)
+        assert [call[0] for call in instrumentation.calls] == ["before"]
+        list(companies)
+
+    _, event = instrumentation.calls[-1]
+    assert event.status == 200
+    assert 0 < event.response_size < event.decoded_size
+
+
+def test_prometheus_instrumentation():
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from hubspot3.instrumentation import PrometheusInstrumentation
+
+    registry = prometheus_client.CollectorRegistry()
+    with MockHubspot(records=10) as mock:
+        client = DealsClient(
+            api_key=TEST_KEY,
+            api_base=mock.url,
+            instrumentation=PrometheusInstrumentation(registry=registry),
+        )
+        client.get_all()
+    labels = {"method": "GET", "endpoint": "deals/v1/deal/paged", "status": "200"}
+    assert registry.get_sample_value("hubspot3_requests_total", labels) == 1
+
+
+def test_opentelemetry_instrumentation():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+    from hubspot3.instrumentation import OpenTelemetryInstrumentation
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    with MockHubspot(records=10) as mock:
+        client = DealsClient(
+            api_key=TEST_KEY,
+            api_base=mock.url,
+            instrumentation=OpenTelemetryInstrumentation(provider.get_tracer("test")),
+        )
+        client.get_all()
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "GET deals/v1/deal/paged"
+    assert span.attributes["http.response.status_code"] == 200
@@ -125,6 +125,33 @@ class TestLinesClient(object):
 
         assert response == [{"id": 1642736}, {"id": 1642767}, {"id": 1642796}]
 
+    def test_iter_all(self, lines_client, mock_connection):
+        pages = [
+            {
+                "objects": [
+                    {"objectId": 1, "properties": {}, "isDeleted": False},
+                    {"objectId": 2, "properties": {}, "isDeleted": True},
+                ],
+                "hasMore": True,
+                "offset": 2,
+            },
+            {
+                "objects": [
+                    {"objectId": 3, "properties": {}, "isDeleted": False},
+                    {"objectId": 4, "properties": {}, "isDeleted": False},
+                ],
+                "hasMore": True,
+                "offset": 4,
+            },
+        ]
+        mock_connection.set_responses([(200, json.dumps(page)) for page in pages])
+
+        line_items = lines_client.iter_all(limit=2)
+        assert next(line_items) == {"id": 1}
+        mock_connection.assert_num_requests(1)
+        assert list(line_items) == [{"id": 3}]
+        mock_connection.assert_num_requests(2)
+
     @patch("hubspot3.lines.CRMAssociationsClient")
     def test_link_line_item_to_deal(self, mock_associations_client, lines_client):
         mock_instance = mock_associations_client.return_value
@@ -0,0 +1,124 @@
+"""
+testing hubspot3.mirror
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from hubspot3.error import HubspotNotFound
+from hubspot3.mirror import CRMMirror
+
+
+@pytest.fixture
+def hubspot():
+    hubspot = MagicMock()
+    hubspot.contacts.iter_all.return_value = iter(
+        [{"id": 1, "email": "Ada@Example.com", "firstname": "Ada"}]
+    )
+    hubspot.companies.iter_all.return_value = iter(
+        [{"id": 10, "domain": "example.com"}, {"id": 11, "domain": "example.com"}]
+    )
+    hubspot.deals.iter_all.return_value = iter([{"id": 20, "dealname": "Big"}])
+    hubspot.owners.get_owners.return_value = [
+        {
+            "id": "30",
+            "email": "o@x.com",
+            "firstName": "Olga",
+            "lastName": "Owner",
+            "userId": 9,
+            "archived": False,
+        }
+    ]
+    return hubspot
+
+
+@pytest.fixture
+def mirror(hubspot, tmp_path):
+    with CRMMirror(hubspot, str(tmp_path / "mirror.sqlite")) as mirror:
+        yield mirror
+
+
+def test_first_sync_loads_everything(mirror, hubspot):
+    assert mirror.sync() == {"contacts": 1, "companies": 2, "deals": 1, "owners": 1}
+    hubspot.contacts.iter_all.assert_called_once_with(
+        extra_properties=["lastmodifieddate", "email"]
+    )
+    hubspot.companies.iter_all.assert_called_once_with(
+        extra_properties=["hs_lastmodifieddate", "domain"]
+    )
+
+    assert mirror.get_contact(1)["firstname"] == "Ada"
+    assert mirror.get_contact_by_email("ada@example.COM")["id"] == 1
+    companies = mirror.get_companies_by_domain("example.com")
+    assert [company["id"] for company in companies] == [10, 11]
+    assert mirror.get_deal("20")["dealname"] == "Big"
+    assert mirror.get_owner(30)["email"] == "o@x.com"
+    assert mirror.get_owner_by_email("O@x.com")["id"] == "30"
+    hubspot.contacts.get_by_id.assert_not_called()
+    hubspot.owners.get_owner_by_id.assert_not_called()
+
+
+def test_changes_are_merged_into_stored_objects(mirror, hubspot):
+    mirror.sync(["contacts"])
+    hubspot.contacts.iter_recently_modified.return_value = iter(
+        [
+            {
+                "vid": 1,
+                "properties": {
+                    "lastmodifieddate": {"value": "9999999999999"},
+                    "firstname": {"value": "Augusta"},
+                },
+            }
+        ]
+    )
+
+    assert mirror.sync(["contacts"]) == {"contacts": 1}
+    hubspot.contacts.iter_recently_modified.assert_called_once_with(
+        extra_properties=["lastmodifieddate", "email"]
+    )
+    contact = mirror.get_contact(1)
+    assert contact["firstname"] == "Augusta"
+    assert contact["email"] == "Ada@Example.com"
+
+
+def test_lookups_read_through(mirror, hubspot):
+    hubspot.deals.get.return_value = {
+        "dealId": 21,
+        "properties": {"dealname": {"value": "New"}},
+    }
+
+    assert mirror.get_deal(21) == {"id": 21, "dealname": "New"}
+    assert mirror.get_deal(21) == {"id": 21, "dealname": "New"}
+    hubspot.deals.get.assert_called_once_with(21)
+
+    hubspot.companies.search_domain.return_value = {
+        "results": [{"companyId": 12, "properties": {"domain": {"value": "new.io"}}}]
+    }
+    assert mirror.get_companies_by_domain("new.io") == [{"id": 12, "domain": "new.io"}]
+    assert mirror.get_company(12) == {"id": 12, "domain": "new.io"}
+    hubspot.companies.get.assert_not_called()
+
+
+def test_missing_objects(mirror, hubspot):
+    hubspot.contacts.get_by_email.side_effect = HubspotNotFound(None, None)
+    hubspot.owners.get_owner_by_id.return_value = None
+
+    assert mirror.get_contact_by_email("nobody@example.com") is None
+    assert mirror.get_owner(31) is None
+
+
+def test_reload_removes_deleted_objects(mirror, hubspot):
+    mirror.sync(["companies", "owners"])
+    hubspot.companies.iter_all.return_value = iter([{"id": 11}])
+    hubspot.owners.get_owners.return_value = []
+
+    assert mirror.reload(["companies", "owners"]) == {"companies": 1, "owners": 0}
+    assert mirror.find("companies", "id", 10) == []
+    assert mirror.find("companies", "id", 11) == [{"id": 11, "domain": "example.com"}]
+    assert mirror.find("owners", "id", 30) == []
+
+
+def test_unknown_object_type(mirror):
+    with pytest.raises(ValueError):
+        mirror.sync(["widgets"])
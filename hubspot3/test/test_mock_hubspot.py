@@ -0,0 +1,82 @@
+"""
+testing the client against hubspot3.test.mock_hubspot, over real sockets
+"""
+
+import pytest
+
+from hubspot3.base import BaseClient
+from hubspot3.companies import CompaniesClient
+from hubspot3.connection_pool import ConnectionPool
+from hubspot3.contacts import ContactsClient
+from hubspot3.crm_associations import CRMAssociationsClient
+from hubspot3.deals import DealsClient
+from hubspot3.ecommerce_bridge import EcommerceBridgeClient
+from hubspot3.error import HubspotServerError
+from hubspot3.test.globals import TEST_KEY
+from hubspot3.test.mock_hubspot import MockHubspot
+from hubspot3.tickets import TicketsClient
+
+
+@pytest.fixture
+def mock_hubspot():
+    with MockHubspot(records=260) as mock:
+        yield mock
+
+
+def create(client_class, mock, **options):
+    return client_class(
+        api_key=TEST_KEY,
+        api_base=mock.url,
+        connection_pool=ConnectionPool(),
+        **options,
+    )
+
+
+@pytest.mark.parametrize(
+    "client_class, id_key",
+    [(DealsClient, "id"), (CompaniesClient, "id"), (ContactsClient, "id")],
+)
+def test_get_all_pages_through_gzipped_responses(mock_hubspot, client_class, id_key):
+    client = create(client_class, mock_hubspot)
+    records = client.get_all()
+    assert len(records) == 260
+    assert len({record[id_key] for record in records}) == 260
+    assert mock_hubspot.statuses[200] == len(mock_hubspot.requests)
+
+
+def test_streamed_pages_match_decoded_pages(mock_hubspot):
+    client = create(CompaniesClient, mock_hubspot)
+    assert list(client.iter_all(stream=True)) == client.get_all()
+
+
+def test_tickets_and_associations(mock_hubspot):
+    assert len(create(TicketsClient, mock_hubspot).get_all()) == 260
+    associations = create(CRMAssociationsClient, mock_hubspot).get_all(1, 2)
+    assert associations == [5000000 + index for index in range(260)]
+
+
+def test_bulk_writes(mock_hubspot):
+    contacts = [{"email": f"contact{index}@example.com"} for index in range(250)]
+    report = create(ContactsClient, mock_hubspot).create_or_update_batch(contacts)
+    assert report.ok and len(report.succeeded) == 250
+
+    messages = [{"action": "UPSERT", "externalObjectId": i} for i in range(450)]
+    report = create(EcommerceBridgeClient, mock_hubspot).send_sync_messages(
+        "CONTACT", messages, store_id="default"
+    )
+    assert report.ok and len(report.results) == 3
+
+
+def test_injected_failures_are_retried(monkeypatch):
+    monkeypatch.setattr(BaseClient, "sleep_multiplier", 0)
+    with MockHubspot(records=600, rate_limit_rate=0.3, error_rate=0.2, seed=3) as mock:
+        client = create(DealsClient, mock, number_retries=6)
+        assert len(client.get_all()) == 600
+    assert mock.statuses[429] and mock.statuses[502]
+
+
+def test_failures_are_raised_without_retries():
+    with MockHubspot(error_rate=1.0) as mock:
+        client = create(DealsClient, mock, number_retries=0)
+        with pytest.raises(HubspotServerError):
+            client.get_all()
@@ -0,0 +1,274 @@
+"""
+testing hubspot3.pagination
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from hubspot3.contacts import ContactsClient
+from hubspot3.deals import DealsClient
+from hubspot3.error import HubspotServerError
+from hubspot3.owners import OwnersClient
+from hubspot3.pagination import (
+    Checkpoint,
+    FileCheckpointStore,
+    SQLiteCheckpointStore,
+    prefetch,
+)
+from hubspot3.test.mock_hubspot import MockHubspot
+
+
+def test_prefetch_without_depth_passes_pages_through():
+    pages = iter([1, 2, 3])
+    assert list(prefetch(pages, 0)) == [1, 2, 3]
+
+
+def test_prefetch_reads_ahead():
+    fetched = []
+    next_page_requested = threading.Event()
+
+    def pages():
+        for page in range(3):
+            fetched.append(page)
+            if page == 1:
+                next_page_requested.set()
+            yield page
+
+    iterator = prefetch(pages(), 2)
+    assert next(iterator) == 0
+    # the second page is fetched while the first one is still being processed
+    assert next_page_requested.wait(timeout=5)
+    assert list(iterator) == [1, 2]
+    assert fetched == [0, 1, 2]
+
+
+def test_prefetch_reraises_errors():
+    def pages():
+        yield 1
+        raise ValueError("broken page")
+
+    iterator = prefetch(pages(), 1)
+    assert next(iterator) == 1
+    with pytest.raises(ValueError):
+        next(iterator)
+
+
+def test_prefetch_stops_producer_when_consumer_leaves():
+    closed = threading.Event()
+
+    def pages():
+        try:
+            page = 0
+            while True:
+                yield page
+                page += 1
+        finally:
+            closed.set()
+
+    iterator = prefetch(pages(), 1)
+    assert next(iterator) == 0
+    iterator.close()
+    assert closed.wait(timeout=5)
+
+
+def test_deals_iter_all_prefetches_pages(mock_connection):
+    client = DealsClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    pages = [
+        {
+            "deals": [{"dealId": deal_id, "isDeleted": False, "properties": {}}],
+            "hasMore": deal_id < 3,
+            "offset": deal_id,
+        }
+        for deal_id in range(1, 4)
+    ]
+    mock_connection.set_responses([(200, json.dumps(page)) for page in pages])
+
+    deals = list(client.iter_all(prefetch_pages=2))
+    assert [deal["id"] for deal in deals] == [1, 2, 3]
+    mock_connection.assert_num_requests(3)
+
+
+def test_deals_iter_recently_modified_is_lazy(mock_connection):
+    client = DealsClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    pages = [
+        {
+            "results": [
+                {"dealId": deal_id, "isDeleted": False, "properties": {}}
+                for deal_id in range(start, start + 2)
+            ],
+            "hasMore": True,
+            "offset": start + 2,
+        }
+        for start in (0, 2)
+    ]
+    mock_connection.set_responses([(200, json.dumps(page)) for page in pages])
+
+    deals = client.iter_recently_modified(limit=3, since=1)
+    assert next(deals)["id"] == 0
+    mock_connection.assert_num_requests(1)
+    assert [deal["id"] for deal in deals] == [1, 2]
+    mock_connection.assert_num_requests(2)
+    mock_connection.assert_has_request(
+        "GET", "/deals/v1/deal/recent/modified", offset=2, since=1
+    )
+
+
+def test_owners_follow_after_cursor(mock_connection):
+    client = OwnersClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    pages = [
+        {"results": [{"id": "1"}, {"id": "2"}], "paging": {"next": {"after": "2"}}},
+        {"results": [{"id": "3"}]},
+    ]
+    mock_connection.set_responses([(200, json.dumps(page)) for page in pages])
+
+    owners = client.get_owners(prefetch_pages=1)
+    assert [owner["id"] for owner in owners] == ["1", "2", "3"]
+    mock_connection.assert_has_request("GET", "/crm/v3/owners", after="2")
+
+
+def test_owners_respect_limit(mock_connection):
+    client = OwnersClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    page = {"results": [{"id": "1"}, {"id": "2"}], "paging": {"next": {"after": "2"}}}
+    mock_connection.set_response(200, json.dumps(page))
+
+    assert client.get_owners(limit=1) == [{"id": "1"}]
+    mock_connection.assert_num_requests(1)
+    mock_connection.assert_has_request("GET", "/crm/v3/owners", limit=1)
+
+
+def test_owners_limit_is_not_the_page_size(mock_connection):
+    client = OwnersClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    pages = [
+        {
+            "results": [{"id": str(index)} for index in range(start, start + 500)],
+            "paging": {"next": {"after": str(start + 500)}},
+        }
+        for start in (0, 500)
+    ]
+    mock_connection.set_responses([(200, json.dumps(page)) for page in pages])
+
+    owners = client.get_owners(limit=600)
+    assert [owner["id"] for owner in owners] == [str(index) for index in range(600)]
+    mock_connection.assert_num_requests(2)
+    mock_connection.assert_has_request("GET", "/crm/v3/owners", limit=500)
+    mock_connection.assert_has_request("GET", "/crm/v3/owners", after="500")
+
+
+@pytest.mark.parametrize("store_type", ["file", "sqlite"])
+def test_checkpoint_stores(tmp_path, store_type):
+    if store_type == "file":
+        store = FileCheckpointStore(str(tmp_path / "checkpoints.json"))
+    else:
+        store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+    assert store.load("deals") is None
+    store.save("deals", {"cursor": 250, "query": {}})
+    assert store.load("deals") == {"cursor": 250, "query": {}}
+    store.delete("deals")
+    assert store.load("deals") is None
+
+
+def test_checkpoint_rejects_other_queries(tmp_path):
+    store = FileCheckpointStore(str(tmp_path / "checkpoints.json"))
+    Checkpoint(store, "export", {"limit": 250}).save(10)
+    assert Checkpoint(store, "export", {"limit": 250}).resume(0) == 10
+    with pytest.raises(ValueError):
+        Checkpoint(store, "export", {"limit": 100}).resume(0)
+
+
+def test_deals_iter_all_resumes_from_checkpoint(tmp_path, mock_connection):
+    client = DealsClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+    first_page = {
+        "deals": [{"dealId": 1, "isDeleted": False, "properties": {}}],
+        "hasMore": True,
+        "offset": 1,
+    }
+    mock_connection.set_responses([(200, json.dumps(first_page)), (500, "{}")])
+
+    deals = client.iter_all(
+        checkpoint_store=store, checkpoint_key="deals", number_retries=0
+    )
+    assert next(deals)["id"] == 1
+    with pytest.raises(HubspotServerError):
+        next(deals)
+    assert store.load("deals")["cursor"] == 1
+
+    last_page = {
+        "deals": [{"dealId": 2, "isDeleted": False, "properties": {}}],
+        "hasMore": False,
+        "offset": 2,
+    }
+    mock_connection.set_responses([(200, json.dumps(last_page))])
+    deals = client.iter_all(checkpoint_store=store, checkpoint_key="deals")
+    assert [deal["id"] for deal in deals] == [2]
+    mock_connection.assert_has_request("GET", "/deals/v1/deal/paged", offset=1)
+    assert store.load("deals") is None
+
+
+def test_contacts_iter_all_resumes_from_checkpoint(tmp_path, mock_connection):
+    client = ContactsClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    client.get_batch = Mock(side_effect=lambda vids, **_: [{"id": vids[0]}])
+    store = FileCheckpointStore(str(tmp_path / "checkpoints.json"))
+    checkpoint = Checkpoint(
+        store,
+        None,
+        {
+            "endpoint": "contacts/lists/all/contacts/all",
+            "count": 100,
+            "properties": client._get_batch_properties(None),
+        },
+    )
+    checkpoint.save(7)
+    page = {"contacts": [{"vid": 8}], "has-more": False, "vid-offset": 8}
+    mock_connection.set_response(200, json.dumps(page))
+
+    assert client.get_all(checkpoint_store=store) == [{"id": 8}]
+    mock_connection.assert_has_request(
+        "GET", "/contacts/v1/lists/all/contacts/all", vidOffset=7
+    )
+    assert store.load(checkpoint.key) is None
+
+
+EXPORT_CONTACTS = """
+import sys
+from itertools import islice
+from hubspot3.contacts import ContactsClient
+from hubspot3.pagination import FileCheckpointStore
+
+client = ContactsClient(api_key="key", api_base=sys.argv[1])
+contacts = client.iter_all(
+    extra_properties=["lead_source", "industry", "jobtitle", "lifecyclestage"],
+    checkpoint_store=FileCheckpointStore(sys.argv[2]),
+)
+print(len(list(islice(contacts, int(sys.argv[3])))))
+"""
+
+
+def test_contacts_iter_all_resumes_in_another_process(tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    path = str(tmp_path / "checkpoints.json")
+
+    def export(url, hash_seed, limit):
+        env = dict(os.environ, PYTHONHASHSEED=str(hash_seed), PYTHONPATH=root)
+        output = subprocess.check_output(
+            [sys.executable, "-c", EXPORT_CONTACTS, url, path, str(limit)], env=env
+        )
+        return int(output)
+
+    with MockHubspot(records=250) as mock:
+        assert export(mock.url, 1, 150) == 150
+        # the first page was consumed completely, so the export continues with the second
+        assert export(mock.url, 2, 1000) == 150
@@ -9,6 +9,7 @@ from typing import Dict
 import pytest
 
 from hubspot3 import properties
+from hubspot3.schema_cache import SchemaCache
 from hubspot3.globals import (
     OBJECT_TYPE_CONTACTS,
     OBJECT_TYPE_COMPANIES,
@@ -178,3 +179,76 @@ class TestPropertiesClient:
             f"/properties/v1/deals/properties/named/{input_data['code']}?",
         )
         assert resp == response_body
+
+    def test_get_all_is_cached(self, mock_connection, properties_input_data) -> None:
+        cache = SchemaCache()
+        client = properties.PropertiesClient(disable_auth=True, schema_cache=cache)
+        client.options["connection_type"] = Mock(return_value=mock_connection)
+        mock_connection.set_response(200, json.dumps([{"name": "my_field"}]))
+
+        assert client.get_all(OBJECT_TYPE_DEALS) == [{"name": "my_field"}]
+        assert client.get_all(OBJECT_TYPE_DEALS) == [{"name": "my_field"}]
+        mock_connection.assert_num_requests(1)
+
+        client.update(OBJECT_TYPE_DEALS, **properties_input_data)
+        assert cache.peek(SchemaCache.PROPERTIES, OBJECT_TYPE_DEALS) is None
+        mock_connection.assert_num_requests(2)
+
+    def test_validate_schema(
+        self, properties_client, mock_connection, properties_input_data
+    ) -> None:
+        cache = SchemaCache()
+        properties_client.options["schema_cache"] = cache
+        cache.get(SchemaCache.PROPERTIES, OBJECT_TYPE_CONTACTS, lambda: [])
+        cache.get(SchemaCache.GROUPS, OBJECT_TYPE_CONTACTS, lambda: [{"name": "info"}])
+        mock_connection.set_responses(
+            [(200, json.dumps([])), (200, json.dumps([{"name": "info"}]))] * 2
+        )
+
+        with pytest.raises(ValueError) as value_error:
+            properties_client.update(OBJECT_TYPE_CONTACTS, **properties_input_data)
+        assert "Unknown contacts property 'my_field'" in str(value_error)
+        with pytest.raises(ValueError) as value_error:
+            properties_client.create(
+                OBJECT_TYPE_CONTACTS, group_code="custom", **properties_input_data
+            )
+        assert "Unknown contacts property group 'custom'" in str(value_error)
+        # the cached schemas didn't allow the calls, so they were fetched again
+        mock_connection.assert_num_requests(4)
+
+    def test_filter_existing(self, properties_client, mock_connection) -> None:
+        properties_client.options["schema_cache"] = SchemaCache()
+        mock_connection.set_response(
+            200, json.dumps([{"name": "dealname"}, {"name": "amount"}])
+        )
+
+        names = ["amount", "removed", "dealname"]
+        assert properties_client.filter_existing(OBJECT_TYPE_DEALS, names) == [
+            "amount",
+            "dealname",
+        ]
+        assert properties_client.filter_existing(OBJECT_TYPE_DEALS, ["x"]) == []
+        mock_connection.assert_num_requests(1)
+
+    def test_validate_schema_refetches_outdated_schemas(
+        self, properties_client, mock_connection, properties_input_data
+    ) -> None:
+        cache = SchemaCache()
+        properties_client.options["schema_cache"] = cache
+        cache.get(SchemaCache.PROPERTIES, OBJECT_TYPE_CONTACTS, lambda: [])
+        cache.get(SchemaCache.GROUPS, OBJECT_TYPE_CONTACTS, lambda: [])
+        mock_connection.set_responses(
+            [
+                (200, json.dumps([{"name": "my_field"}])),
+                (200, json.dumps([{"name": "info"}])),
+                (200, json.dumps({"name": "my_field"})),
+            ]
+        )
+
+        properties_client.update(OBJECT_TYPE_CONTACTS, **properties_input_data)
+        mock_connection.assert_num_requests(3)
+        method, url = mock_connection.request.call_args[0][:2]
+        assert (method, url) == (
+            "PUT",
+            "/properties/v1/contacts/properties/named/my_field?",
+        )
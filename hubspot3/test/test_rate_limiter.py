@@ -0,0 +1,166 @@
+"""
+testing hubspot3.rate_limiter
+"""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from hubspot3 import Hubspot3
+from hubspot3.base import BaseClient
+from hubspot3.error import HubspotRateLimited
+from hubspot3.rate_limiter import FileBackend, RateLimiter, RateLimitState
+from hubspot3.test.globals import TEST_KEY
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("hubspot3.rate_limiter.time.time", lambda: now[0])
+    return now
+
+
+def test_reserve_spreads_out_bursts(clock):
+    limiter = RateLimiter(per_second=2, per_ten_seconds=None)
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.5)
+    assert limiter.reserve() == pytest.approx(1.0)
+    clock[0] += 2
+    assert limiter.reserve() == 0
+
+
+def test_reserve_uses_the_slowest_bucket(clock):
+    limiter = RateLimiter(per_second=10, per_ten_seconds=2)
+    limiter.reserve()
+    limiter.reserve()
+    assert limiter.reserve() == pytest.approx(5.0)
+
+
+def test_daily_budget(clock):
+    limiter = RateLimiter()
+    limiter.update_daily_budget(1, clock[0] + 60)
+    assert limiter.reserve() == 0
+    with pytest.raises(HubspotRateLimited):
+        limiter.reserve()
+    clock[0] += 61
+    assert limiter.reserve() == 0
+
+
+def test_file_backend_is_shared(tmp_path, clock):
+    path = str(tmp_path / "limiter.json")
+    first = RateLimiter(per_second=1, per_ten_seconds=None, backend=FileBackend(path))
+    second = RateLimiter(per_second=1, per_ten_seconds=None, backend=FileBackend(path))
+    assert first.reserve() == 0
+    assert second.reserve() == pytest.approx(1.0)
+
+
+def test_client_waits_for_rate_limiter(mock_connection, monkeypatch):
+    sleep = Mock()
+    monkeypatch.setattr("hubspot3.base.time.sleep", sleep)
+    limiter = Mock(reserve=Mock(return_value=0.25))
+    client = BaseClient(disable_auth=True, rate_limiter=limiter)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    mock_connection.set_response(200, "{}")
+
+    client._call("contacts")
+    limiter.reserve.assert_called_once_with()
+    sleep.assert_called_once_with(0.25)
+
+
+def test_client_fails_fast_when_daily_budget_is_exhausted(mock_connection):
+    limiter = RateLimiter()
+    limiter.update_daily_budget(0, datetime.now().timestamp() + 60)
+    client = BaseClient(disable_auth=True, rate_limiter=limiter)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+
+    with pytest.raises(HubspotRateLimited):
+        client._call("contacts")
+    mock_connection.assert_num_requests(0)
+
+
+def test_usage_limits_feed_the_daily_budget(mock_connection, monkeypatch):
+    monkeypatch.setattr(
+        "hubspot3.base.http.client.HTTPSConnection", Mock(return_value=mock_connection)
+    )
+    limiter = RateLimiter()
+    hubspot = Hubspot3(api_key=TEST_KEY, rate_limiter=limiter, connection_pool=False)
+    resets_at = datetime.now() + timedelta(hours=1)
+    mock_connection.set_response(
+        200,
+        json.dumps(
+            [
+                {
+                    "collectedAt": int(datetime.now().timestamp() * 1000),
+                    "currentUsage": 10,
+                    "fetchStatus": "SUCCESS",
+                    "resetsAt": int(resets_at.timestamp() * 1000),
+                    "usageLimit": 11,
+                }
+            ]
+        ),
+    )
+    assert hubspot.usage_limits.calls_remaining == 1
+
+    limiter.reserve()
+    with pytest.raises(HubspotRateLimited):
+        limiter.reserve()
+
+
+def test_rate_limit_state_from_headers(clock):
+    assert RateLimitState.from_headers({"content-type": "application/json"}) is None
+
+    state = RateLimitState.from_headers(
+        {
+            "x-hubspot-ratelimit-max": "100",
+            "x-hubspot-ratelimit-remaining": "0",
+            "x-hubspot-ratelimit-interval-milliseconds": "10000",
+            "x-hubspot-ratelimit-daily": "250000",
+            "x-hubspot-ratelimit-daily-remaining": "1234",
+        }
+    )
+    assert state.max_requests == 100
+    assert state.daily_remaining == 1234
+    assert state.wait_time == pytest.approx(10.0)
+    clock[0] += 4
+    assert state.wait_time == pytest.approx(6.0)
+
+    state = RateLimitState.from_headers(
+        {"retry-after": "3", "x-hubspot-ratelimit-remaining": "0"}
+    )
+    assert state.wait_time == pytest.approx(3.0)
+
+
+def test_client_retries_rate_limited_gets(mock_connection, monkeypatch):
+    sleep = Mock()
+    monkeypatch.setattr("hubspot3.base.time.sleep", sleep)
+    monkeypatch.setattr("hubspot3.base.random.uniform", lambda low, high: high)
+    client = BaseClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    rate_limited = MagicMock(status=429)
+    rate_limited.read.return_value = "{}"
+    rate_limited.getheaders.return_value = [
+        ("Retry-After", "2"),
+        ("X-HubSpot-RateLimit-Remaining", "0"),
+    ]
+    success = MagicMock(status=200)
+    success.read.return_value = "{}"
+    success.getheaders.return_value = [("X-HubSpot-RateLimit-Remaining", "99")]
+    mock_connection.getresponse.side_effect = [rate_limited, success]
+
+    assert client._call("contacts") == {}
+    mock_connection.assert_num_requests(2)
+    assert sleep.call_args[0][0] == pytest.approx(3.0, abs=0.1)
+    assert client.rate_limit_state.remaining == 99
+
+
+def test_client_does_not_retry_rate_limited_posts(mock_connection):
+    client = BaseClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    mock_connection.set_response(429, "{}")
+
+    with pytest.raises(HubspotRateLimited):
+        client._call("contacts", method="POST", data={})
+    mock_connection.assert_num_requests(1)
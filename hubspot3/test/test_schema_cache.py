@@ -0,0 +1,101 @@
+"""
+testing hubspot3.schema_cache
+"""
+
+import json
+import threading
+from unittest.mock import Mock
+
+from hubspot3.property_groups import PropertyGroupsClient
+from hubspot3.schema_cache import SchemaCache
+
+
+def test_schemas_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("hubspot3.schema_cache.time.monotonic", lambda: now[0])
+    cache = SchemaCache(ttl=60)
+    load = Mock(side_effect=[["first"], ["second"]])
+
+    assert cache.get(SchemaCache.PROPERTIES, "deals", load) == ["first"]
+    now[0] += 59
+    assert cache.get(SchemaCache.PROPERTIES, "deals", load) == ["first"]
+    now[0] += 1
+    assert cache.peek(SchemaCache.PROPERTIES, "deals") is None
+    assert cache.get(SchemaCache.PROPERTIES, "deals", load) == ["second"]
+
+
+def test_invalidate():
+    cache = SchemaCache()
+    for kind in (SchemaCache.PROPERTIES, SchemaCache.GROUPS):
+        for object_type in ("contacts", "deals"):
+            cache.get(kind, object_type, lambda: [kind, object_type])
+
+    cache.invalidate(SchemaCache.GROUPS, "deals")
+    assert cache.peek(SchemaCache.GROUPS, "deals") is None
+    assert cache.peek(SchemaCache.GROUPS, "contacts") == ["groups", "contacts"]
+    cache.invalidate(object_type="contacts")
+    assert cache.peek(SchemaCache.PROPERTIES, "contacts") is None
+    assert cache.peek(SchemaCache.PROPERTIES, "deals") == ["properties", "deals"]
+    cache.invalidate()
+    assert cache.peek(SchemaCache.PROPERTIES, "deals") is None
+
+
+def test_concurrent_lookups_load_once():
+    cache = SchemaCache()
+    loading = threading.Event()
+    release = threading.Event()
+
+    def load_schema():
+        loading.set()
+        release.wait()
+        return ["schema"]
+
+    load = Mock(side_effect=load_schema)
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                cache.get(SchemaCache.GROUPS, "contacts", load)
+            )
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    loading.wait()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [["schema"]] * 4
+    load.assert_called_once_with()
+
+
+def test_loads_overlapping_an_invalidation_are_not_kept():
+    cache = SchemaCache()
+
+    def load():
+        cache.invalidate(SchemaCache.PROPERTIES, "deals")
+        return ["outdated"]
+
+    assert cache.get(SchemaCache.PROPERTIES, "deals", load) == ["outdated"]
+    assert cache.peek(SchemaCache.PROPERTIES, "deals") is None
+
+
+def test_property_groups_client(mock_connection):
+    cache = SchemaCache()
+    client = PropertyGroupsClient(disable_auth=True, schema_cache=cache)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    mock_connection.set_response(200, json.dumps([{"name": "custom"}]))
+    cache.get(SchemaCache.PROPERTIES, "deals", lambda: ["properties"])
+
+    assert client.get_all("deals") == [{"name": "custom"}]
+    assert client.get_all("deals") == [{"name": "custom"}]
+    mock_connection.assert_num_requests(1)
+
+    client.delete("deals", "custom")
+    assert cache.peek(SchemaCache.GROUPS, "deals") is None
+    assert cache.peek(SchemaCache.PROPERTIES, "deals") is None
+    mock_connection.assert_has_request(
+        "DELETE", "/properties/v1/deals/groups/named/custom?"
+    )
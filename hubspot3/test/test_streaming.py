@@ -0,0 +1,189 @@
+"""
+testing hubspot3.streaming
+"""
+
+import gzip
+import io
+import json
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from hubspot3.base import BaseClient
+from hubspot3.connection_pool import ConnectionPool
+from hubspot3.deals import DealsClient
+from hubspot3.error import HubspotNotFound
+from hubspot3.streaming import JSONArrayStream
+
+
+PAGE = {
+    "total": 3,
+    "results": [
+        {"id": "1", "properties": {"name": "ünïcödé", "amount": 1250.5}},
+        {"id": "2", "properties": {"name": None, "closed": True}},
+        {"id": "3", "properties": {}},
+    ],
+    "hasMore": True,
+    "offset": 1234567,
+}
+
+
+def split(data, size):
+    return [data[index : index + size] for index in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 100000])
+def test_stream_yields_items_and_values(chunk_size):
+    body = json.dumps(PAGE, indent=2, ensure_ascii=False).encode()
+    page = JSONArrayStream(split(body, chunk_size), "results")
+    assert list(page["results"]) == PAGE["results"]
+    assert page["hasMore"] is True
+    assert page["offset"] == 1234567
+    assert page["total"] == 3
+    assert page.get("missing") is None
+
+
+def test_stream_parses_items_lazily():
+    body = json.dumps(PAGE).encode()
+    chunks = iter(split(body, 16))
+    page = JSONArrayStream(chunks, "results")
+    assert next(page) == PAGE["results"][0]
+    assert next(chunks, None) is not None
+
+
+def test_looking_up_values_first_keeps_the_items():
+    body = json.dumps(PAGE).encode()
+    page = JSONArrayStream(split(body, 5), "results")
+    assert page["offset"] == 1234567
+    assert list(page) == PAGE["results"]
+
+
+def test_stream_without_items():
+    page = JSONArrayStream([b'{"results": [], "hasMore": false}'], "results")
+    assert list(page) == []
+    assert page["hasMore"] is False
+    page = JSONArrayStream([b'{"status": "error"}'], "results")
+    assert list(page) == []
+    assert page["status"] == "error"
+
+
+def test_truncated_stream_raises():
+    body = json.dumps(PAGE).encode()
+    page = JSONArrayStream([body[:-20]], "results")
+    with pytest.raises(ValueError):
+        list(page)
+
+
+def test_closing_the_stream_closes_the_chunks():
+    closed = []
+
+    def chunks():
+        try:
+            yield b'{"results": [1, 2'
+            yield b", 3]}"
+        finally:
+            closed.append(True)
+
+    with JSONArrayStream(chunks(), "results") as page:
+        assert next(page) == 1
+    assert closed == [True]
+
+
+class Response:
+    """a response whose body can only be read incrementally, like HTTPResponse"""
+
+    def __init__(self, body, status=200, headers=()):
+        self.status = status
+        self.reason = "OK" if status < 400 else "Error"
+        self.headers = list(headers)
+        self.file = io.BytesIO(body)
+
+    def getheaders(self):
+        return self.headers
+
+    def read(self, amt=None):
+        return self.file.read(amt)
+
+
+@pytest.fixture
+def streamed_client(mock_connection):
+    client = BaseClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    return client
+
+
+def test_call_stream_decompresses_chunks(streamed_client, mock_connection):
+    body = gzip.compress(json.dumps(PAGE).encode())
+    response = Response(body, headers=[("Content-Encoding", "gzip")])
+    mock_connection.getresponse.return_value = response
+
+    page = streamed_client._call_stream("objects", "results")
+    assert not mock_connection.close.called
+    assert list(page) == PAGE["results"]
+    assert page["offset"] == 1234567
+    assert mock_connection.close.called
+
+
+def test_call_stream_reads_error_bodies(streamed_client, mock_connection):
+    mock_connection.getresponse.return_value = Response(b'{"status": "error"}', 404)
+    with pytest.raises(HubspotNotFound):
+        streamed_client._call_stream("objects", "results")
+    assert mock_connection.close.called
+
+
+def test_call_stream_releases_pooled_connections(mock_connection):
+    pool = ConnectionPool()
+    client = BaseClient(disable_auth=True, connection_pool=pool)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    mock_connection.getresponse.return_value = Response(json.dumps(PAGE).encode())
+
+    page = client._call_stream("objects", "results")
+    assert pool.idle_count() == 0
+    list(page)
+    assert pool.idle_count() == 1
+
+    # a connection with an unread body can't be reused
+    mock_connection.getresponse.return_value = Response(json.dumps(PAGE).encode())
+    page = client._call_stream("objects", "results")
+    next(page)
+    page.close()
+    assert pool.idle_count() == 0
+
+
+def test_gzipped_bodies_are_decompressed_once(streamed_client, mock_connection):
+    body = json.dumps(PAGE).encode()
+    response = MagicMock(status=200)
+    response.getheaders.return_value = [("content-encoding", "gzip")]
+    response.read.return_value = gzip.compress(body)
+    mock_connection.getresponse.return_value = response
+    assert streamed_client._call("objects") == PAGE
+
+
+def test_deals_iter_all_streams_pages(mock_connection):
+    client = DealsClient(disable_auth=True)
+    client.options["connection_type"] = Mock(return_value=mock_connection)
+    pages = [
+        {
+            "deals": [
+                {"dealId": 1, "isDeleted": False, "properties": {}},
+                {"dealId": 2, "isDeleted": True, "properties": {}},
+            ],
+            "hasMore": True,
+            "offset": 2,
+        },
+        {
+            "deals": [{"dealId": 3, "isDeleted": False, "properties": {}}],
+            "hasMore": False,
+            "offset": 3,
+        },
+    ]
+    mock_connection.getresponse.side_effect = [
+        Response(json.dumps(page).encode()) for page in pages
+    ]
+    deals = list(client.iter_all(stream=True))
+    assert [deal["id"] for deal in deals] == [1, 3]
+    mock_connection.assert_num_requests(2)
+    mock_connection.assert_has_request("GET", "/deals/v1/deal/paged?", offset=2)
+
+    with pytest.raises(ValueError):
+        next(client.iter_all(stream=True, prefetch_pages=2))
@@ -0,0 +1,120 @@
+"""
+testing hubspot3.sync
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from hubspot3.pagination import FileCheckpointStore
+from hubspot3.sync import IncrementalSync
+
+NOW = 1600000000000
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FileCheckpointStore(str(tmp_path / "watermarks.json"))
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    monkeypatch.setattr("hubspot3.sync.time.time", lambda: NOW / 1000)
+
+
+def deal(deal_id, modified_at):
+    return {"id": deal_id, "hs_lastmodifieddate": str(modified_at)}
+
+
+def test_first_run_does_a_full_scan(store):
+    hubspot = MagicMock()
+    hubspot.deals.iter_all.return_value = iter([deal(1, 10), deal(2, 20)])
+    sync = IncrementalSync(hubspot, store)
+
+    assert [record["id"] for record in sync.changes("deals")] == [1, 2]
+    hubspot.deals.iter_recently_modified.assert_not_called()
+    assert sync.get_watermark("deals") == {"timestamp": NOW, "ids": []}
+
+
+def test_later_runs_only_emit_changes(store):
+    hubspot = MagicMock()
+    sync = IncrementalSync(hubspot, store)
+    store.save("hubspot3:sync:deals", {"timestamp": NOW - 100, "ids": [1]})
+    hubspot.deals.iter_recently_modified.return_value = [
+        deal(1, NOW - 100),
+        deal(2, NOW - 100),
+        deal(3, NOW - 50),
+        deal(3, NOW - 50),
+    ]
+
+    assert [record["id"] for record in sync.changes("deals")] == [2, 3]
+    hubspot.deals.iter_recently_modified.assert_called_once_with(
+        limit=sync.window_size, since=NOW - 100
+    )
+    hubspot.deals.iter_all.assert_not_called()
+    assert sync.get_watermark("deals") == {"timestamp": NOW - 50, "ids": [3]}
+
+
+def test_overflowing_window_falls_back_to_full_scan(store):
+    hubspot = MagicMock()
+    sync = IncrementalSync(hubspot, store)
+    sync.window_size = 3
+    store.save("hubspot3:sync:deals", {"timestamp": NOW - 100, "ids": []})
+    hubspot.deals.iter_recently_modified.return_value = [
+        deal(1, NOW - 10),
+        deal(2, NOW - 20),
+        deal(3, NOW - 30),
+    ]
+    hubspot.deals.iter_all.return_value = iter([deal(i, 0) for i in range(1, 5)])
+
+    assert [record["id"] for record in sync.changes("deals")] == [1, 2, 3, 4]
+    assert sync.get_watermark("deals") == {"timestamp": NOW, "ids": []}
+
+
+def test_outdated_watermark_falls_back_to_full_scan(store):
+    hubspot = MagicMock()
+    sync = IncrementalSync(hubspot, store)
+    store.save(
+        "hubspot3:sync:companies", {"timestamp": NOW - sync.window_age, "ids": []}
+    )
+    hubspot.companies.iter_all.return_value = iter([{"id": 1}])
+
+    assert list(sync.changes("companies")) == [{"id": 1}]
+    hubspot.companies.iter_recently_modified.assert_not_called()
+
+
+def test_contacts_stop_at_the_watermark(store):
+    hubspot = MagicMock()
+    sync = IncrementalSync(hubspot, store)
+    store.save("hubspot3:sync:contacts", {"timestamp": NOW - 100, "ids": []})
+
+    def contact(vid, modified_at):
+        return {"vid": vid, "properties": {"lastmodifieddate": {"value": modified_at}}}
+
+    def recent():
+        yield contact(2, NOW - 10)
+        yield contact(1, NOW - 200)
+        raise AssertionError("paged past the watermark")
+
+    hubspot.contacts.iter_recently_modified.return_value = recent()
+
+    assert [record["id"] for record in sync.changes("contacts")] == [2]
+    assert sync.get_watermark("contacts") == {"timestamp": NOW - 10, "ids": [2]}
+
+
+def test_watermark_is_kept_until_changes_are_consumed(store):
+    hubspot = MagicMock()
+    sync = IncrementalSync(hubspot, store)
+    watermark = {"timestamp": NOW - 100, "ids": []}
+    store.save("hubspot3:sync:deals", watermark)
+    hubspot.deals.iter_recently_modified.return_value = [deal(1, NOW), deal(2, NOW)]
+
+    changes = sync.changes("deals")
+    next(changes)
+    changes.close()
+    assert sync.get_watermark("deals") == watermark
+
+
+def test_unknown_object_type(store):
+    with pytest.raises(ValueError):
+        list(IncrementalSync(MagicMock(), store).changes("widgets"))
@@ -2,8 +2,9 @@
 hubspot tickets api
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 from hubspot3.utils import get_log
 
 
@@ -50,7 +51,10 @@ class TicketsClient(BaseClient):
         """
         ticket_data = [{"name": x, "value": y} for x, y in data.items()]
         return self._call(
-            f"objects/tickets/{ticket_id}", method="PUT", data=ticket_data, **options
+            EndpointPath("objects/tickets/{ticket_id}", ticket_id=ticket_id),
+            method="PUT",
+            data=ticket_data,
+            **options,
         )
 
     def get(
@@ -76,7 +80,7 @@ class TicketsClient(BaseClient):
         options.update({"params": params})
 
         return self._call(
-            f"objects/tickets/{ticket_id}",
+            EndpointPath("objects/tickets/{ticket_id}", ticket_id=ticket_id),
             method="GET",
             properties=properties,
             **options,
@@ -89,6 +93,15 @@ class TicketsClient(BaseClient):
         Get all tickets in hubspot
         :see: https://developers.hubspot.com/docs/methods/tickets/get-all-tickets
         """
+        return list(self.iter_all(properties=properties, limit=limit, **options))
+
+    def iter_all(
+        self, properties: Optional[List[str]] = None, limit: int = -1, **options
+    ) -> Iterator[Dict]:
+        """
+        lazily yield all tickets in hubspot, one page at a time.
+        Takes the same arguments as `get_all`.
+        """
         properties = properties or [
             "subject",
             "content",
@@ -97,8 +110,8 @@ class TicketsClient(BaseClient):
         ]
 
         finished = False
-        output = []  # type: list
         offset = 0
+        count = 0
         limited = limit > 0
         while not finished:
             batch = self._call(
@@ -108,8 +121,10 @@ class TicketsClient(BaseClient):
                 properties=properties,
                 **options,
             )
-            output.extend(batch["objects"])
+            for ticket in batch["objects"]:
+                yield ticket
+                count += 1
+                if limited and count >= limit:
+                    return
             finished = not batch["hasMore"]
             offset = batch["offset"]
-
-        return output if not limited else output[:limit]
@@ -0,0 +1,43 @@
+"""
+coordination of oauth2 token refreshes between all clients of a process
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+
+_lock = threading.Lock()
+_refresh_locks = {}  # type: Dict[Optional[str], threading.Lock]
+# the time at which each known access token expires, as a unix timestamp
+_expiries = {}  # type: Dict[str, float]
+
+
+def get_refresh_lock(client_id: Optional[str]) -> threading.Lock:
+    """
+    returns the lock that must be held while refreshing the tokens of the given client id, so
+    only one refresh per app is in flight and the other threads wait for its result
+    """
+    with _lock:
+        if client_id not in _refresh_locks:
+            _refresh_locks[client_id] = threading.Lock()
+        return _refresh_locks[client_id]
+
+
+def record_expiry(access_token: str, expires_in: Optional[int]) -> None:
+    """remembers when an access token expires, given its `expires_in` in seconds"""
+    if not access_token or not expires_in:
+        return
+    now = time.time()
+    with _lock:
+        for token, expires_at in list(_expiries.items()):
+            if expires_at <= now:
+                del _expiries[token]
+        _expiries[access_token] = now + int(expires_in)
+
+
+def get_expiry(access_token: Optional[str]) -> Optional[float]:
+    """returns when the given access token expires, None if that is not known"""
+    if not access_token:
+        return None
+    return _expiries.get(access_token)
@@ -4,6 +4,7 @@ hubspot workflows api
 
 from typing import Optional
 from hubspot3.base import BaseClient
+from hubspot3.instrumentation import EndpointPath
 from hubspot3.utils import get_log
 
 
@@ -37,5 +38,7 @@ class WorkflowsClient(BaseClient):
         :see: https://developers.hubspot.com/docs/methods/workflows/v3/get_workflow
         """
         if workflow_id is not None:
-            return self._call(f"workflows/{workflow_id}")
+            return self._call(
+                EndpointPath("workflows/{workflow_id}", workflow_id=workflow_id)
+            )
         return None
@@ -59,6 +59,12 @@ setup(
         "Programming Language :: Python :: 3.13",
     ],
     zip_safe=False,
-    extras_require={"cli": ["fire==0.4.0"]},
+    extras_require={
+        "cli": ["fire==0.4.0"],
+        "orjson": ["orjson"],
+        "opentelemetry": ["opentelemetry-api"],
+        "prometheus": ["prometheus_client"],
+        "ujson": ["ujson"],
+    },
     entry_points={"console_scripts": ["hubspot3=hubspot3.__main__:main"]},
 )